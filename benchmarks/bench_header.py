@@ -0,0 +1,37 @@
+"""
+Compara la validación del encabezado con `HeaderScanner` frente a la regex de `ConventionalCommit`.
+
+Uso: python benchmarks/bench_header.py
+"""
+
+import timeit
+
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.scanner import scanner_for
+
+SCOPES = [f"scope{i}" for i in range(200)]
+
+CASES = {
+    "típico": ("feat(api):12345 agrega un endpoint\n\ncuerpo del mensaje\n", {}),
+    "tipo inválido": ("feature:12345 agrega un endpoint\n", {}),
+    "asunto largo": ("fix:1 " + "x" * 10_000, {}),
+    "scopes (200)": ("feat(scope150, scope199):1 asunto\n", {"scopes": SCOPES}),
+    "scope sin cierre": ("feat(" + "scope1, " * 2_000 + ":1 asunto", {"scopes": SCOPES}),
+    "tipos (5000)": ("tipo4999:1 asunto", {"types": [f"tipo{i}" for i in range(5_000)]}),
+}
+
+
+def main(number=2_000):
+    print(f"{'caso':<20}{'regex (µs)':>14}{'scanner (µs)':>14}{'mejora':>10}")
+    for name, (message, rules) in CASES.items():
+        commit = ConventionalCommit(**rules)
+        scanner = scanner_for(commit.types, commit.scopes)
+        assert scanner.is_valid(message) == commit._match_is_valid(commit.regex.match(message))
+
+        regex = min(timeit.repeat(lambda: commit._match_is_valid(commit.regex.match(message)), number=number, repeat=3))
+        scan = min(timeit.repeat(lambda: scanner.is_valid(message), number=number, repeat=3))
+        print(f"{name:<20}{regex / number * 1e6:>14.2f}{scan / number * 1e6:>14.2f}{regex / scan:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
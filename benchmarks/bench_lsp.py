@@ -0,0 +1,45 @@
+"""
+Mide la latencia por pulsación del servidor LSP (`conventional_pre_commit.lsp`) al escribir en el encabezado de
+un mensaje con un cuerpo grande: con el análisis del cuerpo guardado frente a recalcular todo el documento.
+
+Uso: python benchmarks/bench_lsp.py [tamaño del cuerpo en KiB]
+"""
+
+import statistics
+import sys
+import time
+
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.lsp import Document, Linter
+
+HEADER = "feat(api):12345 agrega un endpoint para consultar pagos"
+
+
+def _keystrokes(linter, document, reset_body):
+    timings = []
+    for column, char in enumerate(HEADER):
+        start = time.perf_counter()
+        change = {"range": {"start": {"line": 0, "character": column}, "end": {"line": 0, "character": column}}}
+        change["text"] = char
+        document.apply([change])
+        if reset_body:
+            document.body = None
+        linter.diagnostics(document)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main(kib=1024):
+    body = ("una línea del cuerpo del mensaje de commit\n" * (kib * 1024 // 44 + 1))[: kib * 1024]
+    linter = Linter(ConventionalCommit(scopes=["api", "web"], required_trailers=["Refs"]))
+    print(f"cuerpo de {kib} KiB, {len(HEADER)} pulsaciones en el encabezado")
+    print(f"{'análisis':<20}{'mediana (ms)':>14}{'máximo (ms)':>14}")
+    for name, reset_body in (("todo el documento", True), ("solo encabezado", False)):
+        document = Document("file:///COMMIT_EDITMSG", "\n\n" + body + "\nRefs: 1\n")
+        linter.diagnostics(document)
+        timings = _keystrokes(linter, document, reset_body)
+        print(f"{name:<20}{statistics.median(timings) * 1e3:>14.3f}{max(timings) * 1e3:>14.3f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
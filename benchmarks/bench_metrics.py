@@ -0,0 +1,47 @@
+"""
+Mide cuánto agrega registrar métricas al validar el historial: el mismo recorrido de `history.validate` sin métricas
+y con la duración de la limpieza y de la validación de cada mensaje (el mejor de varios intentos).
+
+Uso: python benchmarks/bench_metrics.py [cantidad de mensajes]
+"""
+
+import sys
+import time
+
+from conventional_pre_commit import history
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.metrics import Metrics
+
+REPEAT = 5
+
+
+def _commits(count):
+    for i in range(count):
+        message = f"feat(api): cambio {i}\n\ncuerpo del mensaje {i}\n" if i % 10 else f"commit sin formato {i}\n"
+        yield history.GitCommit(f"{i:040x}", message=message)
+
+
+def _time(commits, validator, metrics_factory):
+    best = float("inf")
+    for _ in range(REPEAT):
+        metrics = metrics_factory()
+        start = time.perf_counter()
+        for _ in history.validate(commits, validator, metrics=metrics):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(count=100_000):
+    commits = list(_commits(count))
+    validator = ConventionalCommit()
+    plain = _time(commits, validator, lambda: None)
+    timed = _time(commits, validator, Metrics)
+
+    print(f"{count} mensajes")
+    print(f"sin métricas:  {plain * 1000:8.1f} ms ({plain / count * 1e6:.2f} µs por mensaje)")
+    print(f"con métricas:  {timed * 1000:8.1f} ms ({timed / count * 1e6:.2f} µs por mensaje, {timed / plain - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
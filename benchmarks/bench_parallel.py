@@ -0,0 +1,57 @@
+"""
+Compara la validación en paralelo enviando el validador con cada mensaje frente al pool "en caliente"
+de `conventional_pre_commit.parallel`, que envía las reglas una sola vez por proceso.
+
+Uso: python benchmarks/bench_parallel.py [cantidad de mensajes]
+"""
+
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.parallel import validate_parallel
+
+SCOPES = [f"scope{i}" for i in range(200)]
+
+
+def _validate_one(args):
+    commit, message = args
+    return commit.is_valid(message)
+
+
+def _messages(count):
+    for i in range(count):
+        if i % 10:
+            yield f"feat(scope{i % 200}):{i % 1_000_000} asunto {i}\n\ncuerpo\n"
+        else:
+            yield f"actualiza cosas {i}\n"
+
+
+def naive(commit, messages, workers):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_validate_one, ((commit, message) for message in messages)))
+
+
+def warm(commit, messages, workers):
+    return sum(valid for valid, _ in validate_parallel(messages, commit, workers=workers))
+
+
+def main(count=20_000):
+    commit = ConventionalCommit(scopes=SCOPES)
+    messages = list(_messages(count))
+    print(f"{count} mensajes")
+    print(f"{'procesos':<10}{'por mensaje (s)':>18}{'en caliente (s)':>18}{'mejora':>10}")
+    for workers in (1, 4, 16):
+        start = time.perf_counter()
+        expected = naive(commit, messages, workers)
+        naive_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        assert warm(commit, messages, workers) == expected
+        warm_time = time.perf_counter() - start
+        print(f"{workers:<10}{naive_time:>18.2f}{warm_time:>18.2f}{naive_time / warm_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,38 @@
+"""
+Mide cuántos commits inválidos por segundo se guardan en la base de resultados según el tamaño del lote: con lotes
+de un commit cada fila paga su propia transacción, con `BATCH_SIZE` se escriben miles de filas por transacción.
+
+Uso: python benchmarks/bench_resultstore.py [cantidad de commits]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from conventional_pre_commit import resultstore
+from conventional_pre_commit.history import GitCommit
+
+BATCH_SIZES = (1, 100, resultstore.BATCH_SIZE)
+
+
+def _commits(count):
+    for i in range(count):
+        yield GitCommit(f"{i:040x}", message=f"mensaje inválido {i}\n", author=f"Autor {i % 40}", timestamp=i)
+
+
+def main(count=20_000):
+    commits = list(_commits(count))
+    with tempfile.TemporaryDirectory() as directory:
+        for batch_size in BATCH_SIZES:
+            path = os.path.join(directory, f"resultados-{batch_size}.db")
+            start = time.perf_counter()
+            with resultstore.ResultStore(path, batch_size=batch_size) as db:
+                for git_commit in commits:
+                    db.add(f"repo{git_commit.timestamp % 8}", git_commit, ["type", "delim"], "huella")
+            elapsed = time.perf_counter() - start
+            print(f"lotes de {batch_size:5}: {elapsed * 1000:9.1f} ms ({count / elapsed:10.0f} commits/s)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
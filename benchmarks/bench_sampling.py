@@ -0,0 +1,50 @@
+"""
+Compara una auditoría completa con una auditoría por muestreo sobre un repositorio sintético.
+
+Uso: python benchmarks/bench_sampling.py [cantidad de commits] [tamaño de la muestra]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from conventional_pre_commit.audit import main as audit
+
+
+def _create_repo(path, count):
+    subprocess.run(["git", "init", "-q", path], check=True)
+    lines = []
+    for i in range(count):
+        message = f"feat(api):{i} commit {i}\n" if i % 10 else f"commit sin formato {i}\n"
+        lines.append(f"commit refs/heads/main\ncommitter T <t@example.com> {1_600_000_000 + i * 600} +0000\n")
+        lines.append(f"data {len(message.encode())}\n{message}\n")
+    subprocess.run(["git", "-C", path, "fast-import", "--quiet"], input="".join(lines).encode(), check=True)
+    # como en los espejos grandes: con commit-graph, `git rev-list` no necesita leer los objetos de commit
+    subprocess.run(["git", "-C", path, "commit-graph", "write", "--reachable"], check=True, capture_output=True)
+
+
+def _time(argv):
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            audit(argv)
+        finally:
+            sys.stdout = stdout
+    return time.perf_counter() - start
+
+
+def main(count=200_000, sample=1_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        _create_repo(tmp, count)
+        print(f"{count} commits")
+        print(f"auditoría completa:           {_time([tmp]):.2f} s")
+        print(f"muestra de {sample}:{' ' * (18 - len(str(sample)))}{_time(['--sample', str(sample), tmp]):.2f} s")
+        stratified = _time(["--sample", str(sample), "--stratify", "month", tmp])
+        print(f"muestra estratificada:        {stratified:.2f} s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,67 @@
+"""
+Mide cuánto cuesta compilar un mapa de scopes de un monorepo frente a cargarlo desde la caché (el mejor de varios
+intentos), y buscar los scopes de muchas rutas en el árbol de prefijos.
+
+Uso: python benchmarks/bench_scopemap.py [cantidad de rutas]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from conventional_pre_commit import scopemap
+
+PACKAGES = 2_000
+REPEAT = 5
+
+
+def _mapping():
+    mapping = {}
+    for i in range(PACKAGES):
+        mapping[f"packages/group{i % 50}/package{i}"] = f"package{i}"
+        mapping[f"packages/group{i % 50}/package{i}/docs"] = [f"package{i}", "docs"]
+    return mapping
+
+
+def _paths(count):
+    for i in range(count):
+        package = i % (PACKAGES + PACKAGES // 10)
+        yield f"packages/group{package % 50}/package{package}/src/module{i % 7}/file{i}.py"
+
+
+def main(count=50_000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scopes.json")
+        with open(path, "w") as f:
+            json.dump(_mapping(), f)
+        cache_dir = os.path.join(directory, "cache")
+        compiled_dir = os.path.join(cache_dir, scopemap.CACHE_SUBDIRECTORY)
+
+        compiled = cached = float("inf")
+        for _ in range(REPEAT):
+            for name in os.listdir(compiled_dir) if os.path.isdir(compiled_dir) else []:
+                os.unlink(os.path.join(compiled_dir, name))
+            start = time.perf_counter()
+            trie = scopemap.load(path, cache_dir)
+            compiled = min(compiled, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            loaded = scopemap.load(path, cache_dir)
+            cached = min(cached, time.perf_counter() - start)
+            assert loaded.root == trie.root
+
+    paths = list(_paths(count))
+    start = time.perf_counter()
+    touched = trie.scopes(paths)
+    lookup = time.perf_counter() - start
+
+    print(f"{len(_mapping())} prefijos, {count} rutas, {len(touched)} scopes modificados")
+    print(f"compilar el JSON:    {compiled * 1000:8.2f} ms")
+    print(f"cargar de la caché:  {cached * 1000:8.2f} ms")
+    print(f"buscar las rutas:    {lookup * 1000:8.2f} ms ({lookup / count * 1e6:.2f} µs por ruta)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
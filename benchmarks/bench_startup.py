@@ -0,0 +1,54 @@
+"""
+Compara la latencia de una invocación del hook de commit-msg con el script de consola instalado
+(`conventional-pre-commit`), con `python -m conventional_pre_commit` y con el zipapp de `scripts/build_zipapp.py`.
+
+Uso: python benchmarks/bench_startup.py [cantidad de ejecuciones]
+"""
+
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+from build_zipapp import build  # noqa: E402
+
+
+def _time(command, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), min(timings)
+
+
+def main(runs=30):
+    with tempfile.TemporaryDirectory() as tmp:
+        message = os.path.join(tmp, "COMMIT_EDITMSG")
+        with open(message, "w") as f:
+            f.write("feat(api):12345 agrega un endpoint\n\ncuerpo del mensaje\n")
+        zipapp = build(os.path.join(tmp, "conventional-pre-commit.pyz"), python=None)
+
+        commands = {
+            "zipapp": [sys.executable, zipapp, message],
+            "python -m": [sys.executable, "-m", "conventional_pre_commit", message],
+        }
+        script = shutil.which("conventional-pre-commit")
+        if script:
+            commands["script de consola"] = [script, message]
+
+        print(f"{runs} ejecuciones")
+        print(f"{'entrada':<20}{'mediana (ms)':>14}{'mínimo (ms)':>14}")
+        for name, command in commands.items():
+            median, best = _time(command, runs)
+            print(f"{name:<20}{median * 1e3:>14.1f}{best * 1e3:>14.1f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,42 @@
+"""
+Mide la construcción del índice de sugerencias y el tiempo por búsqueda frente a comparar la palabra con cada
+scope válido.
+
+Uso: python benchmarks/bench_suggest.py [cantidad de scopes]
+"""
+
+import random
+import sys
+import time
+
+from conventional_pre_commit.suggest import MAX_DISTANCE, SuggestionIndex, distance
+
+
+def main(count=10_000, queries=500):
+    rng = random.Random(count)
+    scopes = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 14))) for _ in range(count)]
+    # errores típicos: transposición de dos letras
+    words = [scope[:2] + scope[3] + scope[2] + scope[4:] for scope in rng.sample(scopes, min(queries, count))]
+
+    start = time.perf_counter()
+    index = SuggestionIndex(scopes)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for word in words:
+        index.lookup(word)
+    lookup = (time.perf_counter() - start) / len(words)
+
+    start = time.perf_counter()
+    for word in words[:20]:
+        sorted(scope for scope in scopes if distance(word, scope, MAX_DISTANCE) <= MAX_DISTANCE)
+    brute = (time.perf_counter() - start) / 20
+
+    print(f"{count} scopes")
+    print(f"construcción del índice: {build * 1e3:.1f} ms")
+    print(f"búsqueda con índice:     {lookup * 1e3:.3f} ms")
+    print(f"búsqueda exhaustiva:     {brute * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,46 @@
+"""
+Mide cómo escala la validación con la cantidad de hilos del backend `thread` de `conventional_pre_commit.parallel`,
+frente a la validación en serie. Con GIL no se espera mejora; en CPython sin GIL (free-threading) debería escalar
+con los núcleos disponibles.
+
+Uso: python benchmarks/bench_threads.py [cantidad de mensajes]
+"""
+
+import sys
+import time
+
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.parallel import validate_messages, validate_parallel
+
+SCOPES = [f"scope{i}" for i in range(200)]
+
+
+def _messages(count):
+    for i in range(count):
+        if i % 10:
+            yield f"feat(scope{i % 200}):{i % 1_000_000} asunto {i}\n\ncuerpo\n"
+        else:
+            yield f"actualiza cosas {i}\n"
+
+
+def main(count=20_000):
+    commit = ConventionalCommit(scopes=SCOPES)
+    messages = list(_messages(count))
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{count} mensajes, GIL {'activado' if gil else 'desactivado'}")
+
+    start = time.perf_counter()
+    expected = validate_messages(commit, False, messages)
+    serial = time.perf_counter() - start
+    print(f"{'hilos':<10}{'tiempo (s)':>14}{'mensajes/s':>14}{'mejora':>10}")
+    print(f"{'serie':<10}{serial:>14.2f}{count / serial:>14.0f}{1:>9.1f}x")
+
+    for threads in (1, 2, 4, 8, 16):
+        start = time.perf_counter()
+        assert list(validate_parallel(messages, commit, workers=threads, backend="thread")) == expected
+        elapsed = time.perf_counter() - start
+        print(f"{threads:<10}{elapsed:>14.2f}{count / elapsed:>14.0f}{serial / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
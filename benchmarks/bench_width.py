@@ -0,0 +1,45 @@
+"""
+Mide el costo de los límites de columnas (`--max-header-length`, `--max-body-line-length`) en mensajes ASCII, que
+se miden con `len()`, frente a mensajes con caracteres anchos y emoji, que se recorren con la tabla de anchos
+(el mejor de tres intentos).
+
+Uso: python benchmarks/bench_width.py [cantidad de mensajes]
+"""
+
+import sys
+import time
+
+from conventional_pre_commit.format import ConventionalCommit
+
+BODY_LINES = 20
+
+
+def _messages(count, text):
+    body = "\n".join(f"{text} {i}" for i in range(BODY_LINES))
+    return [f"feat(api):{i} {text}\n\n{body}\n" for i in range(count)]
+
+
+def _run(commit, messages, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            commit.is_valid(message)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(count=100_000):
+    plain = ConventionalCommit()
+    limited = ConventionalCommit(max_header_length=72, max_body_line_length=72)
+    print(f"{count} mensajes de {BODY_LINES + 2} líneas")
+    print(f"{'mensajes':<16}{'sin límites (s)':>18}{'con límites (s)':>18}{'costo':>10}")
+    for name, text in (("ASCII", "agrega el cliente de la API"), ("anchos y emoji", "新しい API クライアント 🚀")):
+        messages = _messages(count, text)
+        base = _run(plain, messages)
+        elapsed = _run(limited, messages)
+        print(f"{name:<16}{base:>18.2f}{elapsed:>18.2f}{(elapsed / base - 1) * 100:>9.0f}%")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
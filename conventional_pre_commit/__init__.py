@@ -1,7 +1,19 @@
-from importlib.metadata import version, PackageNotFoundError
+def __getattr__(name):
+    # `__version__` se resuelve solo cuando se pide, para que el hook no importe `importlib.metadata` al iniciar
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-try:
-    __version__ = version("conventional-pre-commit")
-except PackageNotFoundError:
-    # package is not installed
-    pass
+    try:
+        # versión fijada al construir el zipapp (scripts/build_zipapp.py)
+        from conventional_pre_commit._version import version
+    except ImportError:
+        from importlib.metadata import PackageNotFoundError, version as _metadata_version
+
+        try:
+            version = _metadata_version("conventional-pre-commit")
+        except PackageNotFoundError:
+            # package is not installed
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    globals()["__version__"] = version
+    return version
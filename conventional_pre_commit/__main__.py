@@ -0,0 +1,6 @@
+import sys
+
+from conventional_pre_commit.hook import main
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,613 @@
+"""
+Auditoría del historial de múltiples repositorios con `asyncio`.
+
+Lanza procesos `git log` concurrentes (con un límite de concurrencia y un tiempo máximo por repositorio),
+consume su salida a medida que llega y valida cada mensaje con un único `ConventionalCommit` compartido.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from conventional_pre_commit import cli, history, output, parallel, resultstore, sampling, suggest, watermarks
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.hook import RESULT_FAIL, RESULT_SUCCESS
+from conventional_pre_commit.metrics import Metrics
+from conventional_pre_commit.stats import Stats
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class RepoResult:
+    """Resultado de auditar un repositorio."""
+
+    repo: str
+    commits: int = 0
+    failures: List[Tuple[history.GitCommit, List[str]]] = field(default_factory=list)
+    error: Optional[str] = None
+    # tips de las referencias validadas, para actualizar los watermarks en modo incremental
+    tips: Dict[str, str] = field(default_factory=dict)
+    # métricas de cumplimiento, solo si se pidieron
+    stats: Optional[Stats] = None
+    # índice para verificar los destinos de fixup!/squash!/amend!, solo si se pidió
+    autosquash: Optional[history.AutosquashIndex] = None
+    # muestreador, solo en modo de muestreo: `commits` cuenta los commits validados de la muestra
+    sampler: Optional[sampling.Sampler] = None
+    # métricas para Prometheus, solo si se pidieron
+    metrics: Optional[Metrics] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.failures
+
+    def estimate(self) -> Optional[sampling.Estimate]:
+        """Estima la proporción de commits válidos del historial a partir de la muestra."""
+        if self.sampler is None:
+            return None
+        return sampling.estimate(self.commits - len(self.failures), self.commits, self.sampler.population)
+
+    def add(
+        self,
+        git_commit: history.GitCommit,
+        valid: bool,
+        validator: ConventionalCommit,
+        errors: Optional[List[str]] = None,
+        merge: bool = False,
+        counted: bool = False,
+    ):
+        """Agrega un commit validado; con `counted`, sus estadísticas ya se acumularon (en un proceso del pool)."""
+        self.commits += 1
+        if errors is None:
+            errors = [] if valid else validator.errors(git_commit.message)
+        if not valid:
+            self.failures.append((git_commit, errors))
+        if self.stats is not None and not counted:
+            self.stats.add(validator, git_commit.message, valid, errors, merge)
+        if self.metrics is not None:
+            self.metrics.add(valid, errors)
+
+    def check_autosquash(self):
+        """Reporta como inválidos los commits de autosquash cuyo destino no está en el historial auditado."""
+        if self.autosquash is None:
+            return
+        for git_commit in self.autosquash.orphans():
+            self.failures.append((git_commit, ["autosquash"]))
+            if self.stats is not None:
+                self.stats.reject(["autosquash"])
+            if self.metrics is not None:
+                self.metrics.reject(["autosquash"])
+
+    def to_dict(self, validator: Optional[ConventionalCommit] = None) -> dict:
+        """Devuelve el resultado como diccionario; con `validator`, incluye sugerencias para tipos y scopes desconocidos."""
+        failures = []
+        for git_commit, errors in self.failures:
+            failure = {"sha": git_commit.sha, "subject": output.subject(git_commit.message), "errors": errors}
+            if validator is not None and {"type", "scope"} & set(errors):
+                failure["suggestions"] = suggest.suggestions(validator, git_commit.message)
+            failures.append(failure)
+        result = {
+            "repo": self.repo,
+            "commits": self.commits,
+            "failures": failures,
+            "error": self.error,
+        }
+        if self.stats is not None:
+            result["stats"] = self.stats.to_dict()
+        if self.sampler is not None:
+            result["sample"] = self.estimate().to_dict()
+        return result
+
+
+async def _git(repo: str, *args: str, stdin: Optional[bytes] = None) -> str:
+    process = await asyncio.create_subprocess_exec(
+        "git",
+        "-C",
+        repo,
+        *args,
+        stdin=asyncio.subprocess.PIPE if stdin is not None else None,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await process.communicate(stdin)
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode("utf-8", errors="replace").strip())
+    return stdout.decode("utf-8", errors="replace")
+
+
+async def _incremental_revs(result: RepoResult, known: Dict[str, str]) -> List[str]:
+    """Obtiene los tips actuales de `result.repo` y devuelve el rango con los commits aún no validados."""
+    refs = await _git(
+        result.repo,
+        "for-each-ref",
+        "--format=%(objectname) %(objecttype) %(*objectname) %(refname)",
+        "refs/heads",
+        "refs/tags",
+    )
+    for line in refs.splitlines():
+        sha, obj_type, peeled, ref = line.split(" ", 3)
+        if obj_type == "commit":
+            result.tips[ref] = sha
+        elif peeled:
+            result.tips[ref] = peeled
+
+    existing = []
+    candidates = sorted(set(known.values()))
+    if candidates:
+        checked = await _git(result.repo, "cat-file", "--batch-check", stdin="\n".join(candidates).encode() + b"\n")
+        existing = [line.split(" ", 1)[0] for line in checked.splitlines() if not line.endswith(" missing")]
+
+    return watermarks.revs(result.tips, known, existing)
+
+
+async def _validate(
+    result: RepoResult,
+    commits: List[history.GitCommit],
+    validator: ConventionalCommit,
+    strict: bool,
+    pool: Optional[Executor],
+):
+    """Valida un lote de commits en el proceso actual o, si hay `pool`, en sus procesos o hilos."""
+    if not commits:
+        return
+    if pool is None:
+        for git_commit, valid in history.validate(commits, validator, strict, result.autosquash, result.metrics):
+            result.add(git_commit, valid, validator, merge=not strict and git_commit.is_merge)
+        return
+
+    # los merges se clasifican por sus padres, sin enviarlos a los procesos
+    pending = [git_commit for git_commit in commits if strict or not git_commit.is_merge]
+    if result.autosquash is not None:
+        for git_commit in commits:
+            result.autosquash.add_message(git_commit, validator.clean(git_commit.message), validator)
+    loop = asyncio.get_running_loop()
+    validate = parallel.task(pool, validator, strict, stats=result.stats is not None)
+    outcomes = await loop.run_in_executor(pool, validate, [c.message for c in pending])
+    counted = result.stats is not None
+    if counted:
+        # las estadísticas de los mensajes se acumularon en el proceso (o hilo) que validó el lote
+        outcomes, batch_stats = outcomes
+        result.stats.update(batch_stats)
+    outcomes = iter(outcomes)
+    for git_commit in commits:
+        if strict or not git_commit.is_merge:
+            valid, errors = next(outcomes)
+            result.add(git_commit, valid, validator, list(errors), counted=counted)
+        else:
+            result.add(git_commit, True, validator, [], merge=True)
+
+
+async def _read_git_log(
+    result: RepoResult,
+    revs: Sequence[str],
+    validator: ConventionalCommit,
+    strict: bool,
+    pool: Optional[Executor] = None,
+):
+    process = await asyncio.create_subprocess_exec(
+        *history.log_command(revs, result.repo), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stderr = asyncio.ensure_future(process.stderr.read())
+    parser = history.LogParser()
+    # la lectura de cada bloque incluye la espera a `git log` y separar sus commits
+    observe_read = result.metrics.read.observe if result.metrics is not None else None
+    try:
+        while True:
+            start = time.perf_counter()
+            chunk = await process.stdout.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            commits = parser.feed(chunk)
+            if observe_read is not None:
+                observe_read(time.perf_counter() - start)
+            await _validate(result, commits, validator, strict, pool)
+        await _validate(result, parser.close(), validator, strict, pool)
+        result.check_autosquash()
+        if await process.wait() != 0:
+            result.error = (await stderr).decode("utf-8", errors="replace").strip()
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        stderr.cancel()
+
+
+async def _read_sampled(
+    result: RepoResult,
+    revs: Sequence[str],
+    validator: ConventionalCommit,
+    strict: bool,
+    pool: Optional[Executor] = None,
+):
+    """
+    Muestrea el historial con `git rev-list`, que no lee los mensajes, y luego obtiene con un único `git log`
+    solo los mensajes de los commits elegidos.
+    """
+    process = await asyncio.create_subprocess_exec(
+        "git",
+        "-C",
+        result.repo,
+        "rev-list",
+        "--timestamp",
+        "--parents",
+        *revs,
+        "--",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stderr = asyncio.ensure_future(process.stderr.read())
+    selected = []
+    pending = b""
+    try:
+        while True:
+            chunk = await process.stdout.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            if not lines:
+                continue
+            commits = []
+            for line in b"\n".join(lines).decode("ascii").split("\n"):
+                timestamp, sha, *parents = line.split(" ")
+                commits.append(history.GitCommit(sha, tuple(parents), timestamp=int(timestamp)))
+            selected.extend(result.sampler.offer(commits))
+        if await process.wait() != 0:
+            result.error = (await stderr).decode("utf-8", errors="replace").strip()
+            return
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        stderr.cancel()
+
+    selected.extend(result.sampler.finish())
+    if not selected:
+        return
+    start = time.perf_counter()
+    log = await asyncio.create_subprocess_exec(
+        *history.log_command(["--no-walk=unsorted", "--stdin"], result.repo),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr_output = await log.communicate("".join(f"{c.sha}\n" for c in selected).encode())
+    if log.returncode != 0:
+        result.error = stderr_output.decode("utf-8", errors="replace").strip()
+        return
+    parser = history.LogParser()
+    commits = parser.feed(stdout) + parser.close()
+    if result.metrics is not None:
+        result.metrics.read.observe(time.perf_counter() - start)
+    await _validate(result, commits, validator, strict, pool)
+
+
+def _read_objects(result: RepoResult, validator: ConventionalCommit, strict: bool, deadline: Optional[float]):
+    from conventional_pre_commit.gitobjects import Repository
+
+    with Repository(result.repo) as repository:
+        commits = repository.commits()
+        if result.sampler is not None:
+            commits = result.sampler.sample(commits)
+        for git_commit, valid in history.validate(commits, validator, strict, result.autosquash, result.metrics):
+            result.add(git_commit, valid, validator, merge=not strict and git_commit.is_merge)
+            if deadline is not None and time.monotonic() > deadline:
+                raise asyncio.TimeoutError()
+    result.check_autosquash()
+
+
+async def audit_repository(
+    repo: str,
+    validator: ConventionalCommit,
+    semaphore: asyncio.Semaphore,
+    revs: Sequence[str] = ("--all",),
+    strict: bool = False,
+    timeout: Optional[float] = None,
+    reader: str = "git",
+    known: Optional[Dict[str, str]] = None,
+    stats: bool = False,
+    check_autosquash: bool = False,
+    pool: Optional[Executor] = None,
+    sample: Optional[Callable[..., sampling.Sampler]] = None,
+    metrics: Optional[Metrics] = None,
+) -> RepoResult:
+    """
+    Audita el historial de `repo`, esperando turno en `semaphore` y respetando `timeout` (segundos).
+
+    Si se indican los watermarks `known` del repositorio, solo se validan los commits nuevos de sus
+    ramas y tags, y `RepoResult.tips` queda con los nuevos watermarks. Con `pool` (ver `parallel.create_pool`),
+    los mensajes leídos con `git log` se validan en sus procesos o hilos. Con `sample` (una fábrica de muestreadores,
+    ver `sampling.create`), solo se valida una muestra del historial. Con `metrics`, se registran los mensajes,
+    los fallos y las duraciones de lectura, limpieza y validación (estas dos, solo si se valida sin `pool`).
+    """
+    result = RepoResult(
+        repo,
+        stats=Stats() if stats else None,
+        autosquash=history.AutosquashIndex() if check_autosquash and not strict else None,
+        sampler=sample(name=watermarks.key(repo)) if sample is not None else None,
+        metrics=metrics,
+    )
+
+    async def _run():
+        if result.sampler is not None:
+            await _read_sampled(result, revs, validator, strict, pool)
+            return
+        if known is None:
+            await _read_git_log(result, revs, validator, strict, pool)
+            return
+        incremental = await _incremental_revs(result, known)
+        if incremental:
+            await _read_git_log(result, incremental, validator, strict, pool)
+
+    async with semaphore:
+        try:
+            if reader == "objects":
+                deadline = time.monotonic() + timeout if timeout else None
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, _read_objects, result, validator, strict, deadline)
+            else:
+                await asyncio.wait_for(_run(), timeout)
+        except asyncio.TimeoutError:
+            result.error = f"tiempo agotado tras {timeout}s"
+        except Exception as ex:
+            result.error = str(ex)
+    return result
+
+
+async def audit(
+    repos: Sequence[str],
+    validator: ConventionalCommit,
+    jobs: int = 4,
+    revs: Sequence[str] = ("--all",),
+    strict: bool = False,
+    timeout: Optional[float] = None,
+    reader: str = "git",
+    state: Optional[watermarks.State] = None,
+    stats: bool = False,
+    check_autosquash: bool = False,
+    pool: Optional[Executor] = None,
+    sample: Optional[Callable[..., sampling.Sampler]] = None,
+    metrics_file: Optional[str] = None,
+    metrics_interval: Optional[float] = None,
+    results_db: Optional[str] = None,
+) -> List[RepoResult]:
+    """
+    Audita `repos` con a lo sumo `jobs` repositorios en curso a la vez.
+
+    Con `state`, la auditoría es incremental a partir de los watermarks guardados para cada repositorio. Con
+    `metrics_file`, al terminar se escriben las métricas de todos los repositorios en el formato de Prometheus y,
+    con `metrics_interval`, también cada esa cantidad de segundos mientras la auditoría avanza. Con `results_db`,
+    los commits inválidos de cada repositorio se guardan en la base de resultados en cuanto termina su auditoría,
+    así que una falla posterior no pierde los repositorios ya auditados (los errores de SQLite se propagan).
+    """
+    start = time.monotonic()
+    semaphore = asyncio.Semaphore(jobs)
+    repo_metrics = [Metrics() if metrics_file else None for _ in repos]
+
+    def _write_metrics():
+        total = Metrics.merge(metrics for metrics in repo_metrics if metrics is not None)
+        total.save(metrics_file, "audit", duration=time.monotonic() - start)
+
+    async def _write_periodically():
+        while True:
+            await asyncio.sleep(metrics_interval)
+            _write_metrics()
+
+    writer = asyncio.ensure_future(_write_periodically()) if metrics_file and metrics_interval else None
+    # la base se abre antes de auditar: una ruta inválida se reporta sin esperar a que terminen los repositorios
+    with resultstore.ResultStore(results_db) if results_db else contextlib.nullcontext() as db:
+        fingerprint = resultstore.fingerprint(validator) if db is not None else None
+
+        async def _audit(repo: str, metrics: Optional[Metrics]) -> RepoResult:
+            known = None if state is None else state.get(watermarks.key(repo), {})
+            result = await audit_repository(
+                repo,
+                validator,
+                semaphore,
+                revs,
+                strict,
+                timeout,
+                reader,
+                known,
+                stats,
+                check_autosquash,
+                pool,
+                sample,
+                metrics,
+            )
+            if db is not None:
+                db.add_failures(repo, result.failures, fingerprint)
+                db.flush()
+            return result
+
+        try:
+            results = await asyncio.gather(*(_audit(repo, metrics) for repo, metrics in zip(repos, repo_metrics)))
+        finally:
+            if writer is not None:
+                writer.cancel()
+    if metrics_file:
+        _write_metrics()
+    return list(results)
+
+
+def main(argv: List[str] = []) -> int:
+    parser = argparse.ArgumentParser(
+        prog="conventional-pre-commit audit",
+        description="Verifica el historial de uno o más repositorios con el formato de Conventional Commits.",
+    )
+    parser.add_argument("repos", type=str, nargs="+", help="Rutas de los repositorios a auditar.")
+    cli.add_rule_arguments(parser)
+    parser.add_argument(
+        "--rev",
+        action="append",
+        dest="revs",
+        default=None,
+        help="Revisión o rango a auditar (se puede repetir). Por defecto, todas las referencias (--all).",
+    )
+    parser.add_argument(
+        "--reader",
+        choices=["git", "objects"],
+        default="git",
+        help="Cómo leer el historial: con `git log` o leyendo la base de objetos directamente (todas las referencias).",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1, help="Cantidad máxima de repositorios auditados a la vez."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Cantidad de procesos para validar los mensajes en paralelo (por defecto, en el proceso principal).",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=parallel.BACKENDS,
+        default=parallel.BACKEND_PROCESS,
+        help="Con --workers, valida en procesos (por defecto) o en hilos (conviene en CPython sin GIL).",
+    )
+    parser.add_argument("--timeout", type=float, default=None, help="Tiempo máximo por repositorio, en segundos.")
+    parser.add_argument(
+        "--state",
+        type=str,
+        default=None,
+        help="Archivo de watermarks para auditar solo los commits nuevos de cada rama y tag desde la ejecución anterior.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Calcula métricas de cumplimiento: distribución de tipos y scopes, fracción con cuerpo y errores más comunes.",
+    )
+    sample = parser.add_mutually_exclusive_group()
+    sample.add_argument(
+        "--sample", type=int, default=None, help="Valida solo una muestra aleatoria de N commits por repositorio."
+    )
+    sample.add_argument(
+        "--sample-rate", type=float, default=None, help="Valida solo una fracción p (0 < p <= 1) de los commits."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del muestreo, para obtener muestras reproducibles.")
+    parser.add_argument(
+        "--stratify",
+        choices=sampling.STRATIFY,
+        default=None,
+        help=(
+            "Con --sample, reparte la muestra entre meses o años en proporción a sus commits "
+            "(guarda hasta unas dos veces la muestra más un commit por período)."
+        ),
+    )
+    parser.add_argument(
+        "--db",
+        type=str,
+        default=None,
+        help="Base SQLite donde agregar los commits inválidos, para consultarlos por autor, fecha, repositorio y error.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        default=None,
+        help="Archivo donde escribir las métricas de la auditoría en el formato de texto de Prometheus (textfile collector).",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=None,
+        help="Con --metrics-file, también escribe las métricas cada tantos segundos durante la auditoría.",
+    )
+    parser.add_argument("--json", action="store_true", help="Imprime una línea JSON por repositorio.")
+    parser.add_argument(
+        "--no-color", action="store_false", default=True, dest="color", help="Desactiva los colores en la salida."
+    )
+    parser.add_argument("--verbose", action="store_true", help="Imprime los errores de cada commit inválido.")
+
+    try:
+        args = parser.parse_args(argv)
+        if args.state and (args.revs or args.reader != "git"):
+            parser.error("--state no se puede combinar con --rev ni con --reader objects")
+        if args.state and args.check_autosquash:
+            # en modo incremental el índice solo vería los commits nuevos, no los destinos ya auditados
+            parser.error("--check-autosquash no se puede combinar con --state")
+        if args.reader != "git" and (args.workers > 0 or args.revs):
+            parser.error("--reader objects no se puede combinar con --workers ni con --rev")
+        sampled = args.sample is not None or args.sample_rate is not None
+        if args.sample is not None and args.sample < 1:
+            parser.error("--sample debe ser mayor que 0")
+        if args.sample_rate is not None and not 0 < args.sample_rate <= 1:
+            parser.error("--sample-rate debe estar entre 0 (excluido) y 1")
+        if args.stratify and args.sample is None:
+            parser.error("--stratify requiere --sample")
+        if sampled and (args.state or args.check_autosquash):
+            parser.error("el muestreo no se puede combinar con --state ni con --check-autosquash")
+        if args.metrics_interval is not None and (not args.metrics_file or args.metrics_interval <= 0):
+            parser.error("--metrics-interval requiere --metrics-file y debe ser mayor que 0")
+        # las mismas reglas valen para todos los repositorios: la configuración de git del directorio actual no se usa
+        validator = cli.validator(args, parser, repo=None)
+    except SystemExit:
+        return RESULT_FAIL
+
+    state = watermarks.load(args.state) if args.state else None
+    pool = parallel.create_pool(validator, args.strict, args.workers, args.backend) if args.workers > 0 else None
+    sample = functools.partial(sampling.create, args.sample, args.sample_rate, args.seed, args.stratify) if sampled else None
+    try:
+        results = asyncio.run(
+            audit(
+                args.repos,
+                validator,
+                jobs=max(args.jobs, 1),
+                revs=args.revs or ["--all"],
+                strict=args.strict,
+                timeout=args.timeout,
+                reader=args.reader,
+                state=state,
+                stats=args.stats,
+                check_autosquash=args.check_autosquash,
+                pool=pool,
+                sample=sample,
+                metrics_file=args.metrics_file,
+                metrics_interval=args.metrics_interval,
+                results_db=args.db,
+            )
+        )
+    except sqlite3.Error as ex:
+        print(output.results_db_error(args.db, ex, use_color=args.color))
+        return RESULT_FAIL
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if state is not None:
+        for result in results:
+            if result.error is None:
+                state[watermarks.key(result.repo)] = result.tips
+        watermarks.save(args.state, state)
+
+    for result in results:
+        if args.json:
+            print(json.dumps(result.to_dict(validator), ensure_ascii=False))
+        else:
+            print(output.audit_result(result, use_color=args.color, verbose=args.verbose, validator=validator))
+
+    if args.stats and len(results) > 1:
+        total = Stats.merge(result.stats for result in results if result.stats is not None)
+        if args.json:
+            print(json.dumps({"total": total.to_dict()}, ensure_ascii=False))
+        else:
+            print(output.stats_summary(total, title="Total", use_color=args.color))
+
+    return RESULT_SUCCESS if all(result.ok for result in results) else RESULT_FAIL
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
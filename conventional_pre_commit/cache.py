@@ -0,0 +1,108 @@
+"""
+Caché de resultados del hook de commit-msg para mensajes repetidos.
+
+Reintentar con `git commit --edit --file=.git/COMMIT_EDITMSG`, enmendar sin cambiar el mensaje o ejecutar el hook
+en un `rebase --exec` vuelven a validar exactamente el mismo mensaje. Con `--cache`, el resultado y la salida del
+hook se guardan en `$XDG_CACHE_HOME/conventional-pre-commit` (o `~/.cache/conventional-pre-commit`), un archivo
+por mensaje, con el nombre del hash BLAKE2b del mensaje limpio y de las reglas.
+
+Cada archivo es texto plano: una primera línea `cpc1 <resultado>` seguida de la salida del hook, así que se lee
+sin importar el validador. Al leerlo se actualiza su fecha de modificación y, al superar `MAX_ENTRIES`, se borran
+los menos usados (LRU). La caché es un atajo: cualquier error de lectura o escritura se ignora.
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+FORMAT = "cpc1"
+MAX_ENTRIES = 256
+NAME = "conventional-pre-commit"
+
+
+def directory() -> str:
+    """Devuelve el directorio de la caché, según `XDG_CACHE_HOME`."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, NAME)
+
+
+@lru_cache(maxsize=None)
+def code_stamp() -> str:
+    """
+    Huella del código instalado (fechas y tamaños de los módulos), para que una actualización invalide la caché
+    sin tener que consultar la versión del paquete. Dentro de un zipapp se usa el archivo del zipapp.
+    """
+    path = os.path.dirname(os.path.abspath(__file__))
+    try:
+        stats = [(entry.name, entry.stat()) for entry in os.scandir(path) if entry.name.endswith(".py")]
+        return ";".join(f"{name}:{stat.st_mtime_ns}:{stat.st_size}" for name, stat in sorted(stats))
+    except OSError:
+        while not os.path.exists(path) and os.path.dirname(path) != path:
+            path = os.path.dirname(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return ""
+        return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def key(message: str, fingerprint: str) -> str:
+    """Devuelve la clave de un mensaje ya limpio con la huella de las reglas y del código."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{code_stamp()}\0{fingerprint}\0".encode("utf-8", "surrogatepass"))
+    digest.update(message.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def lookup(entry: str, path: Optional[str] = None) -> Optional[Tuple[int, List[str]]]:
+    """Devuelve el resultado y las líneas guardados para `entry`, o None si no están en la caché."""
+    filename = os.path.join(path or directory(), entry)
+    try:
+        with open(filename, encoding="utf-8", newline="") as f:
+            header = f.readline()
+            text = f.read()
+        os.utime(filename)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    magic, _, result = header.rstrip("\n").partition(" ")
+    if magic != FORMAT or not result.isdigit():
+        return None
+    return int(result), [text] if text else []
+
+
+def store(entry: str, result: int, lines: List[str], path: Optional[str] = None, max_entries: int = MAX_ENTRIES):
+    """Guarda el resultado y las líneas de `entry` de forma atómica y aplica el límite de entradas."""
+    path = path or directory()
+    try:
+        os.makedirs(path, exist_ok=True)
+        temporary = os.path.join(path, f".tmp-{os.getpid()}-{entry}")
+        try:
+            with open(temporary, "w", encoding="utf-8", newline="") as f:
+                f.write(f"{FORMAT} {result}\n")
+                f.write("\n".join(lines))
+            os.replace(temporary, os.path.join(path, entry))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        evict(path, max_entries)
+    except OSError:
+        pass
+
+
+def evict(path: str, max_entries: int = MAX_ENTRIES):
+    """Borra las entradas usadas hace más tiempo hasta dejar a lo sumo `max_entries`."""
+    entries = []
+    with os.scandir(path) as scan:
+        for entry in scan:
+            if not entry.name.startswith(".") and entry.is_file():
+                entries.append((entry.stat().st_mtime_ns, entry.path))
+    if len(entries) <= max_entries:
+        return
+    entries.sort()
+    for _, filename in entries[: len(entries) - max_entries]:
+        try:
+            os.unlink(filename)
+        except OSError:
+            pass
@@ -0,0 +1,166 @@
+"""
+Limpieza de mensajes de commit con la semántica de `git commit --cleanup`.
+
+El hook de commit-msg recibe el mensaje antes de que git lo limpie, así que aquí se replica esa limpieza
+recorriendo el mensaje línea por línea: se descartan los comentarios (con el carácter de `core.commentChar`),
+se normalizan los espacios según el modo y se corta en la línea de tijeras sin recorrer el diff que la sigue.
+"""
+
+import subprocess
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, Tuple
+
+# comportamiento histórico del hook: elimina comentarios y lo que sigue a la línea de corte, sin tocar espacios
+CLEANUP_DEFAULT = "default"
+CLEANUP_STRIP = "strip"
+CLEANUP_WHITESPACE = "whitespace"
+CLEANUP_SCISSORS = "scissors"
+CLEANUP_VERBATIM = "verbatim"
+CLEANUP_MODES = [CLEANUP_DEFAULT, CLEANUP_STRIP, CLEANUP_WHITESPACE, CLEANUP_SCISSORS, CLEANUP_VERBATIM]
+
+COMMENT_CHAR = "#"
+COMMENT_CHAR_AUTO = "auto"
+# candidatos de `core.commentChar=auto`, en el orden en que git los prueba
+AUTO_CANDIDATES = "#;@!$%^&|:"
+
+CUT_LINE = " ------------------------ >8 ------------------------"
+
+
+def cut_line(comment_char: str = COMMENT_CHAR) -> str:
+    """Devuelve la línea de tijeras de `git commit -v` para el carácter de comentario."""
+    return comment_char + CUT_LINE
+
+
+def _lines(message: str) -> Iterator[str]:
+    """Produce las líneas de `message`, con su salto de línea, sin dividir todo el mensaje de una vez."""
+    start = 0
+    end = len(message)
+    while start < end:
+        stop = message.find("\n", start) + 1 or end
+        yield message[start:stop]
+        start = stop
+
+
+def _until_cut_line(message: str, comment_char: str) -> Iterator[str]:
+    """Produce las líneas anteriores a la línea de tijeras; el resto del mensaje no se recorre."""
+    scissors = cut_line(comment_char)
+    for line in _lines(message):
+        if line.startswith(scissors) and line.rstrip("\r\n") == scissors:
+            return
+        yield line
+
+
+def detect_comment_char(message: str) -> str:
+    """
+    Deduce el carácter de comentario elegido por `core.commentChar=auto`.
+
+    Usa el de la línea de tijeras si existe y, si no, el candidato con el que comienza la última línea no vacía
+    (git agrega sus comentarios al final de la plantilla). Si no hay ninguno, usa `#`.
+    """
+    last = ""
+    for line in _lines(message):
+        text = line.rstrip("\r\n")
+        if text[1:] == CUT_LINE and text[:1] in AUTO_CANDIDATES:
+            return text[0]
+        if text.strip():
+            last = text
+    return last[0] if last and last[0] in AUTO_CANDIDATES else COMMENT_CHAR
+
+
+def _stripspace(lines: Iterator[str], comment_char: Optional[str]) -> str:
+    """
+    Equivale a `git stripspace`: quita los espacios finales de cada línea, las líneas vacías al inicio y al
+    final, y colapsa las líneas vacías consecutivas. Si `comment_char` no es None, descarta los comentarios.
+    """
+    cleaned = []
+    empties = 0
+    for line in lines:
+        if comment_char is not None and line.startswith(comment_char):
+            continue
+        text = line.rstrip()
+        if not text:
+            empties += 1
+            continue
+        if empties and cleaned:
+            cleaned.append("\n")
+        empties = 0
+        cleaned.append(text + "\n")
+    return "".join(cleaned)
+
+
+def strip_comments(message: str, comment_char: str = COMMENT_CHAR) -> str:
+    """Elimina las líneas de comentario, sin cortar en la línea de tijeras."""
+    if comment_char not in message:
+        return message
+    return "".join(line for line in _lines(message) if not line.startswith(comment_char))
+
+
+def strip_cut_line(message: str, comment_char: str = COMMENT_CHAR) -> str:
+    """Elimina la línea de tijeras y todo lo que la sigue."""
+    if cut_line(comment_char) not in message:
+        return message
+    return "".join(_until_cut_line(message, comment_char))
+
+
+def clean(message: str, comment_char: str = COMMENT_CHAR, mode: str = CLEANUP_DEFAULT) -> str:
+    """
+    Limpia `message` según el modo de `commit.cleanup`:
+
+    - `default`: elimina los comentarios y la línea de tijeras con todo lo que la sigue
+    - `strip`: como `default`, y además normaliza los espacios como `git stripspace`
+    - `whitespace` y `scissors`: normalizan los espacios pero conservan los comentarios
+    - `verbatim`: no modifica el mensaje
+
+    Salvo en `verbatim`, siempre se corta en la línea de tijeras: el hook no puede saber si se usó `git commit -v`.
+    """
+    if mode == CLEANUP_VERBATIM:
+        return message
+    if comment_char == COMMENT_CHAR_AUTO:
+        comment_char = detect_comment_char(message)
+
+    if comment_char not in message:
+        # sin comentarios ni línea de tijeras
+        if mode == CLEANUP_DEFAULT:
+            return message
+        return _stripspace(_lines(message), None)
+
+    lines = _until_cut_line(message, comment_char)
+    if mode == CLEANUP_DEFAULT:
+        return "".join(line for line in lines if not line.startswith(comment_char))
+    return _stripspace(lines, comment_char if mode == CLEANUP_STRIP else None)
+
+
+@lru_cache(maxsize=None)
+def git_config(repo: str = ".") -> Dict[str, str]:
+    """
+    Lee `core.commentChar` y `commit.cleanup` con un solo proceso `git config`; el resultado se cachea por
+    repositorio durante todo el proceso. Devuelve un diccionario vacío si git no está disponible.
+    """
+    command = ["git", "-C", repo, "config", "-z", "--get-regexp", r"^(core\.commentchar|commit\.cleanup)$"]
+    try:
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return {}
+
+    config = {}
+    for entry in result.stdout.decode("utf-8", errors="replace").split("\0"):
+        key, _, value = entry.partition("\n")
+        if key:
+            config[key.lower()] = value
+    return config
+
+
+def settings(comment_char: Optional[str] = None, mode: Optional[str] = None, repo: Optional[str] = ".") -> Tuple[str, str]:
+    """
+    Devuelve `(comment_char, mode)`: los valores indicados o, si faltan, los de la configuración de git de `repo`
+    (con `repo=None`, los valores por defecto). Un `commit.cleanup` desconocido se trata como `default`.
+    """
+    if comment_char is None or mode is None:
+        config = git_config(repo) if repo is not None else {}
+        if comment_char is None:
+            comment_char = config.get("core.commentchar") or COMMENT_CHAR
+        if mode is None:
+            mode = config.get("commit.cleanup", CLEANUP_DEFAULT)
+            if mode not in CLEANUP_MODES:
+                mode = CLEANUP_DEFAULT
+    return comment_char, mode
@@ -0,0 +1,120 @@
+"""
+Argumentos compartidos por los subcomandos que validan historial (`audit`, `pre-receive`).
+"""
+
+import argparse
+from typing import Optional
+
+from conventional_pre_commit import cleanup
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.rules import RuleError
+
+
+def add_rule_arguments(parser: argparse.ArgumentParser):
+    """Agrega los argumentos que definen las reglas de validación."""
+    parser.add_argument(
+        "--types",
+        type=str,
+        default=None,
+        help="Lista de tipos soportados, separados por comas sin espacios (por ejemplo: feat,fix,chore).",
+    )
+    parser.add_argument(
+        "--force-scope",
+        action="store_false",
+        default=True,
+        dest="optional_scope",
+        help="Fuerza a que cada commit tenga un scope definido.",
+    )
+    parser.add_argument(
+        "--scopes",
+        type=str,
+        default=None,
+        help="Lista de scopes soportados. Los scopes deben estar separados por comas sin espacios (por ejemplo: api,cliente).",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="No permite commits con fixup! ni merge.",
+    )
+    parser.add_argument(
+        "--comment-char",
+        type=str,
+        default=None,
+        help='Carácter de comentario de los mensajes, o "auto" (por defecto, core.commentChar de git o "#").',
+    )
+    parser.add_argument(
+        "--cleanup",
+        choices=cleanup.CLEANUP_MODES,
+        default=None,
+        help="Modo de limpieza de los mensajes, como git commit --cleanup (por defecto, commit.cleanup de git o default).",
+    )
+    parser.add_argument(
+        "--breaking-footer",
+        action="store_true",
+        help="Exige un footer BREAKING CHANGE (en mayúsculas y con descripción) si el encabezado tiene !.",
+    )
+    parser.add_argument(
+        "--require-trailers",
+        type=str,
+        default=None,
+        help="Lista de footers requeridos, separados por comas sin espacios (por ejemplo: Signed-off-by,Refs).",
+    )
+    parser.add_argument(
+        "--max-header-length",
+        type=int,
+        default=None,
+        help="Máximo de columnas del encabezado (los caracteres anchos y los emoji ocupan dos).",
+    )
+    parser.add_argument(
+        "--max-body-line-length",
+        type=int,
+        default=None,
+        help="Máximo de columnas de cada línea del cuerpo (los caracteres anchos y los emoji ocupan dos).",
+    )
+    parser.add_argument(
+        "--rules",
+        type=str,
+        default=None,
+        help="Reglas adicionales de otros paquetes (entry points conventional_pre_commit.rules), separadas por comas.",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Se detiene en la primera regla que no se cumple y solo reporta ese error.",
+    )
+    parser.add_argument(
+        "--check-autosquash",
+        action="store_true",
+        help="Reporta los commits fixup!/squash!/amend! cuyo destino no está en el historial validado.",
+    )
+
+
+def validator(
+    args: argparse.Namespace, parser: Optional[argparse.ArgumentParser] = None, repo: Optional[str] = "."
+) -> ConventionalCommit:
+    """
+    Crea el `ConventionalCommit` con las reglas de `add_rule_arguments`. Si una regla de `--rules` no se puede
+    cargar, se reporta con `parser.error()` (o se propaga `RuleError` si no hay `parser`). Sin `--comment-char` o
+    `--cleanup`, se usa la configuración de git de `repo` (con `repo=None`, los valores por defecto).
+    """
+    types = args.types.split(",") if args.types else ConventionalCommit.DEFAULT_TYPES
+    scopes = args.scopes.split(",") if args.scopes else None
+    comment_char, cleanup_mode = cleanup.settings(args.comment_char, args.cleanup, repo)
+    try:
+        return ConventionalCommit(
+            types=types,
+            scope_optional=args.optional_scope,
+            scopes=scopes,
+            comment_char=comment_char,
+            cleanup_mode=cleanup_mode,
+            breaking_footer=args.breaking_footer,
+            required_trailers=args.require_trailers.split(",") if args.require_trailers else None,
+            max_header_length=args.max_header_length,
+            max_body_line_length=args.max_body_line_length,
+            rules=args.rules.split(",") if args.rules else None,
+            fail_fast=args.fail_fast,
+        )
+    except RuleError as ex:
+        if parser is None:
+            raise
+        parser.error(str(ex))
@@ -1,5 +1,9 @@
 import re
-from typing import List
+from typing import List, Optional, Sequence, Tuple
+
+from conventional_pre_commit import cleanup, trailers, width
+from conventional_pre_commit.rules import Pipeline, Staged, pipelines
+from conventional_pre_commit.scanner import scanner_for
 
 
 class Commit:
@@ -14,8 +18,24 @@ class Commit:
             "squash",
         ]
     )
+    # mensajes de merge de git (fmt-merge-msg) y de los servicios de pull requests, en minúsculas
+    MERGE_PREFIXES = (
+        "merge branch ",
+        "merge branches ",
+        "merge commit ",
+        "merge pull request #",
+        "merge remote-tracking branch ",
+        "merge remote-tracking branches ",
+        "merge tag ",
+        "merge tags ",
+        "merged pr ",
+    )
 
-    def __init__(self, commit_msg: str = ""):
+    def __init__(
+        self, commit_msg: str = "", comment_char: str = cleanup.COMMENT_CHAR, cleanup_mode: str = cleanup.CLEANUP_DEFAULT
+    ):
+        self.comment_char = comment_char
+        self.cleanup_mode = cleanup_mode
         self.message = str(commit_msg)
         self.message = self.clean()
 
@@ -26,13 +46,13 @@ class Commit:
 
     @property
     def r_verbose_commit_ignored(self):
-        """Cadena regex para la parte ignorada de un mensaje de commit detallado."""
-        return r"^# -{24} >8 -{24}\r?\n.*\Z"
+        """Cadena regex para la parte ignorada de un mensaje de commit detallado (la limpieza usa `cleanup`)."""
+        return rf"^{re.escape(self.comment_char)} -{{24}} >8 -{{24}}\r?\n.*\Z"
 
     @property
     def r_comment(self):
-        """Cadena regex para comentarios."""
-        return r"^#.*\r?\n?"
+        """Cadena regex para comentarios (la limpieza usa `cleanup`)."""
+        return rf"^{re.escape(self.comment_char)}.*\r?\n?"
 
     def _r_or(self, items):
         """Une elementos con el símbolo "|" para formar un OR en regex."""
@@ -41,21 +61,20 @@ class Commit:
     def _strip_comments(self, commit_msg: str = ""):
         """Elimina comentarios de un mensaje de commit."""
         commit_msg = commit_msg or self.message
-        return re.sub(self.r_comment, "", commit_msg, flags=re.MULTILINE)
+        return cleanup.strip_comments(commit_msg, self.comment_char)
 
     def _strip_verbose_commit_ignored(self, commit_msg: str = ""):
         """Elimina la parte ignorada de un mensaje de commit detallado."""
         commit_msg = commit_msg or self.message
-        return re.sub(self.r_verbose_commit_ignored, "", commit_msg, flags=re.DOTALL | re.MULTILINE)
+        return cleanup.strip_cut_line(commit_msg, self.comment_char)
 
     def clean(self, commit_msg: str = ""):
         """
-        Elimina comentarios y segmentos ignorados de un mensaje de commit.
+        Elimina comentarios y segmentos ignorados de un mensaje de commit, según `comment_char` y `cleanup_mode`
+        (consulta `conventional_pre_commit.cleanup`).
         """
         commit_msg = commit_msg or self.message
-        commit_msg = self._strip_verbose_commit_ignored(commit_msg)
-        commit_msg = self._strip_comments(commit_msg)
-        return commit_msg
+        return cleanup.clean(commit_msg, self.comment_char, self.cleanup_mode)
 
     def has_autosquash_prefix(self, commit_msg: str = ""):
         """
@@ -68,19 +87,36 @@ class Commit:
 
         return bool(regex.match(commit_msg))
 
+    def autosquash_target(self, commit_msg: str = "") -> Optional[str]:
+        """
+        Devuelve el destino de un commit de autosquash (el asunto o SHA tras `fixup! `, `squash! ` o `amend! `),
+        o None si la entrada no tiene un prefijo de autosquash. Los prefijos repetidos se omiten, como hace git.
+        """
+        subject = self.clean(commit_msg).split("\n", 1)[0].rstrip("\r")
+        prefixes = tuple(f"{prefix}! " for prefix in self.AUTOSQUASH_PREFIXES)
+        if not subject.startswith(prefixes):
+            return None
+        while subject.startswith(prefixes):
+            subject = subject.split(" ", 1)[1]
+        return subject
+
     def is_merge(self, commit_msg: str = ""):
         """
-        Devuelve True si la entrada comienza con "Merge branch".
+        Devuelve True si la entrada comienza con un mensaje de merge: los que genera git ("Merge branch",
+        "Merge remote-tracking branch", "Merge tag", "Merge commit") y los de pull requests de GitHub y Azure DevOps.
         Consulta la documentación: https://git-scm.com/docs/git-merge.
         """
         commit_msg = self.clean(commit_msg)
-        return commit_msg.lower().startswith("merge branch ")
+        return commit_msg[:40].lower().startswith(self.MERGE_PREFIXES)
 
 
 class ConventionalCommit(Commit):
     """
     Implementa verificaciones para el formato de Conventional Commits.
 
+    Las reglas se copian al construir la instancia y los métodos no la modifican, así que una misma instancia
+    se puede usar desde varios hilos a la vez.
+
     https://www.conventionalcommits.org
     """
 
@@ -100,19 +136,73 @@ class ConventionalCommit(Commit):
             "wip",
         ]
     )
+    SCOPE_DELIMITERS = [":", ",", "-", "/"]
 
     def __init__(
-        self, commit_msg: str = "", types: List[str] = DEFAULT_TYPES, scope_optional: bool = True, scopes: List[str] = []
+        self,
+        commit_msg: str = "",
+        types: Optional[Sequence[str]] = None,
+        scope_optional: bool = True,
+        scopes: Optional[Sequence[str]] = None,
+        comment_char: str = cleanup.COMMENT_CHAR,
+        cleanup_mode: str = cleanup.CLEANUP_DEFAULT,
+        breaking_footer: bool = False,
+        required_trailers: Optional[Sequence[str]] = None,
+        max_header_length: Optional[int] = None,
+        max_body_line_length: Optional[int] = None,
+        scope_map: Optional[str] = None,
+        rules: Optional[Sequence[str]] = None,
+        fail_fast: bool = False,
     ):
-        super().__init__(commit_msg)
+        super().__init__(commit_msg, comment_char, cleanup_mode)
 
+        types = list(self.DEFAULT_TYPES if types is None else types)
         if set(types) & set(self.CONVENTIONAL_TYPES) == set():
-            self.types = self.CONVENTIONAL_TYPES + types
-        else:
-            self.types = types
-        self.types = sorted(self.types) if self.types else self.DEFAULT_TYPES
+            types = self.CONVENTIONAL_TYPES + types
+        self.types = sorted(types)
         self.scope_optional = scope_optional
         self.scopes = sorted(scopes) if scopes else []
+        self.breaking_footer = breaking_footer
+        self.required_trailers = list(required_trailers) if required_trailers else []
+        self.max_header_length = max_header_length
+        self.max_body_line_length = max_body_line_length
+        self.scope_map = scope_map
+        self.rules = list(rules) if rules else []
+        self.fail_fast = fail_fast
+        # reglas de terceros: los entry points solo se buscan si `rules` nombra alguna, y un nombre desconocido
+        # produce `RuleError` al crear el validador
+        self._pipelines()
+
+    def __setattr__(self, name, value):
+        # las reglas opcionales se habilitan según la configuración: al cambiarla, los pipelines se vuelven a armar
+        self.__dict__.pop("_built_pipelines", None)
+        super().__setattr__(name, value)
+
+    def _pipelines(self) -> Tuple[Pipeline, Pipeline]:
+        built = self.__dict__.get("_built_pipelines")
+        if built is None:
+            built = self._built_pipelines = pipelines(self, self.rules)
+        return built
+
+    @property
+    def validation(self) -> Pipeline:
+        """Pipeline de validación, armado con la configuración actual (las reglas opcionales dependen de ella)."""
+        return self._pipelines()[0]
+
+    @property
+    def diagnostics(self) -> Pipeline:
+        """Pipeline de diagnóstico (una regla por componente), armado con la configuración actual."""
+        return self._pipelines()[1]
+
+    @property
+    def needs_trailers(self) -> bool:
+        """True si alguna regla necesita analizar los footers del mensaje."""
+        return self.breaking_footer or bool(self.required_trailers)
+
+    @property
+    def has_length_limits(self) -> bool:
+        """True si hay algún límite de columnas para el encabezado o las líneas del cuerpo."""
+        return self.max_header_length is not None or self.max_body_line_length is not None
 
     @property
     def r_types(self):
@@ -135,7 +225,7 @@ class ConventionalCommit(Commit):
         """Cadena regex para un scope opcional o requerido con formato específico."""
         if self.scopes:
             scopes = self._r_or(self.scopes)
-            escaped_delimiters = list(map(re.escape, [":", ",", "-", "/"]))
+            escaped_delimiters = list(map(re.escape, self.SCOPE_DELIMITERS))
             delimiters_pattern = self._r_or(escaped_delimiters)
             scope_pattern = rf"\(\s*(?:{scopes})(?:\s*(?:{delimiters_pattern})\s*(?:{scopes}))*\s*\)"
 
@@ -174,60 +264,65 @@ class ConventionalCommit(Commit):
 
         return re.compile(pattern, re.MULTILINE)
 
-    def errors(self, commit_msg: str = "") -> List[str]:
+    def scope_values(self, commit_msg: str = "") -> List[str]:
         """
-        Devuelve una lista de componentes faltantes de Conventional Commits en un mensaje de commit.
+        Devuelve los scopes del encabezado de un mensaje de commit, p. ej. `["api", "cliente"]` para `feat(api, cliente)`.
         """
-        commit_msg = self.clean(commit_msg)
+        match = self.match(commit_msg)
+        scope = match.group("scope") if match else None
+        if not scope:
+            return []
 
-        missing = []
+        inner = scope[1:-1]
+        if self.scopes:
+            # los scopes configurados pueden contener delimitadores (p. ej. "api-v2"), así que se buscan completos
+            return re.findall(self._r_or(sorted(self.scopes, key=len, reverse=True)), inner)
 
-        # Verificar el 'type'
-        if not re.match(rf"^{self.r_types}", commit_msg):
-            missing.append("type")
+        delimiters = self._r_or(map(re.escape, self.SCOPE_DELIMITERS))
+        return [value.strip() for value in re.split(delimiters, inner) if value.strip()]
 
-        # Verificar el 'scope' si no es opcional
-        if not self.scope_optional:
-            if not re.match(rf"^{self.r_types}\({self.r_scope}\)", commit_msg):
-                missing.append("scope")
-        else:
-            # Si el scope es opcional pero presente, verificar su validez
-            scope_match = re.match(rf"^{self.r_types}\({self.r_scope}\)", commit_msg)
-            if scope_match and not scope_match.group("scope"):
-                missing.append("scope")
-
-        # Verificar el 'delim'
-        if not re.search(rf"{self.r_delim}", commit_msg):
-            missing.append("delim")
-
-        # Verificar el 'id'
-        if not re.search(rf"{self.r_delim}\s*\d{{1,9}}", commit_msg):
-            missing.append("id")
-
-        # Verificar el 'subject'
-        subject_match = re.search(rf"{self.r_subject}", commit_msg)
-        if not subject_match:
-            missing.append("subject")
-
-        # Verificar 'body' y 'sep'
-        # Determinar si hay un cuerpo presente (un salto de línea seguido de texto)
-        body_present = bool(re.search(r"\r?\n.+", commit_msg))
-        if body_present:
-            # Verificar si hay una línea en blanco (sep) antes del cuerpo
-            # Esto significa que hay dos saltos de línea consecutivos
-            if not re.search(r"\r?\n\r?\n.+", commit_msg):
-                missing.append("sep")
-
-        return missing
-
-    def is_valid(self, commit_msg: str = "") -> bool:
+    def errors(self, commit_msg: str = "", staged: Staged = None) -> List[str]:
         """
-        Devuelve True si el mensaje de commit cumple con el formato de Conventional Commits.
-        https://www.conventionalcommits.org
+        Devuelve una lista de componentes faltantes de Conventional Commits en un mensaje de commit, seguidos de
+        las reglas opcionales y de terceros que no cumple (consulta `conventional_pre_commit.rules`). `staged` son
+        las rutas en staging, para las reglas que las necesitan. Con `fail_fast`, solo se reporta el primero.
         """
+        commit_msg = self.clean(commit_msg)
+        return self.diagnostics.run(self, commit_msg, staged, self.fail_fast)
 
-        match = self.match(commit_msg)
+    def trailers(self, commit_msg: str = "") -> List[trailers.Trailer]:
+        """Devuelve los footers del mensaje de commit (consulta `conventional_pre_commit.trailers`)."""
+        return trailers.parse(self.clean(commit_msg))
 
+    def body_overflows(self, commit_msg: str = "") -> List[int]:
+        """
+        Devuelve los números de línea (desde 1, contando el encabezado) de las líneas del cuerpo que superan
+        `max_body_line_length` columnas.
+        """
+        commit_msg = self.clean(commit_msg)
+        body = commit_msg.find("\n") + 1
+        if self.max_body_line_length is None or not body:
+            return []
+        return [number + 2 for number, _ in width.overflows(commit_msg[body:], self.max_body_line_length)]
+
+    def is_valid(self, commit_msg: str = "", staged: Staged = None) -> bool:
+        """
+        Devuelve True si el mensaje de commit cumple con el formato de Conventional Commits y con las reglas
+        opcionales y de terceros. Se detiene en la primera regla que no cumple.
+        https://www.conventionalcommits.org
+        """
+        message = self.clean(commit_msg) or self.message
+        return not self.validation.run(self, message, staged, fail_fast=True)
+
+    def format_is_valid(self, message: str) -> bool:
+        """Devuelve True si un mensaje ya limpio tiene el formato de Conventional Commits, sin las reglas opcionales."""
+        header_scanner = scanner_for(self.types, self.scopes)
+        if header_scanner is not None:
+            return header_scanner.is_valid(message, self.scope_optional)
+        return self._match_is_valid(self.regex.match(message))
+
+    def _match_is_valid(self, match) -> bool:
+        """Devuelve True si el resultado de `match()` contiene todos los componentes requeridos."""
         # match all the required components
         #
         #    type(scope): asunto
@@ -260,7 +355,10 @@ class ConventionalCommit(Commit):
 
 
 def is_conventional(
-    input: str, types: List[str] = ConventionalCommit.DEFAULT_TYPES, optional_scope: bool = True, scopes: List[str] = []
+    input: str,
+    types: Optional[Sequence[str]] = None,
+    optional_scope: bool = True,
+    scopes: Optional[Sequence[str]] = None,
 ) -> bool:
     """
     Devuelve True si la entrada cumple con el formato de Conventional Commits.
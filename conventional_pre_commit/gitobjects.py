@@ -0,0 +1,466 @@
+"""
+Lector de objetos de git en Python puro.
+
+Recorre objetos sueltos y packfiles directamente (zlib, resolución de deltas y búsqueda
+binaria en el `.idx`) para auditar repositorios espejo sin lanzar un proceso `git` por
+repositorio. Los `.idx` y `.pack` se acceden mediante `mmap`, de modo que el uso de memoria
+no crece con el tamaño del pack.
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from conventional_pre_commit.history import GitCommit
+
+OBJ_COMMIT = 1
+OBJ_TREE = 2
+OBJ_BLOB = 3
+OBJ_TAG = 4
+OBJ_OFS_DELTA = 6
+OBJ_REF_DELTA = 7
+
+TYPE_NAMES = {
+    OBJ_COMMIT: b"commit",
+    OBJ_TREE: b"tree",
+    OBJ_BLOB: b"blob",
+    OBJ_TAG: b"tag",
+}
+TYPE_IDS = {name: type_id for type_id, name in TYPE_NAMES.items()}
+
+IDX_V2_MAGIC = b"\377tOc"
+CHUNK_SIZE = 16 * 1024
+
+
+class GitObjectError(Exception):
+    """Error al leer un objeto del repositorio."""
+
+
+def _decompress(buffer, offset: int) -> bytes:
+    """Descomprime el stream zlib que comienza en `offset`, leyendo el buffer por bloques."""
+    decompressor = zlib.decompressobj()
+    chunks = []
+    while not decompressor.eof:
+        end = offset + CHUNK_SIZE
+        chunk = buffer[offset:end]
+        if not chunk:
+            raise GitObjectError("stream zlib truncado")
+        chunks.append(decompressor.decompress(chunk))
+        offset = end
+    return b"".join(chunks)
+
+
+def _delta_varint(delta: bytes, pos: int) -> Tuple[int, int]:
+    """Lee un entero de tamaño variable (little-endian) del encabezado de un delta."""
+    value = shift = 0
+    while True:
+        byte = delta[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """
+    Aplica un delta de git sobre `base`.
+    Consulta la documentación: https://git-scm.com/docs/pack-format#_deltified_representation.
+    """
+    base_size, pos = _delta_varint(delta, 0)
+    if base_size != len(base):
+        raise GitObjectError("el tamaño del objeto base no coincide con el delta")
+    result_size, pos = _delta_varint(delta, pos)
+
+    result = bytearray()
+    delta_size = len(delta)
+    while pos < delta_size:
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            offset = size = 0
+            for i in range(4):
+                if opcode & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if opcode & (1 << (4 + i)):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            end = offset + (size or 0x10000)
+            result += base[offset:end]
+        elif opcode:
+            end = pos + opcode
+            result += delta[pos:end]
+            pos = end
+        else:
+            raise GitObjectError("instrucción de delta inválida")
+
+    if len(result) != result_size:
+        raise GitObjectError("el tamaño del resultado no coincide con el delta")
+    return bytes(result)
+
+
+class PackIndex:
+    """
+    Índice (`.idx`) de un packfile, en versión 1 o 2, accedido mediante `mmap`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:4] == IDX_V2_MAGIC:
+            self.version = struct.unpack(">I", self._map[4:8])[0]
+            if self.version != 2:
+                raise GitObjectError(f"versión de índice no soportada: {self.version}")
+            self._fanout = 8
+        else:
+            self.version = 1
+            self._fanout = 0
+
+        self.count = self._fanout_at(255)
+        tables = self._fanout + 256 * 4
+        if self.version == 2:
+            self._shas = tables
+            self._offsets = self._shas + self.count * 20 + self.count * 4
+            self._large_offsets = self._offsets + self.count * 4
+        else:
+            self._entries = tables
+
+    def _fanout_at(self, byte: int) -> int:
+        start = self._fanout + byte * 4
+        return struct.unpack_from(">I", self._map, start)[0]
+
+    def _sha_at(self, i: int) -> bytes:
+        if self.version == 2:
+            start = self._shas + i * 20
+        else:
+            start = self._entries + i * 24 + 4
+        end = start + 20
+        return self._map[start:end]
+
+    def _offset_at(self, i: int) -> int:
+        if self.version == 1:
+            start = self._entries + i * 24
+            return struct.unpack_from(">I", self._map, start)[0]
+
+        start = self._offsets + i * 4
+        offset = struct.unpack_from(">I", self._map, start)[0]
+        if offset & 0x80000000:
+            start = self._large_offsets + (offset & 0x7FFFFFFF) * 8
+            offset = struct.unpack_from(">Q", self._map, start)[0]
+        return offset
+
+    def find(self, sha: bytes) -> Optional[int]:
+        """Devuelve el offset en el pack del objeto `sha` (20 bytes), o None si no está."""
+        first = sha[0]
+        lo = self._fanout_at(first - 1) if first else 0
+        hi = self._fanout_at(first)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = self._sha_at(mid)
+            if current < sha:
+                lo = mid + 1
+            elif current > sha:
+                hi = mid
+            else:
+                return self._offset_at(mid)
+        return None
+
+    def __iter__(self) -> Iterator[bytes]:
+        for i in range(self.count):
+            yield self._sha_at(i)
+
+    def close(self):
+        self._map.close()
+
+
+class Pack:
+    """
+    Un packfile (`.pack`) junto a su índice, accedidos mediante `mmap`.
+    """
+
+    # cantidad de objetos base de deltas que se conservan descomprimidos
+    BASE_CACHE_SIZE = 64
+
+    def __init__(self, pack_path: str, repository: Optional["Repository"] = None):
+        self.path = pack_path
+        self.repository = repository
+        self.index = PackIndex(pack_path[: -len(".pack")] + ".idx")
+        with open(pack_path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:4] != b"PACK":
+            raise GitObjectError(f"{pack_path} no es un packfile")
+        self._bases: "OrderedDict[int, Tuple[int, bytes]]" = OrderedDict()
+
+    def _entry_header(self, offset: int) -> Tuple[int, int, int]:
+        """Devuelve `(tipo, tamaño, offset de los datos)` de la entrada en `offset`."""
+        byte = self._map[offset]
+        offset += 1
+        obj_type = (byte >> 4) & 0x7
+        size = byte & 0x0F
+        shift = 4
+        while byte & 0x80:
+            byte = self._map[offset]
+            offset += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+        return obj_type, size, offset
+
+    def read_at(self, offset: int) -> Tuple[int, bytes]:
+        """Devuelve `(tipo, contenido)` del objeto en `offset`, resolviendo deltas."""
+        cached = self._bases.get(offset)
+        if cached is not None:
+            self._bases.move_to_end(offset)
+            return cached
+
+        obj_type, _, data_offset = self._entry_header(offset)
+        if obj_type == OBJ_OFS_DELTA:
+            byte = self._map[data_offset]
+            data_offset += 1
+            distance = byte & 0x7F
+            while byte & 0x80:
+                byte = self._map[data_offset]
+                data_offset += 1
+                distance = ((distance + 1) << 7) | (byte & 0x7F)
+            base_type, base = self.read_at(offset - distance)
+            result = base_type, apply_delta(base, _decompress(self._map, data_offset))
+        elif obj_type == OBJ_REF_DELTA:
+            base_sha_end = data_offset + 20
+            base_sha = self._map[data_offset:base_sha_end]
+            base_offset = self.index.find(base_sha)
+            if base_offset is not None:
+                base_type, base = self.read_at(base_offset)
+            elif self.repository is not None:
+                base_type, base = self.repository.read(base_sha)
+            else:
+                raise GitObjectError(f"objeto base {base_sha.hex()} no encontrado")
+            result = base_type, apply_delta(base, _decompress(self._map, base_sha_end))
+        elif obj_type in TYPE_NAMES:
+            result = obj_type, _decompress(self._map, data_offset)
+        else:
+            raise GitObjectError(f"tipo de objeto inválido {obj_type} en {self.path}")
+
+        self._bases[offset] = result
+        if len(self._bases) > self.BASE_CACHE_SIZE:
+            self._bases.popitem(last=False)
+        return result
+
+    def read(self, sha: bytes) -> Optional[Tuple[int, bytes]]:
+        offset = self.index.find(sha)
+        if offset is None:
+            return None
+        return self.read_at(offset)
+
+    def close(self):
+        self._bases.clear()
+        self._map.close()
+        self.index.close()
+
+
+class Repository:
+    """
+    Acceso de solo lectura a la base de objetos de un repositorio git (normal o bare).
+    """
+
+    def __init__(self, path: str):
+        self.git_dir = self._find_git_dir(path)
+        self.objects_dirs = self._find_objects_dirs(os.path.join(self.git_dir, "objects"))
+        self._packs: Optional[List[Pack]] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _find_git_dir(path: str) -> str:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isfile(dot_git):
+            with open(dot_git, encoding="utf-8") as f:
+                gitdir = f.read().strip()
+            key, _, value = gitdir.partition(":")
+            if key == "gitdir":
+                return os.path.join(path, value.strip())
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isdir(os.path.join(path, "objects")):
+            return path
+        raise GitObjectError(f"{path} no es un repositorio git")
+
+    @staticmethod
+    def _find_objects_dirs(objects_dir: str) -> List[str]:
+        dirs = [objects_dir]
+        alternates = os.path.join(objects_dir, "info", "alternates")
+        if os.path.isfile(alternates):
+            with open(alternates, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        dirs.append(os.path.normpath(os.path.join(objects_dir, line)))
+        return dirs
+
+    @property
+    def packs(self) -> List[Pack]:
+        if self._packs is None:
+            self._packs = []
+            for objects_dir in self.objects_dirs:
+                pack_dir = os.path.join(objects_dir, "pack")
+                if not os.path.isdir(pack_dir):
+                    continue
+                for name in sorted(os.listdir(pack_dir)):
+                    if name.endswith(".pack") and os.path.isfile(os.path.join(pack_dir, name[: -len(".pack")] + ".idx")):
+                        self._packs.append(Pack(os.path.join(pack_dir, name), self))
+        return self._packs
+
+    def _read_loose(self, sha: bytes) -> Optional[Tuple[int, bytes]]:
+        hex_sha = sha.hex()
+        for objects_dir in self.objects_dirs:
+            path = os.path.join(objects_dir, hex_sha[:2], hex_sha[2:])
+            try:
+                with open(path, "rb") as f:
+                    raw = zlib.decompress(f.read())
+            except FileNotFoundError:
+                continue
+            header, _, content = raw.partition(b"\0")
+            type_name, _, _ = header.partition(b" ")
+            if type_name not in TYPE_IDS:
+                raise GitObjectError(f"tipo de objeto inválido en {path}")
+            return TYPE_IDS[type_name], content
+        return None
+
+    def read(self, sha: bytes) -> Tuple[int, bytes]:
+        """Devuelve `(tipo, contenido)` del objeto `sha` (20 bytes)."""
+        for pack in self.packs:
+            found = pack.read(sha)
+            if found is not None:
+                return found
+        found = self._read_loose(sha)
+        if found is None:
+            raise GitObjectError(f"objeto {sha.hex()} no encontrado")
+        return found
+
+    def refs(self) -> Dict[str, str]:
+        """Devuelve las referencias del repositorio (`nombre -> sha`), incluyendo `packed-refs`."""
+        refs: Dict[str, str] = {}
+
+        packed = os.path.join(self.git_dir, "packed-refs")
+        if os.path.isfile(packed):
+            with open(packed, encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith(("#", "^")):
+                        continue
+                    parts = line.split()
+                    if len(parts) == 2:
+                        refs[parts[1]] = parts[0]
+
+        refs_dir = os.path.join(self.git_dir, "refs")
+        for root, _, files in os.walk(refs_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                with open(path, encoding="utf-8") as f:
+                    value = f.read().strip()
+                if len(value) == 40:
+                    refs[os.path.relpath(path, self.git_dir).replace(os.sep, "/")] = value
+
+        head = os.path.join(self.git_dir, "HEAD")
+        if os.path.isfile(head):
+            with open(head, encoding="utf-8") as f:
+                value = f.read().strip()
+            key, _, target = value.partition(":")
+            if key == "ref":
+                target = target.strip()
+                if target in refs:
+                    refs["HEAD"] = refs[target]
+            elif len(value) == 40:
+                refs["HEAD"] = value
+
+        return refs
+
+    def _peel(self, sha: bytes) -> Optional[bytes]:
+        """Sigue los tags anotados hasta llegar a un commit; devuelve None si el destino no es un commit."""
+        while True:
+            obj_type, content = self.read(sha)
+            if obj_type == OBJ_COMMIT:
+                return sha
+            if obj_type != OBJ_TAG:
+                return None
+            key, _, value = content.split(b"\n", 1)[0].partition(b" ")
+            if key != b"object":
+                return None
+            sha = bytes.fromhex(value.decode("ascii"))
+
+    def commits(self, tips: Optional[Iterable[str]] = None) -> Iterator[GitCommit]:
+        """
+        Recorre los commits alcanzables desde `tips` (por defecto, todas las referencias),
+        produciendo cada commit una sola vez.
+        """
+        if tips is None:
+            tips = self.refs().values()
+
+        pending = []
+        seen = set()
+        for tip in tips:
+            sha = self._peel(bytes.fromhex(tip))
+            if sha is not None and sha not in seen:
+                seen.add(sha)
+                pending.append(sha)
+
+        while pending:
+            sha = pending.pop()
+            git_commit = parse_commit(sha.hex(), self.read(sha)[1])
+            yield git_commit
+            for parent in git_commit.parents:
+                parent_sha = bytes.fromhex(parent)
+                if parent_sha not in seen:
+                    seen.add(parent_sha)
+                    pending.append(parent_sha)
+
+    def close(self):
+        for pack in self._packs or []:
+            pack.close()
+        self._packs = None
+
+
+def parse_commit(sha: str, content: bytes) -> GitCommit:
+    """Convierte el contenido de un objeto commit en un `GitCommit`."""
+    headers, _, message = content.partition(b"\n\n")
+    parents = []
+    author = ""
+    timestamp = 0
+    encoding = "utf-8"
+    for line in headers.split(b"\n"):
+        key, _, value = line.partition(b" ")
+        if key == b"parent":
+            parents.append(value.decode("ascii"))
+        elif key == b"author":
+            # author Nombre <correo> 1700000000 +0000
+            ident, _, _ = value.rpartition(b">")
+            author = (ident + b">").decode("utf-8", errors="replace")
+        elif key == b"committer":
+            # la fecha del committer, como `%ct` en `history.LOG_FORMAT`
+            fields = value.rpartition(b">")[2].split()
+            if fields:
+                timestamp = int(fields[0])
+        elif key == b"encoding":
+            encoding = value.decode("ascii")
+
+    try:
+        text = message.decode(encoding, errors="replace")
+    except LookupError:
+        text = message.decode("utf-8", errors="replace")
+
+    return GitCommit(sha, tuple(parents), text, author, timestamp)
+
+
+def iter_messages(path: str, tips: Optional[Iterable[str]] = None) -> Iterator[str]:
+    """Produce los mensajes de commit del repositorio en `path` sin lanzar `git`."""
+    with Repository(path) as repository:
+        for git_commit in repository.commits(tips):
+            yield git_commit.message
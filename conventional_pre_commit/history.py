@@ -0,0 +1,208 @@
+import bisect
+import subprocess
+import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.metrics import Metrics
+
+# Formato de `git log -z`: los commits se separan con NUL y los campos con US (0x1f).
+FIELD_SEP = "\x1f"
+LOG_FORMAT = "%H%x1f%P%x1f%an <%ae>%x1f%ct%x1f%B"
+
+
+class GitCommit(NamedTuple):
+    """
+    Un commit del historial de git, independiente de cómo fue leído.
+    """
+
+    sha: str
+    parents: Tuple[str, ...] = ()
+    message: str = ""
+    author: str = ""
+    timestamp: int = 0
+
+    @property
+    def is_merge(self) -> bool:
+        """True si el commit tiene más de un padre."""
+        return len(self.parents) > 1
+
+
+def _subject(message: str) -> str:
+    return message.split("\n", 1)[0].rstrip("\r")
+
+
+class AutosquashIndex:
+    """
+    Índice de asuntos y prefijos de SHA de un rango de commits, para resolver `fixup!`/`squash!`/`amend!`.
+
+    Se llena en el mismo recorrido que la validación; como `git log` produce primero los commits más recientes,
+    los destinos se resuelven al terminar el recorrido con búsquedas O(1) en diccionarios.
+    Solo se encuentran los destinos que están dentro del rango indexado.
+    """
+
+    # longitud mínima de un SHA abreviado en el destino (la abreviatura por defecto de git)
+    SHA_PREFIX_LENGTH = 7
+    HEX_DIGITS = frozenset("0123456789abcdef")
+
+    def __init__(self):
+        self._subjects: Dict[str, str] = {}
+        self._shas: Dict[str, List[str]] = {}
+        self._fixups: List[Tuple[GitCommit, str]] = []
+        self._sorted_subjects: Optional[List[str]] = None
+
+    def add(self, git_commit: GitCommit, subject: str, target: Optional[str] = None):
+        """Indexa un commit; si es de autosquash, `target` es su destino y se resuelve en `orphans()`."""
+        self._subjects.setdefault(subject, git_commit.sha)
+        self._shas.setdefault(git_commit.sha[: self.SHA_PREFIX_LENGTH], []).append(git_commit.sha)
+        self._sorted_subjects = None
+        if target is not None:
+            self._fixups.append((git_commit, target))
+
+    def add_message(self, git_commit: GitCommit, message: str, commit: ConventionalCommit):
+        """Indexa un commit a partir de su mensaje (ya limpio)."""
+        self.add(git_commit, _subject(message), commit.autosquash_target(message))
+
+    def resolve(self, target: str) -> Optional[str]:
+        """Devuelve el SHA del commit al que apunta `target` (asunto, prefijo de asunto o SHA), o None."""
+        if target in self._subjects:
+            return self._subjects[target]
+
+        if len(target) >= self.SHA_PREFIX_LENGTH and set(target) <= self.HEX_DIGITS:
+            for sha in self._shas.get(target[: self.SHA_PREFIX_LENGTH], []):
+                if sha.startswith(target):
+                    return sha
+
+        # como git, acepta un prefijo del asunto; solo se llega aquí si no hubo coincidencia exacta
+        if self._sorted_subjects is None:
+            self._sorted_subjects = sorted(self._subjects)
+        i = bisect.bisect_left(self._sorted_subjects, target)
+        if target and i < len(self._sorted_subjects) and self._sorted_subjects[i].startswith(target):
+            return self._subjects[self._sorted_subjects[i]]
+        return None
+
+    def orphans(self) -> List[GitCommit]:
+        """Devuelve los commits de autosquash cuyo destino no está en el índice."""
+        return [git_commit for git_commit, target in self._fixups if self.resolve(target) in (None, git_commit.sha)]
+
+
+def validate(
+    commits: Iterable[GitCommit],
+    commit: ConventionalCommit,
+    strict: bool = False,
+    autosquash: Optional[AutosquashIndex] = None,
+    metrics: Optional[Metrics] = None,
+) -> Iterator[Tuple[GitCommit, bool]]:
+    """
+    Valida cada commit con las reglas de `commit` y produce pares `(GitCommit, valido)`.
+
+    Se consume como generador para no mantener el historial completo en memoria. Si se indica un
+    `AutosquashIndex`, se llena con cada commit para verificar luego los destinos de autosquash. Con `metrics`,
+    se registra la duración de la limpieza y de la validación de cada mensaje.
+
+    Fuera del modo estricto, los commits con más de un padre son merges válidos y su mensaje no se analiza.
+    """
+    if metrics is not None:
+        yield from _validate_timed(commits, commit, strict, autosquash, metrics)
+        return
+    for git_commit in commits:
+        if not strict and git_commit.is_merge:
+            if autosquash is not None:
+                autosquash.add(git_commit, _subject(git_commit.message))
+            yield git_commit, True
+            continue
+        message = commit.clean(git_commit.message)
+        if autosquash is not None:
+            autosquash.add_message(git_commit, message, commit)
+        if not strict and (commit.has_autosquash_prefix(message) or commit.is_merge(message)):
+            yield git_commit, True
+            continue
+        yield git_commit, commit.is_valid(message)
+
+
+def _validate_timed(
+    commits: Iterable[GitCommit],
+    commit: ConventionalCommit,
+    strict: bool,
+    autosquash: Optional[AutosquashIndex],
+    metrics: Metrics,
+) -> Iterator[Tuple[GitCommit, bool]]:
+    # el mismo recorrido que `validate`, aparte para no medir tiempos cuando no se piden métricas
+    clock = time.perf_counter
+    observe_clean = metrics.clean.observe
+    observe_match = metrics.match.observe
+    for git_commit in commits:
+        if not strict and git_commit.is_merge:
+            if autosquash is not None:
+                autosquash.add(git_commit, _subject(git_commit.message))
+            yield git_commit, True
+            continue
+        start = clock()
+        message = commit.clean(git_commit.message)
+        observe_clean(clock() - start)
+        if autosquash is not None:
+            autosquash.add_message(git_commit, message, commit)
+        if not strict and (commit.has_autosquash_prefix(message) or commit.is_merge(message)):
+            yield git_commit, True
+            continue
+        start = clock()
+        valid = commit.is_valid(message)
+        observe_match(clock() - start)
+        yield git_commit, valid
+
+
+class LogParser:
+    """
+    Convierte incrementalmente la salida de `git log -z --format=LOG_FORMAT` en `GitCommit`.
+
+    Los bloques pueden cortar un registro en cualquier punto; lo pendiente se conserva hasta el siguiente bloque.
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        self.encoding = encoding
+        self._pending = b""
+
+    def feed(self, chunk: bytes) -> List[GitCommit]:
+        records = (self._pending + chunk).split(b"\0")
+        self._pending = records.pop()
+        return [self._parse(record) for record in records if record]
+
+    def close(self) -> List[GitCommit]:
+        pending, self._pending = self._pending, b""
+        return [self._parse(pending)] if pending.strip() else []
+
+    def _parse(self, record: bytes) -> GitCommit:
+        sha, parents, author, timestamp, message = record.decode(self.encoding, errors="replace").split(FIELD_SEP, 4)
+        # git separa los registros con "\n" además del NUL cuando el mensaje no termina en salto de línea
+        sha = sha.lstrip("\n")
+        return GitCommit(sha, tuple(parents.split()), message, author, int(timestamp or 0))
+
+
+def log_command(revs: Sequence[str], repo: str = ".") -> List[str]:
+    """Devuelve el comando `git log` que produce el historial de `revs` en formato `LOG_FORMAT`."""
+    return ["git", "-C", repo, "log", "-z", f"--format={LOG_FORMAT}", *revs, "--"]
+
+
+def iter_log(revs: Sequence[str], repo: str = ".", chunk_size: int = 64 * 1024) -> Iterator[GitCommit]:
+    """Produce los commits de `git log` a medida que se leen de la salida del proceso."""
+    parser = LogParser()
+    process = subprocess.Popen(log_command(revs, repo), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    completed = False
+    try:
+        while True:
+            chunk = process.stdout.read(chunk_size)
+            if not chunk:
+                break
+            yield from parser.feed(chunk)
+        yield from parser.close()
+        completed = True
+    finally:
+        if not completed:
+            # el consumidor abandonó el generador: no hace falta esperar el resto del historial
+            process.kill()
+        process.stdout.close()
+        stderr = process.stderr.read()
+        process.stderr.close()
+        process.wait()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, process.args, stderr=stderr)
@@ -1,21 +1,39 @@
 import argparse
+import functools
+import importlib
+import os
 import sys
+import threading
+import time
+from typing import Callable, List, Optional, Tuple, Union
 
-from conventional_pre_commit import output
-from conventional_pre_commit.format import ConventionalCommit
+# el validador y la salida se importan solo si hay que validar: un mensaje en la caché no los necesita
+from conventional_pre_commit import cache, cleanup
 
 RESULT_SUCCESS = 0
 RESULT_FAIL = 1
 
+# políticas cuando no se puede terminar la validación (tiempo o presupuesto agotado)
+POLICY_ALLOW = "allow"
+POLICY_REJECT = "reject"
+
+# rutas en staging, o la función que las obtiene (consulta `conventional_pre_commit.rules.Staged`)
+Staged = Optional[Union[List[str], Callable[[], List[str]]]]
+
+# subcomandos que se importan solo cuando se usan, para no demorar el hook de commit-msg
+SUBCOMMANDS = {
+    "audit": "conventional_pre_commit.audit",
+    "lsp": "conventional_pre_commit.lsp",
+    "pre-receive": "conventional_pre_commit.receive",
+}
+
 
 def main(argv=[]):
     parser = argparse.ArgumentParser(
         prog="conventional-pre-commit",
         description="Verifica si un mensaje de commit de git sigue el formato de Conventional Commits.",
     )
-    parser.add_argument(
-        "types", type=str, nargs="*", default=ConventionalCommit.DEFAULT_TYPES, help="Lista opcional de tipos a soportar."
-    )
+    parser.add_argument("types", type=str, nargs="*", default=None, help="Lista opcional de tipos a soportar.")
     parser.add_argument("input", type=str, help="Un archivo que contiene un mensaje de commit de git.")
     parser.add_argument(
         "--no-color", action="store_false", default=True, dest="color", help="Desactiva los colores en la salida."
@@ -38,6 +56,88 @@ def main(argv=[]):
         action="store_true",
         help="Fuerza a que el commit siga estrictamente el formato de Conventional Commits. No permite commits con fixup! ni merge.",
     )
+    parser.add_argument(
+        "--comment-char",
+        type=str,
+        default=None,
+        help='Carácter de comentario del mensaje, o "auto" (por defecto, core.commentChar de git o "#").',
+    )
+    parser.add_argument(
+        "--cleanup",
+        choices=cleanup.CLEANUP_MODES,
+        default=None,
+        help="Modo de limpieza del mensaje, como git commit --cleanup (por defecto, commit.cleanup de git o default).",
+    )
+    parser.add_argument(
+        "--breaking-footer",
+        action="store_true",
+        help="Exige un footer BREAKING CHANGE (en mayúsculas y con descripción) si el encabezado tiene !.",
+    )
+    parser.add_argument(
+        "--require-trailers",
+        type=str,
+        default=None,
+        help="Lista de footers requeridos, separados por comas sin espacios (por ejemplo: Signed-off-by,Refs).",
+    )
+    parser.add_argument(
+        "--max-header-length",
+        type=int,
+        default=None,
+        help="Máximo de columnas del encabezado (los caracteres anchos y los emoji ocupan dos).",
+    )
+    parser.add_argument(
+        "--max-body-line-length",
+        type=int,
+        default=None,
+        help="Máximo de columnas de cada línea del cuerpo (los caracteres anchos y los emoji ocupan dos).",
+    )
+    parser.add_argument(
+        "--scope-map",
+        type=str,
+        default=None,
+        help="Archivo JSON que asocia prefijos de ruta con scopes: los scopes del commit deben corresponder a los "
+        "componentes de los archivos en staging.",
+    )
+    parser.add_argument(
+        "--rules",
+        type=str,
+        default=None,
+        help="Reglas adicionales de otros paquetes (entry points conventional_pre_commit.rules), separadas por comas.",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Se detiene en la primera regla que no se cumple y solo reporta ese error.",
+    )
+    parser.add_argument(
+        "--timeout-ms",
+        type=int,
+        default=None,
+        help="Tiempo máximo para leer y validar el mensaje, en milisegundos.",
+    )
+    parser.add_argument(
+        "--on-timeout",
+        choices=[POLICY_ALLOW, POLICY_REJECT],
+        default=POLICY_ALLOW,
+        help="Qué hacer si se agota --timeout-ms: permitir el commit con una advertencia o rechazarlo (por defecto: allow).",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Guarda el resultado de cada mensaje en $XDG_CACHE_HOME/conventional-pre-commit para no volver a validarlo.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        default=None,
+        help="Archivo donde escribir las métricas de la ejecución en el formato de texto de Prometheus.",
+    )
+    parser.add_argument(
+        "--subcommand",
+        choices=list(SUBCOMMANDS),
+        default=None,
+        help="Ejecuta un subcomando con los argumentos que siguen (debe ser el primer argumento).",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -49,41 +149,312 @@ def main(argv=[]):
     if len(argv) < 1:
         argv = sys.argv[1:]
 
+    # los subcomandos se piden explícitamente: un primer argumento posicional es un tipo, aunque se llame `audit`
+    name, rest = _subcommand(argv)
+    if name is not None:
+        return importlib.import_module(SUBCOMMANDS[name]).main(rest)
+
     try:
         args = parser.parse_args(argv)
     except SystemExit:
         return RESULT_FAIL
 
+    start = time.monotonic()
+    metrics = None
+    check = _check
+    if args.metrics_file:
+        from conventional_pre_commit.metrics import Metrics
+
+        metrics = Metrics()
+
+        def _check_counted(args: argparse.Namespace):
+            # con --timeout-ms se valida en un proceso hijo: las métricas vuelven junto con el resultado
+            return _check(args, metrics), metrics
+
+        check = _check_counted
+    if args.timeout_ms is None:
+        outcome = check(args)
+    else:
+        outcome = _run_with_deadline(check, args, args.timeout_ms / 1000)
+        if outcome is None:
+            elapsed = (time.monotonic() - start) * 1000
+            allowed = args.on_timeout == POLICY_ALLOW
+            from conventional_pre_commit import output
+
+            print(output.hook_timeout(args.timeout_ms, elapsed, allowed, use_color=args.color))
+            if metrics is not None:
+                metrics.save(args.metrics_file, "hook", duration=elapsed / 1000)
+            return RESULT_SUCCESS if allowed else RESULT_FAIL
+    if metrics is not None:
+        outcome, metrics = outcome
+        metrics.save(args.metrics_file, "hook", duration=time.monotonic() - start)
+    result, lines = outcome
+
+    for line in lines:
+        print(line)
+    if args.verbose:
+        from conventional_pre_commit import output
+
+        print(output.hook_timing((time.monotonic() - start) * 1000, use_color=args.color))
+    return result
+
+
+def _subcommand(argv: List[str]) -> Tuple[Optional[str], List[str]]:
+    """Devuelve el subcomando de `--subcommand NOMBRE` (o `--subcommand=NOMBRE`) al inicio de `argv` y el resto."""
+    if argv and argv[0].startswith("--subcommand="):
+        name, rest = argv[0].partition("=")[2], argv[1:]
+    elif len(argv) >= 2 and argv[0] == "--subcommand":
+        name, rest = argv[1], argv[2:]
+    else:
+        return None, argv
+    return (name, rest) if name in SUBCOMMANDS else (None, argv)
+
+
+def _run_with_deadline(function: Callable, args: argparse.Namespace, seconds: float):
+    """
+    Ejecuta `function(args)` en un proceso hijo y espera a lo sumo `seconds`; devuelve None si no terminó a tiempo.
+
+    Un hilo no alcanza: una regex que retrocede en C retiene el GIL y el hilo que espera no vuelve hasta que termina.
+    El hijo se crea con `fork` (sin volver a importar nada), envía el resultado o la excepción con `pickle` por un
+    pipe y, si se agota el tiempo, se termina con SIGKILL. Sin `fork` (Windows), se usa un hilo daemon, que corta las
+    lecturas bloqueadas pero no una validación que retiene el GIL.
+    """
+    if not hasattr(os, "fork"):
+        return _run_in_thread(function, args, seconds)
+    import pickle
+    import select
+    import signal
+
+    # lo pendiente en los buffers se imprimiría dos veces si el hijo lo hereda
+    sys.stdout.flush()
+    sys.stderr.flush()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        _child(function, args, write_fd)
+
+    os.close(write_fd)
+    deadline = time.monotonic() + seconds
+    chunks = []
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([read_fd], [], [], remaining)[0]:
+                os.kill(pid, signal.SIGKILL)
+                return None
+            chunk = os.read(read_fd, 64 * 1024)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+    if not chunks:
+        raise RuntimeError("la validación terminó sin devolver un resultado")
+    ok, value = pickle.loads(b"".join(chunks))
+    if not ok:
+        raise value
+    return value
+
+
+def _child(function: Callable, args: argparse.Namespace, write_fd: int):
+    """Cuerpo del proceso hijo de `_run_with_deadline`: nunca vuelve."""
+    import pickle
+
+    status = 0
+    try:
+        try:
+            payload = pickle.dumps((True, function(args)))
+        except BaseException as ex:
+            try:
+                payload = pickle.dumps((False, ex))
+            except Exception:
+                payload = pickle.dumps((False, RuntimeError(repr(ex))))
+        with os.fdopen(write_fd, "wb") as pipe:
+            pipe.write(payload)
+        sys.stdout.flush()
+        sys.stderr.flush()
+    except BaseException:
+        status = 1
+    finally:
+        # sin los manejadores de salida del padre (atexit, finalizadores de pytest, ...)
+        os._exit(status)
+
+
+def _run_in_thread(function: Callable, args: argparse.Namespace, seconds: float):
+    """
+    Ejecuta `function(args)` en un hilo daemon y espera a lo sumo `seconds`; devuelve None si no terminó a tiempo.
+    """
+    outcome = []
+    errors = []
+
+    def _target():
+        try:
+            outcome.append(function(args))
+        except BaseException as ex:
+            errors.append(ex)
+
+    thread = threading.Thread(target=_target, name="conventional-pre-commit", daemon=True)
+    thread.start()
+    thread.join(seconds)
+    if thread.is_alive():
+        return None
+    if errors:
+        raise errors[0]
+    return outcome[0]
+
+
+def _check(args: argparse.Namespace, metrics=None) -> Tuple[int, List[str]]:
+    """
+    Lee y valida el mensaje de `args.input`; devuelve el resultado y las líneas a imprimir. Con `--cache`,
+    reutiliza el resultado guardado para el mismo mensaje limpio y las mismas reglas. Con `metrics`
+    (`conventional_pre_commit.metrics.Metrics`), registra el resultado, las duraciones y las consultas a la caché.
+    """
+    read_start = time.perf_counter()
     try:
         with open(args.input, encoding="utf-8") as f:
             commit_msg = f.read()
     except UnicodeDecodeError:
-        print(output.unicode_decode_error(args.color))
-        return RESULT_FAIL
+        from conventional_pre_commit import output
+
+        if metrics is not None:
+            metrics.add(False, ["encoding"])
+        return RESULT_FAIL, [output.unicode_decode_error(args.color)]
+    if metrics is not None:
+        metrics.read.observe(time.perf_counter() - read_start)
+
+    comment_char, cleanup_mode = cleanup.settings(args.comment_char, args.cleanup)
+    staged = None
+    if args.scope_map:
+        from conventional_pre_commit import scopemap
+
+        # sin caché, `git` solo se lanza si el mensaje llega a la regla del mapa de scopes
+        staged = functools.lru_cache(maxsize=None)(scopemap.staged_paths)
+    if not args.cache:
+        return _validate(args, commit_msg, comment_char, cleanup_mode, staged, metrics)
+
+    rules = [
+        args.types,
+        args.optional_scope,
+        args.scopes,
+        args.strict,
+        comment_char,
+        cleanup_mode,
+        args.breaking_footer,
+        args.require_trailers,
+        args.max_header_length,
+        args.max_body_line_length,
+        args.rules,
+        args.fail_fast,
+        args.verbose,
+        args.color,
+    ]
+    if staged is not None:
+        staged = staged()
+        rules.extend([args.scope_map, scopemap.stamp(args.scope_map), staged])
+    entry = cache.key(cleanup.clean(commit_msg, comment_char, cleanup_mode), repr(rules))
+    cached = cache.lookup(entry)
+    if cached is not None:
+        if metrics is not None:
+            metrics.cache_hits += 1
+            # los componentes que fallaron no se guardan en la caché
+            metrics.add(cached[0] == RESULT_SUCCESS)
+        return cached
+    if metrics is not None:
+        metrics.cache_misses += 1
+    result, lines = _validate(args, commit_msg, comment_char, cleanup_mode, staged, metrics)
+    cache.store(entry, result, lines)
+    return result, lines
+
+
+def _validate(
+    args: argparse.Namespace,
+    commit_msg: str,
+    comment_char: str,
+    cleanup_mode: str,
+    staged: Staged = None,
+    metrics=None,
+) -> Tuple[int, List[str]]:
+    """
+    Valida `commit_msg` con las reglas de `args`; devuelve el resultado y las líneas a imprimir. Con `--scope-map`,
+    `staged` son las rutas en staging (o la función que las obtiene). Con `metrics`, registra el resultado, los
+    componentes que fallaron y las duraciones de la limpieza (al crear el validador) y de la validación.
+    """
+    from conventional_pre_commit import output
+    from conventional_pre_commit.format import ConventionalCommit
+    from conventional_pre_commit.rules import RuleError
+
     if args.scopes:
         scopes = args.scopes.split(",")
     else:
         scopes = args.scopes
 
-    commit = ConventionalCommit(commit_msg, args.types, args.optional_scope, scopes)
+    required_trailers = args.require_trailers.split(",") if args.require_trailers else None
+    try:
+        start = time.perf_counter()
+        commit = ConventionalCommit(
+            commit_msg,
+            args.types,
+            args.optional_scope,
+            scopes,
+            comment_char,
+            cleanup_mode,
+            breaking_footer=args.breaking_footer,
+            required_trailers=required_trailers,
+            max_header_length=args.max_header_length,
+            max_body_line_length=args.max_body_line_length,
+            scope_map=args.scope_map,
+            rules=args.rules.split(",") if args.rules else None,
+            fail_fast=args.fail_fast,
+        )
+        if metrics is not None:
+            metrics.clean.observe(time.perf_counter() - start)
 
-    if not args.strict:
-        if commit.has_autosquash_prefix():
-            return RESULT_SUCCESS
-        if commit.is_merge():
-            return RESULT_SUCCESS
+        if not args.strict:
+            if commit.has_autosquash_prefix() or commit.is_merge():
+                if metrics is not None:
+                    metrics.add(True)
+                return RESULT_SUCCESS, []
 
-    if commit.is_valid():
-        return RESULT_SUCCESS
+        start = time.perf_counter()
+        valid = commit.is_valid(staged=staged)
+        if metrics is not None:
+            metrics.match.observe(time.perf_counter() - start)
+            errors = [] if valid else commit.errors(staged=staged)
+            metrics.add(valid, errors)
+        if valid:
+            return RESULT_SUCCESS, []
+        if staged is not None and commit.is_valid():
+            # solo fallan las reglas de las rutas en staging: el mapa de scopes se explica con los componentes
+            failure = _scope_map_failure(args, commit, staged)
+            if failure:
+                return RESULT_FAIL, [failure]
+    except RuleError as ex:
+        if metrics is not None:
+            metrics.add(False, ["rules"])
+        return RESULT_FAIL, [output.rule_error(ex, use_color=args.color)]
 
-    print(output.fail(commit, use_color=args.color))
+    lines = [output.fail(commit, use_color=args.color)]
 
     if not args.verbose:
-        print(output.verbose_arg(use_color=args.color))
+        lines.append(output.verbose_arg(use_color=args.color))
     else:
-        print(output.fail_verbose(commit, use_color=args.color))
+        lines.append(output.fail_verbose(commit, use_color=args.color))
+
+    return RESULT_FAIL, lines
+
+
+def _scope_map_failure(args: argparse.Namespace, commit, staged: Staged) -> Optional[str]:
+    """Explica qué scopes de `commit` no corresponden a los componentes de las rutas en staging, o None si todos."""
+    from conventional_pre_commit import output, scopemap
 
-    return RESULT_FAIL
+    # el mapa ya se leyó al validar, así que se carga de la caché compilada
+    touched = scopemap.load(args.scope_map).scopes(staged() if callable(staged) else staged)
+    unexpected = scopemap.unexpected_scopes(commit.scope_values(), touched)
+    if unexpected is None:
+        return None
+    return output.scope_map_fail(commit, unexpected, sorted(touched), use_color=args.color)
 
 
 if __name__ == "__main__":
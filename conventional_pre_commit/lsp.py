@@ -0,0 +1,446 @@
+"""
+Servidor de lenguaje (LSP) por entrada y salida estándar para editores de mensajes de commit.
+
+Mantiene en memoria los documentos abiertos y las reglas, aplica los cambios incrementales que envía el editor y
+publica diagnósticos (`textDocument/publishDiagnostics`) con el rango de cada componente faltante de
+`ConventionalCommit.errors()`. Los diagnósticos del encabezado se recalculan sobre la primera línea; los del
+cuerpo (separación y footers) se guardan y solo se recalculan si el cambio sale de la primera línea. Los cambios
+seguidos se agrupan: los diagnósticos se publican cuando el documento deja de cambiar durante `--debounce-ms`.
+
+Uso: conventional-pre-commit lsp [reglas]
+"""
+
+import argparse
+import json
+import queue
+import re
+import sys
+import threading
+import time
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+
+from conventional_pre_commit import cli, rules, suggest, trailers, width
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.hook import RESULT_FAIL, RESULT_SUCCESS
+
+DEBOUNCE_MS = 75
+SOURCE = "conventional-pre-commit"
+
+# componentes de `errors()` que dependen solo del encabezado
+HEADER_COMPONENTS = ("type", "scope", "delim", "id", "subject", "header-length")
+# partes que usan las reglas de terceros que se recalculan con el encabezado
+HEADER_PARTS = {rules.PART_HEADER, rules.PART_SCOPES}
+
+SEVERITY_ERROR = 1
+# textDocumentSync: cambios incrementales
+SYNC_INCREMENTAL = 2
+METHOD_NOT_FOUND = -32601
+
+_HEADER = re.compile(
+    r"(?P<type>[^\s(!:]*)(?P<scope>\([^)]*\)?)?(?P<bang>!)?(?P<delim>:)?(?P<space>\s*)(?P<id>\d*)(?P<subject>.*)"
+)
+
+MESSAGES = {
+    "type": "Falta el tipo o no es válido. Valores esperados: {options}.",
+    "scope": "Falta el scope o no es válido.",
+    "delim": 'Falta el delimitador ":" después del tipo y el scope.',
+    "id": "Falta el id (número del requerimiento) después del delimitador.",
+    "subject": "Falta el asunto: un espacio y una descripción después del id.",
+    "sep": "Falta una línea en blanco entre el encabezado y el cuerpo.",
+    "breaking": "Un encabezado con ! requiere un footer BREAKING CHANGE: descripción (en mayúsculas).",
+    "trailers": "Faltan los footers: {options}.",
+    "header-length": "El encabezado supera {limit} columnas.",
+    "body-length": "La línea supera {limit} columnas.",
+}
+MAX_OPTIONS = 20
+
+
+def _to_utf16(line: str, index: int) -> int:
+    """Convierte una posición de `line` en unidades UTF-16, como las cuenta LSP."""
+    if line.isascii():
+        return index
+    return len(line[:index].encode("utf-16-le")) // 2
+
+
+def _from_utf16(line: str, units: int) -> int:
+    """Convierte una posición en unidades UTF-16 a una posición de `line`."""
+    if line.isascii():
+        return min(units, len(line))
+    count = 0
+    for index, char in enumerate(line):
+        if count >= units:
+            return index
+        count += 2 if ord(char) > 0xFFFF else 1
+    return len(line)
+
+
+def _line_bounds(text: str, line: int) -> Tuple[int, int]:
+    """Devuelve el inicio y el fin (sin el salto de línea) de la línea `line` de `text`."""
+    start = 0
+    for _ in range(line):
+        start = text.find("\n", start) + 1
+        if not start:
+            return len(text), len(text)
+    end = text.find("\n", start)
+    return start, len(text) if end < 0 else end
+
+
+def offset(text: str, position: dict) -> int:
+    """Convierte una posición LSP (`{"line", "character"}`) en una posición de `text`."""
+    start, end = _line_bounds(text, position["line"])
+    return start + _from_utf16(text[start:end], position["character"])
+
+
+def _range(line: int, text: str, start: int, end: int) -> dict:
+    return {
+        "start": {"line": line, "character": _to_utf16(text, start)},
+        "end": {"line": line, "character": _to_utf16(text, end)},
+    }
+
+
+def _diagnostic(component: str, line: int, text: str, start: int, end: int, message: str) -> dict:
+    return {
+        "range": _range(line, text, start, end),
+        "severity": SEVERITY_ERROR,
+        "source": SOURCE,
+        "code": component,
+        "message": message,
+    }
+
+
+def _options(values: List[str]) -> str:
+    text = ", ".join(values[:MAX_OPTIONS])
+    if len(values) > MAX_OPTIONS:
+        text += f" y {len(values) - MAX_OPTIONS} más"
+    return text
+
+
+class Body(NamedTuple):
+    """Resultado del análisis del cuerpo, que no cambia mientras solo se edite el encabezado."""
+
+    diagnostics: List[dict]
+    # footers analizados, solo si alguna regla los necesita
+    found: List[trailers.Trailer]
+    # línea y texto donde se reportan los errores de footers
+    footer_line: int
+    footer_text: str
+
+
+class Document:
+    """Documento abierto en el editor."""
+
+    def __init__(self, uri: str, text: str, version: int = 0):
+        self.uri = uri
+        self.text = text
+        self.version = version
+        self.body: Optional[Body] = None
+
+    @property
+    def header(self) -> str:
+        end = self.text.find("\n")
+        return (self.text if end < 0 else self.text[:end]).rstrip("\r")
+
+    def apply(self, changes: List[dict]):
+        """Aplica los cambios de `textDocument/didChange`; descarta el análisis del cuerpo si salen de la primera línea."""
+        for change in changes:
+            if "range" not in change:
+                self.text = change["text"]
+                self.body = None
+                continue
+            start, end = change["range"]["start"], change["range"]["end"]
+            before, after = offset(self.text, start), offset(self.text, end)
+            self.text = self.text[:before] + change["text"] + self.text[after:]
+            if start["line"] or end["line"] or "\n" in change["text"] or "\r" in change["text"]:
+                self.body = None
+
+
+class Linter:
+    """Calcula los diagnósticos de un documento con las reglas de `commit`."""
+
+    def __init__(self, commit: ConventionalCommit, strict: bool = False):
+        self.commit = commit
+        self.strict = strict
+
+    def diagnostics(self, document: Document) -> List[dict]:
+        header = document.header
+        if header.startswith(self.commit.comment_char):
+            # el encabezado real es otra línea: se analiza el documento completo sin rangos precisos
+            document.body = None
+            return self._whole(document.text)
+        if not self.strict and (self.commit.has_autosquash_prefix(header) or self.commit.is_merge(header)):
+            return []
+
+        if document.body is None:
+            document.body = self._body(document.text)
+        body = document.body
+
+        found = self._header(header)
+        if self.commit.breaking_footer:
+            bang = _HEADER.match(header).group("bang")
+            if trailers.invalid_breaking(body.found, bool(bang)):
+                line, text = body.footer_line, body.footer_text
+                found.append(_diagnostic("breaking", line, text, 0, len(text), MESSAGES["breaking"]))
+        return found + body.diagnostics
+
+    def _is_header_rule(self, error: str) -> bool:
+        """True si el componente `error` depende solo del encabezado (incluidas las reglas de terceros)."""
+        if error in HEADER_COMPONENTS:
+            return True
+        rule = self.commit.diagnostics.get(error)
+        return error not in MESSAGES and rule is not None and set(rule.needs) <= HEADER_PARTS
+
+    def _message(self, error: str, **values) -> str:
+        if error in MESSAGES:
+            return MESSAGES[error].format(**values)
+        rule = self.commit.diagnostics.get(error)
+        description = rule.description if rule is not None else ""
+        return f"No se cumple la regla {error}: {description}." if description else f"No se cumple la regla {error}."
+
+    def _header(self, header: str) -> List[dict]:
+        errors = [error for error in self.commit.errors(header) if self._is_header_rule(error)]
+        if not errors:
+            return []
+
+        match = _HEADER.match(header)
+        # los grupos opcionales que no coinciden se reportan como un rango vacío donde deberían estar
+        scope_end = match.end("scope") if match.group("scope") is not None else match.end("type")
+        delim_start = match.start("bang") if match.group("bang") else scope_end
+        spans = {
+            "type": match.span("type") if match.group("type") else (0, min(1, len(header))),
+            "scope": match.span("scope") if match.group("scope") else (scope_end, scope_end),
+            "delim": (delim_start, match.end("delim")) if match.group("delim") else (delim_start, delim_start),
+            "id": match.span("id"),
+            "subject": match.span("subject"),
+        }
+        if "header-length" in errors:
+            spans["header-length"] = (width.cut(header, self.commit.max_header_length), len(header))
+
+        hints = suggest.suggestions(self.commit, header) if {"type", "scope"} & set(errors) else {}
+        diagnostics = []
+        for error in errors:
+            message = self._message(error, options=_options(self.commit.types), limit=self.commit.max_header_length)
+            if error == "scope" and self.commit.scopes:
+                message += f" Valores esperados: {_options(self.commit.scopes)}."
+            options = [value for group in hints.get(error, {}).values() for value in group]
+            if options:
+                message += f" ¿Quisiste decir {', '.join(options)}?"
+            start, end = spans.get(error, (0, len(header)))
+            diagnostics.append(_diagnostic(error, 0, header, start, end, message))
+        return diagnostics
+
+    def _body(self, text: str) -> Body:
+        message = self.commit.clean(text)
+        # sin fail-fast: el cuerpo se guarda entre cambios del encabezado, así que una falla del encabezado no
+        # puede ocultar las del cuerpo (con fail-fast `errors()` se detendría en la primera)
+        errors = self.commit.diagnostics.run(self.commit, message)
+
+        end = len(text)
+        while end and text[end - 1].isspace():
+            end -= 1
+        start = text.rfind("\n", 0, end) + 1
+        footer_line = text.count("\n", 0, start)
+        footer_text = text[start:end].rstrip("\r")
+
+        diagnostics = []
+        if "sep" in errors:
+            second, stop = _line_bounds(text, 1)
+            line = text[second:stop].rstrip("\r")
+            diagnostics.append(_diagnostic("sep", 1, line, 0, len(line), MESSAGES["sep"]))
+        if "body-length" in errors:
+            diagnostics.extend(self._overflows(text, message))
+        found = self.commit.trailers(message) if self.commit.needs_trailers else []
+        missing = trailers.missing(found, self.commit.required_trailers)
+        if missing:
+            text = MESSAGES["trailers"].format(options=_options(missing))
+            diagnostics.append(_diagnostic("trailers", footer_line, footer_text, 0, len(footer_text), text))
+        for error in errors:
+            # reglas de terceros que usan el cuerpo: se reportan al final del mensaje, como los footers
+            if error not in MESSAGES and not self._is_header_rule(error):
+                hint = self._message(error)
+                diagnostics.append(_diagnostic(error, footer_line, footer_text, 0, len(footer_text), hint))
+        return Body(diagnostics, found, footer_line, footer_text)
+
+    def _overflows(self, text: str, message: str) -> List[dict]:
+        """
+        Diagnósticos de las líneas del cuerpo que superan el límite de columnas. Las líneas largas del mensaje
+        limpio se buscan en orden en el documento, que además tiene los comentarios.
+        """
+        limit = self.commit.max_body_line_length
+        lines = text.split("\n")
+        number = 1
+        diagnostics = []
+        for line in message.split("\n")[1:]:
+            line = line.rstrip("\r")
+            if width.cut(line, limit) == len(line):
+                continue
+            while number < len(lines) and lines[number].rstrip() != line.rstrip():
+                number += 1
+            if number == len(lines):
+                break
+            original = lines[number].rstrip("\r")
+            hint = MESSAGES["body-length"].format(limit=limit)
+            diagnostics.append(_diagnostic("body-length", number, original, width.cut(original, limit), len(original), hint))
+            number += 1
+        return diagnostics
+
+    def _whole(self, text: str) -> List[dict]:
+        message = self.commit.clean(text)
+        if not self.strict and (self.commit.has_autosquash_prefix(message) or self.commit.is_merge(message)):
+            return []
+        missing = trailers.missing(self.commit.trailers(message), self.commit.required_trailers)
+        diagnostics = []
+        for error in self.commit.errors(message):
+            options = _options(missing if error == "trailers" else self.commit.types)
+            limit = self.commit.max_body_line_length if error == "body-length" else self.commit.max_header_length
+            diagnostics.append(_diagnostic(error, 0, "", 0, 0, self._message(error, options=options, limit=limit)))
+        return diagnostics
+
+
+def read_message(stream: BinaryIO) -> Optional[dict]:
+    """Lee un mensaje JSON-RPC con encabezados `Content-Length`; devuelve None al terminar la entrada."""
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    if length is None:
+        return None
+    return json.loads(stream.read(length).decode("utf-8"))
+
+
+def write_message(stream: BinaryIO, message: dict):
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+    stream.flush()
+
+
+class Server:
+    """Servidor LSP: procesa los mensajes del editor y publica los diagnósticos con debounce."""
+
+    def __init__(self, linter: Linter, stdin: BinaryIO, stdout: BinaryIO, debounce: float = DEBOUNCE_MS / 1000):
+        self.linter = linter
+        self.stdin = stdin
+        self.stdout = stdout
+        self.debounce = debounce
+        self.documents: Dict[str, Document] = {}
+        # documentos con cambios sin publicar y el momento en que se publican
+        self.pending: Dict[str, float] = {}
+        self.shutdown = False
+
+    def serve(self) -> int:
+        """Atiende mensajes hasta `exit` o el fin de la entrada; devuelve el código de salida."""
+        messages: "queue.Queue[Optional[dict]]" = queue.Queue()
+
+        def _read():
+            while True:
+                message = read_message(self.stdin)
+                messages.put(message)
+                if message is None:
+                    return
+
+        threading.Thread(target=_read, name="conventional-pre-commit-lsp", daemon=True).start()
+        while True:
+            timeout = max(0.0, min(self.pending.values()) - time.monotonic()) if self.pending else None
+            try:
+                message = messages.get(timeout=timeout)
+            except queue.Empty:
+                self.flush()
+                continue
+            if message is None:
+                self.flush(force=True)
+                return RESULT_FAIL
+            if message.get("method") == "exit":
+                return RESULT_SUCCESS if self.shutdown else RESULT_FAIL
+            self.handle(message)
+
+    def flush(self, force: bool = False):
+        """Publica los diagnósticos de los documentos cuyo debounce ya venció (o de todos, con `force`)."""
+        now = time.monotonic()
+        for uri, deadline in list(self.pending.items()):
+            if force or deadline <= now:
+                del self.pending[uri]
+                self.publish(uri)
+
+    def publish(self, uri: str):
+        document = self.documents.get(uri)
+        diagnostics = self.linter.diagnostics(document) if document is not None else []
+        params = {"uri": uri, "diagnostics": diagnostics}
+        if document is not None:
+            params["version"] = document.version
+        self.notify("textDocument/publishDiagnostics", params)
+
+    def notify(self, method: str, params: dict):
+        write_message(self.stdout, {"jsonrpc": "2.0", "method": method, "params": params})
+
+    def respond(self, request: dict, result=None, error: Optional[dict] = None):
+        response = {"jsonrpc": "2.0", "id": request["id"]}
+        if error is not None:
+            response["error"] = error
+        else:
+            response["result"] = result
+        write_message(self.stdout, response)
+
+    def handle(self, message: dict):
+        method = message.get("method")
+        params = message.get("params") or {}
+
+        if method == "initialize":
+            capabilities = {"textDocumentSync": {"openClose": True, "change": SYNC_INCREMENTAL}}
+            self.respond(message, {"capabilities": capabilities, "serverInfo": {"name": SOURCE}})
+        elif method == "shutdown":
+            self.flush(force=True)
+            self.shutdown = True
+            self.respond(message, None)
+        elif method == "textDocument/didOpen":
+            item = params["textDocument"]
+            self.documents[item["uri"]] = Document(item["uri"], item["text"], item.get("version", 0))
+            self.publish(item["uri"])
+        elif method == "textDocument/didChange":
+            uri = params["textDocument"]["uri"]
+            document = self.documents.get(uri)
+            if document is None:
+                return
+            document.apply(params["contentChanges"])
+            document.version = params["textDocument"].get("version", document.version)
+            self.pending[uri] = time.monotonic() + self.debounce
+        elif method == "textDocument/didClose":
+            uri = params["textDocument"]["uri"]
+            self.documents.pop(uri, None)
+            self.pending.pop(uri, None)
+            self.publish(uri)
+        elif "id" in message:
+            self.respond(message, error={"code": METHOD_NOT_FOUND, "message": f"Método no soportado: {method}"})
+
+
+def main(argv: List[str] = [], stdin: Optional[BinaryIO] = None, stdout: Optional[BinaryIO] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="conventional-pre-commit lsp",
+        description="Servidor de lenguaje (LSP) por stdio con diagnósticos de Conventional Commits para editores.",
+    )
+    cli.add_rule_arguments(parser)
+    parser.add_argument(
+        "--debounce-ms",
+        type=int,
+        default=DEBOUNCE_MS,
+        help=f"Espera sin cambios antes de publicar diagnósticos, en milisegundos (por defecto: {DEBOUNCE_MS}).",
+    )
+
+    try:
+        args = parser.parse_args(argv)
+        validator = cli.validator(args, parser)
+    except SystemExit:
+        return RESULT_FAIL
+
+    linter = Linter(validator, args.strict)
+    server = Server(linter, stdin or sys.stdin.buffer, stdout or sys.stdout.buffer, args.debounce_ms / 1000)
+    return server.serve()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,188 @@
+"""
+Métricas del hook y de las auditorías en el formato de texto de Prometheus, para el textfile collector de
+node_exporter.
+
+`Metrics` acumula contadores e histogramas en atributos de la instancia: registrar un mensaje cuesta unas pocas
+sumas y registrar una duración, una búsqueda binaria en una tupla de límites fijos. Nada se formatea hasta
+`render()`. Como `Stats`, las métricas de varios repositorios se combinan con `update()`. El archivo se escribe
+de forma atómica (archivo temporal + `os.replace`), así que el collector nunca lee un archivo a medio escribir;
+cada escritura reemplaza la anterior con los valores de la ejecución en curso.
+
+Todas las series llevan la etiqueta `command` (`hook` o `audit`), para que los archivos de ambos comandos puedan
+estar en el mismo directorio del collector.
+"""
+
+import os
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Iterable, List, Optional
+
+PREFIX = "conventional_pre_commit"
+
+# límites de los histogramas de duración, en segundos (de 10 µs a 10 s)
+BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# etapas con histograma de duración: leer el mensaje (o un bloque de `git log`), limpiarlo y validarlo
+PHASES = ("read", "clean", "match")
+
+
+class Histogram:
+    """Histograma de duraciones con los límites de `BUCKETS`."""
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self):
+        # una cuenta por límite más la de +Inf; se acumulan recién al exportar
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def update(self, other: "Histogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+
+
+class Metrics:
+    """Contadores de una ejecución: mensajes, fallos por componente, consultas a la caché y duraciones por etapa."""
+
+    def __init__(self):
+        self.messages = 0
+        self.failures = 0
+        self.errors: Counter = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.read = Histogram()
+        self.clean = Histogram()
+        self.match = Histogram()
+
+    def add(self, valid: bool, errors: Iterable[str] = ()):
+        """Cuenta un mensaje validado; `errors` son los componentes reportados por `errors()` si no es válido."""
+        self.messages += 1
+        if not valid:
+            self.failures += 1
+            self.errors.update(errors)
+
+    def reject(self, errors: Iterable[str]):
+        """Cuenta como inválido un mensaje ya contado como válido (por ejemplo, un fixup! sin destino)."""
+        self.failures += 1
+        self.errors.update(errors)
+
+    def update(self, other: "Metrics") -> "Metrics":
+        """Combina los contadores de `other` en esta instancia."""
+        self.messages += other.messages
+        self.failures += other.failures
+        self.errors.update(other.errors)
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+        for phase in PHASES:
+            getattr(self, phase).update(getattr(other, phase))
+        return self
+
+    @classmethod
+    def merge(cls, metrics: Iterable["Metrics"]) -> "Metrics":
+        """Combina varias métricas en una nueva."""
+        result = cls()
+        for other in metrics:
+            result.update(other)
+        return result
+
+    def render(self, command: str, duration: Optional[float] = None, timestamp: Optional[float] = None) -> str:
+        """Devuelve las métricas en el formato de texto de Prometheus."""
+        lines: List[str] = []
+        command_label = f'command="{_escape(command)}"'
+
+        def _family(name: str, kind: str, description: str):
+            lines.append(f"# HELP {PREFIX}_{name} {description}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+        _family("messages_total", "counter", "Mensajes validados.")
+        lines.append(f"{PREFIX}_messages_total{{{command_label}}} {self.messages}")
+        _family("failures_total", "counter", "Mensajes inválidos.")
+        lines.append(f"{PREFIX}_failures_total{{{command_label}}} {self.failures}")
+        _family("errors_total", "counter", "Componentes y reglas que no se cumplen, según errors().")
+        for component, count in sorted(self.errors.items()):
+            lines.append(f'{PREFIX}_errors_total{{{command_label},component="{_escape(component)}"}} {count}')
+
+        lookups = self.cache_hits + self.cache_misses
+        if lookups:
+            _family("cache_lookups_total", "counter", "Consultas a la caché de resultados.")
+            lines.append(f'{PREFIX}_cache_lookups_total{{{command_label},result="hit"}} {self.cache_hits}')
+            lines.append(f'{PREFIX}_cache_lookups_total{{{command_label},result="miss"}} {self.cache_misses}')
+            _family("cache_hit_ratio", "gauge", "Fracción de consultas a la caché que encontraron el resultado.")
+            lines.append(f"{PREFIX}_cache_hit_ratio{{{command_label}}} {_number(self.cache_hits / lookups)}")
+
+        _family("duration_seconds", "histogram", "Duración de cada etapa: lectura, limpieza y validación.")
+        for phase in PHASES:
+            histogram = getattr(self, phase)
+            labels = f'{command_label},phase="{phase}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram.counts):
+                cumulative += count
+                lines.append(f'{PREFIX}_duration_seconds_bucket{{{labels},le="{_number(bound)}"}} {cumulative}')
+            cumulative += histogram.counts[-1]
+            lines.append(f'{PREFIX}_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"{PREFIX}_duration_seconds_sum{{{labels}}} {_number(histogram.total)}")
+            lines.append(f"{PREFIX}_duration_seconds_count{{{labels}}} {cumulative}")
+
+        if duration is not None:
+            _family("run_duration_seconds", "gauge", "Duración de la ejecución hasta la escritura del archivo.")
+            lines.append(f"{PREFIX}_run_duration_seconds{{{command_label}}} {_number(duration)}")
+        _family("last_run_timestamp_seconds", "gauge", "Fecha de la escritura del archivo.")
+        now = time.time() if timestamp is None else timestamp
+        lines.append(f"{PREFIX}_last_run_timestamp_seconds{{{command_label}}} {_number(now)}")
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: str, command: str, duration: Optional[float] = None):
+        """Escribe las métricas en `path` de forma atómica."""
+        write(path, self.render(command, duration))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
+
+
+def write(path: str, text: str):
+    """Escribe `text` en `path` de forma atómica (archivo temporal en el mismo directorio + `os.replace`)."""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+        raise
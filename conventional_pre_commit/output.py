@@ -1,6 +1,11 @@
 import os
 
+from conventional_pre_commit import suggest, trailers, width
 from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.rules import RuleError
+
+# cantidad máxima de opciones válidas que se listan en los errores
+MAX_OPTIONS = 20
 
 
 class Colors:
@@ -61,10 +66,13 @@ def fail_verbose(commit: ConventionalCommit, use_color=True):
     ]
 
     def _options(opts):
-        formatted_opts = f"{c.yellow}, {c.blue}".join(opts)
+        formatted_opts = f"{c.yellow}, {c.blue}".join(opts[:MAX_OPTIONS])
+        if len(opts) > MAX_OPTIONS:
+            formatted_opts += f"{c.yellow} y {len(opts) - MAX_OPTIONS} más"
         return f"{c.blue}{formatted_opts}"
 
     errors = commit.errors()
+    found = suggest.suggestions(commit) if {"type", "scope"} & set(errors) else {}
     if errors:
         lines.append(f"{c.yellow}Por favor corrige los siguientes errores:{c.restore}")
         lines.append("")
@@ -80,16 +88,48 @@ def fail_verbose(commit: ConventionalCommit, use_color=True):
                     lines.append(
                         f"{c.yellow}  - Valor esperado para {c.restore}scope{c.yellow} pero no se encontró ninguno.{c.restore}"
                     )
+            elif group == "breaking":
+                lines.append(
+                    f"{c.yellow}  - Valor esperado para {c.restore}BREAKING CHANGE{c.yellow}: un footer "
+                    f"{c.restore}BREAKING CHANGE: descripción{c.yellow} (en mayúsculas) si el encabezado tiene "
+                    f"{c.restore}!{c.yellow}.{c.restore}"
+                )
+            elif group == "trailers":
+                trailer_opts = _options(trailers.missing(commit.trailers(), commit.required_trailers))
+                lines.append(f"{c.yellow}  - Valor esperado para {c.restore}footers{c.yellow} de: {trailer_opts}")
+            elif group == "header-length":
+                columns = width.width(subject(commit.message))
+                lines.append(
+                    f"{c.yellow}  - El {c.restore}encabezado{c.yellow} ocupa {columns} columnas; el máximo es "
+                    f"{commit.max_header_length}.{c.restore}"
+                )
+            elif group == "body-length":
+                numbers = _options([str(number) for number in commit.body_overflows()])
+                lines.append(
+                    f"{c.yellow}  - Líneas del {c.restore}cuerpo{c.yellow} de más de {commit.max_body_line_length} "
+                    f"columnas: {numbers}{c.restore}"
+                )
             elif group == "id":
                 # Nuevo manejo para el identificador numérico
                 lines.append(
                     f"{c.yellow}  - Valor esperado para {c.restore}id (Número del requerimiento){c.yellow} pero no se encontró ninguno.{c.restore}"
                 )
+            elif getattr(commit.diagnostics.get(group), "description", ""):
+                description = commit.diagnostics.get(group).description
+                lines.append(f"{c.yellow}  - Regla {c.restore}{group}{c.yellow}: {description}.{c.restore}")
             else:
                 lines.append(
                     f"{c.yellow}  - Valor esperado para {c.restore}{group}{c.yellow} pero no se encontró ninguno.{c.restore}"
                 )
 
+    if found:
+        lines.append("")
+        lines.append(f"{c.yellow}Sugerencias:{c.restore}")
+        for group in found.values():
+            for value, options in group.items():
+                suggested = _options(options)
+                lines.append(f"{c.yellow}  - {c.restore}{value}{c.yellow}: ¿quisiste decir {suggested}{c.yellow}?{c.restore}")
+
     lines.extend(
         [
             "",
@@ -112,3 +152,138 @@ def unicode_decode_error(use_color=True):
 Se asume codificación UTF-8, por favor configura git para escribir mensajes de commit en UTF-8.
 See {c.blue}https://github.com/ACTSIS/conventional-pre-commit/#_discussion{c.yellow} para más información.{c.restore}
 """
+
+
+def hook_timing(elapsed_ms: float, use_color=True):
+    c = Colors(use_color)
+    return f"{c.blue}conventional-pre-commit: validado en {elapsed_ms:.1f} ms{c.restore}"
+
+
+def hook_timeout(timeout_ms: int, elapsed_ms: float, allowed: bool, use_color=True):
+    c = Colors(use_color)
+    if allowed:
+        action = f"{c.yellow}Se permite el commit sin validar el mensaje.{c.restore}"
+    else:
+        action = f"{c.red}Se rechaza el commit.{c.restore} Vuelve a intentarlo o aumenta --timeout-ms."
+    return (
+        f"{c.yellow}[Tiempo agotado]{c.restore} la validación superó el límite de {timeout_ms} ms "
+        f"({elapsed_ms:.1f} ms). {action}"
+    )
+
+
+def scope_map_fail(commit: ConventionalCommit, unexpected, touched, use_color=True):
+    c = Colors(use_color)
+    if unexpected:
+        problem = f"{c.yellow}Scopes que no corresponden a los archivos en staging: {c.restore}{', '.join(unexpected)}"
+    else:
+        problem = f"{c.yellow}El commit modifica componentes del mapa de scopes pero no tiene scope.{c.restore}"
+    options = ", ".join(touched[:MAX_OPTIONS])
+    if len(touched) > MAX_OPTIONS:
+        options += f" y {len(touched) - MAX_OPTIONS} más"
+    lines = [
+        f"{c.red}[Scope incorrecto] >>{c.restore} {subject(commit.message)}",
+        problem,
+        f"{c.yellow}Componentes modificados: {c.blue}{options}{c.restore}",
+    ]
+    return os.linesep.join(lines)
+
+
+def rule_error(error: RuleError, use_color=True):
+    c = Colors(use_color)
+    return f"{c.red}[{error.title}]{c.restore} {c.yellow}{error}{c.restore}"
+
+
+def results_db_error(path: str, error: Exception, use_color=True):
+    c = Colors(use_color)
+    return f"{c.red}[Base de resultados]{c.restore} {c.yellow}{path}: {error}{c.restore}"
+
+
+def subject(commit_msg: str) -> str:
+    """Devuelve la primera línea de un mensaje de commit."""
+    return commit_msg.split("\n", 1)[0].rstrip("\r")
+
+
+def suggestions_summary(found, use_color=True):
+    """Resume las sugerencias de `suggest.suggestions()` en una línea, p. ej. `feta → feat`."""
+    c = Colors(use_color)
+    items = [f"{value} → {' | '.join(options)}" for group in found.values() for value, options in group.items()]
+    return f"{c.yellow}¿quisiste decir?{c.restore} {'; '.join(items)}"
+
+
+def audit_result(result, use_color=True, verbose=False, validator=None):
+    c = Colors(use_color)
+    if result.error is not None:
+        return f"{c.red}{result.repo}:{c.restore} {c.yellow}error:{c.restore} {result.error}"
+
+    color = c.red if result.failures else c.blue
+    lines = [f"{color}{result.repo}:{c.restore} {result.commits} commits, {len(result.failures)} inválidos"]
+    for git_commit, errors in result.failures:
+        lines.append(f"  {c.yellow}{git_commit.sha[:12]}{c.restore} {subject(git_commit.message)}")
+        if verbose and errors:
+            lines.append(f"    {c.yellow}errores:{c.restore} {', '.join(errors)}")
+            found = suggest.suggestions(validator, git_commit.message) if validator is not None else {}
+            if found:
+                lines.append(f"    {suggestions_summary(found, use_color)}")
+    if result.sampler is not None:
+        lines.append(sample_summary(result.estimate(), use_color=use_color))
+    if result.stats is not None:
+        lines.append(stats_summary(result.stats, use_color=use_color))
+    return os.linesep.join(lines)
+
+
+def sample_summary(estimate, use_color=True):
+    c = Colors(use_color)
+    return (
+        f"  {c.yellow}muestra:{c.restore} {estimate.sample} de {estimate.population} commits, "
+        f"cumplimiento estimado {estimate.rate:.1%} (IC 95%: {estimate.low:.1%} – {estimate.high:.1%})"
+    )
+
+
+def stats_summary(stats, title="", use_color=True, top=5):
+    c = Colors(use_color)
+
+    def _percent(count):
+        return f"{stats.ratio(count):.1%}"
+
+    def _top(counter):
+        return ", ".join(f"{key} {count}" for key, count in counter.most_common(top)) or "-"
+
+    lines = []
+    if title:
+        lines.append(f"{c.blue}{title}:{c.restore} {stats.commits} commits")
+    lines.extend(
+        [
+            f"  {c.yellow}válidos:{c.restore} {_percent(stats.valid)}, "
+            f"{c.yellow}con scope:{c.restore} {_percent(stats.with_scope)}, "
+            f"{c.yellow}con cuerpo:{c.restore} {_percent(stats.with_body)}",
+            f"  {c.yellow}tipos:{c.restore} {_top(stats.types)}",
+            f"  {c.yellow}scopes:{c.restore} {_top(stats.scopes)}",
+            f"  {c.yellow}footers:{c.restore} {_top(stats.trailers)}, {c.yellow}breaking:{c.restore} {stats.breaking}",
+            f"  {c.yellow}errores:{c.restore} {_top(stats.errors)}",
+        ]
+    )
+    return os.linesep.join(lines)
+
+
+def receive_failure(git_commit, errors, use_color=True):
+    c = Colors(use_color)
+    lines = [
+        f"{c.red}[Mensaje de commit incorrecto] >>{c.restore} {c.yellow}commit {git_commit.sha[:12]}{c.restore} "
+        f"{subject(git_commit.message)}",
+        f"  {c.yellow}errores:{c.restore} {', '.join(errors)}",
+    ]
+    return os.linesep.join(lines)
+
+
+def receive_summary(failures: int, checked: int, elapsed: float, use_color=True):
+    c = Colors(use_color)
+    return f"{c.red}{failures} de {checked} commits no siguen el formato de Conventional Commits{c.restore} ({elapsed:.2f}s)"
+
+
+def receive_budget_exceeded(checked: int, rejected: bool, use_color=True):
+    c = Colors(use_color)
+    action = "Se rechaza el push." if rejected else "Se acepta el push sin validar el resto."
+    return (
+        f"{c.yellow}Se agotó el presupuesto de validación tras {checked} commits. {action}{c.restore}{os.linesep}"
+        f"{c.yellow}Usa {c.restore}--max-commits{c.yellow} o {c.restore}--time-budget{c.yellow} para ajustarlo.{c.restore}"
+    )
@@ -0,0 +1,181 @@
+"""
+Validación en paralelo con un pool de procesos "en caliente" o de hilos.
+
+Cada proceso recibe las reglas una sola vez, al iniciar (`init_worker`), y construye su propio
+`ConventionalCommit`. Las tareas solo transportan lotes de mensajes y devuelven tuplas compactas
+`(valido, errores)`, en lugar de serializar el validador con cada mensaje. Con estadísticas, cada lote también
+devuelve su `Stats`, que el proceso principal combina con `update()`: el análisis de tipos, scopes y footers
+de cada mensaje también ocurre en paralelo.
+
+Con hilos no hace falta copiar nada: todos comparten el mismo `ConventionalCommit`, que no se modifica al
+validar. En CPython con GIL los hilos no aceleran la validación; en las versiones sin GIL (free-threading)
+evitan el costo de arrancar procesos y de serializar los mensajes.
+"""
+
+import functools
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from conventional_pre_commit import history
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.stats import Stats
+
+# (tipos, scope opcional, scopes, carácter de comentario, modo de limpieza, footer de BREAKING CHANGE, footers requeridos,
+#  columnas del encabezado, columnas del cuerpo, reglas de terceros, fail-fast)
+Rules = Tuple[
+    Tuple[str, ...],
+    bool,
+    Tuple[str, ...],
+    str,
+    str,
+    bool,
+    Tuple[str, ...],
+    Optional[int],
+    Optional[int],
+    Tuple[str, ...],
+    bool,
+]
+# (valido, errores)
+Outcome = Tuple[bool, Tuple[str, ...]]
+
+BATCH_SIZE = 256
+
+BACKEND_PROCESS = "process"
+BACKEND_THREAD = "thread"
+BACKENDS = [BACKEND_PROCESS, BACKEND_THREAD]
+
+_validator: Optional[ConventionalCommit] = None
+_strict = False
+
+
+def rules(commit: ConventionalCommit) -> Rules:
+    """Devuelve las reglas de `commit` en una forma compacta y serializable."""
+    return (
+        tuple(commit.types),
+        commit.scope_optional,
+        tuple(commit.scopes),
+        commit.comment_char,
+        commit.cleanup_mode,
+        commit.breaking_footer,
+        tuple(commit.required_trailers),
+        commit.max_header_length,
+        commit.max_body_line_length,
+        tuple(commit.rules),
+        commit.fail_fast,
+    )
+
+
+def init_worker(worker_rules: Rules, strict: bool = False):
+    """Inicializador de cada proceso: construye el validador una sola vez."""
+    global _validator, _strict
+    types, scope_optional, scopes, comment_char, cleanup_mode, breaking_footer, required_trailers, *rest = worker_rules
+    max_header_length, max_body_line_length, names, fail_fast = rest
+    _validator = ConventionalCommit(
+        types=list(types),
+        scope_optional=scope_optional,
+        scopes=list(scopes),
+        comment_char=comment_char,
+        cleanup_mode=cleanup_mode,
+        breaking_footer=breaking_footer,
+        required_trailers=list(required_trailers),
+        max_header_length=max_header_length,
+        max_body_line_length=max_body_line_length,
+        rules=list(names),
+        fail_fast=fail_fast,
+    )
+    _strict = strict
+
+
+def validate_messages(validator: ConventionalCommit, strict: bool, messages: List[str]) -> List[Outcome]:
+    """Valida un lote de mensajes con `validator`; no usa estado global, así que se puede llamar desde varios hilos."""
+    commits = (history.GitCommit("", message=message) for message in messages)
+    return [
+        (valid, () if valid else tuple(validator.errors(git_commit.message)))
+        for git_commit, valid in history.validate(commits, validator, strict)
+    ]
+
+
+def validate_messages_stats(validator: ConventionalCommit, strict: bool, messages: List[str]) -> Tuple[List[Outcome], Stats]:
+    """Como `validate_messages`, y además acumula las estadísticas del lote."""
+    outcomes = validate_messages(validator, strict, messages)
+    stats = Stats()
+    for message, (valid, errors) in zip(messages, outcomes):
+        stats.add(validator, message, valid, errors)
+    return outcomes, stats
+
+
+def validate_batch(messages: List[str]) -> List[Outcome]:
+    """Valida un lote de mensajes con el validador del proceso."""
+    return validate_messages(_validator, _strict, messages)
+
+
+def validate_batch_stats(messages: List[str]) -> Tuple[List[Outcome], Stats]:
+    """Valida un lote de mensajes con el validador del proceso y devuelve también sus estadísticas."""
+    return validate_messages_stats(_validator, _strict, messages)
+
+
+def create_pool(
+    commit: ConventionalCommit, strict: bool = False, workers: Optional[int] = None, backend: str = BACKEND_PROCESS
+) -> Executor:
+    """Crea un pool de procesos inicializados con las reglas de `commit` o, con `backend="thread"`, de hilos."""
+    if backend == BACKEND_THREAD:
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="conventional-pre-commit")
+    return ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(rules(commit), strict))
+
+
+def task(pool: Executor, commit: ConventionalCommit, strict: bool = False, stats: bool = False) -> Callable:
+    """
+    Devuelve la función que valida un lote en `pool`: en un pool de procesos, la que usa el validador de cada
+    proceso; en uno de hilos, la que usa `commit` directamente. Con `stats`, la función devuelve
+    `(resultados, Stats)`.
+    """
+    if isinstance(pool, ProcessPoolExecutor):
+        return validate_batch_stats if stats else validate_batch
+    return functools.partial(validate_messages_stats if stats else validate_messages, commit, strict)
+
+
+def _batches(messages: Iterable[str], size: int) -> Iterator[List[str]]:
+    batch = []
+    for message in messages:
+        batch.append(message)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def validate_parallel(
+    messages: Iterable[str],
+    commit: ConventionalCommit,
+    strict: bool = False,
+    workers: Optional[int] = None,
+    batch_size: int = BATCH_SIZE,
+    pool: Optional[Executor] = None,
+    backend: str = BACKEND_PROCESS,
+) -> Iterator[Outcome]:
+    """
+    Valida `messages` en paralelo y produce los resultados en el mismo orden.
+
+    Consume la entrada a medida que avanza, con a lo sumo dos lotes en curso por proceso (o hilo).
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = create_pool(commit, strict, workers, backend)
+    validate = task(pool, commit, strict)
+    window = 2 * (workers or os.cpu_count() or 1)
+    pending: deque = deque()
+    try:
+        for batch in _batches(messages, batch_size):
+            pending.append(pool.submit(validate, batch))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_pool:
+            pool.shutdown()
@@ -0,0 +1,168 @@
+"""
+Hook `pre-receive` del lado del servidor.
+
+Lee las actualizaciones de referencias de la entrada estándar (`<old> <new> <ref>` por línea) y valida los
+commits nuevos de todas las referencias con un único `git log <news> --not --all`, de modo que el historial
+compartido entre referencias se recorre una sola vez. La validación es incremental y se detiene al agotar el
+presupuesto de tiempo o la cantidad máxima de commits. Los destinos de `fixup!`/`squash!`/`amend!` que no están
+entre los commits nuevos se buscan luego en el historial completo de las referencias actualizadas.
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, TextIO, Tuple
+
+from conventional_pre_commit import cli, history, output
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.hook import POLICY_ALLOW, POLICY_REJECT, RESULT_FAIL, RESULT_SUCCESS
+
+ZERO_SHA = "0" * 40
+
+
+@dataclass
+class ReceiveResult:
+    """Resultado de validar un push."""
+
+    checked: int = 0
+    # commits inválidos con los componentes que no cumplen, como en `RepoResult.failures`
+    failures: List[Tuple[history.GitCommit, List[str]]] = field(default_factory=list)
+    budget_exceeded: bool = False
+    elapsed: float = 0.0
+
+
+def parse_updates(lines: Sequence[str]) -> List[Tuple[str, str, str]]:
+    """Devuelve las actualizaciones `(old, new, ref)` de la entrada del hook, sin las referencias eliminadas."""
+    updates = []
+    for line in lines:
+        parts = line.split()
+        if len(parts) == 3 and parts[1] != ZERO_SHA:
+            updates.append((parts[0], parts[1], parts[2]))
+    return updates
+
+
+def check(
+    updates: Sequence[Tuple[str, str, str]],
+    validator: ConventionalCommit,
+    repo: str = ".",
+    strict: bool = False,
+    max_commits: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    check_autosquash: bool = False,
+) -> ReceiveResult:
+    """Valida los commits nuevos de `updates` dentro del presupuesto indicado."""
+    result = ReceiveResult()
+    start = time.monotonic()
+    deadline = start + time_budget if time_budget else None
+    if not updates:
+        return result
+
+    autosquash = history.AutosquashIndex() if check_autosquash and not strict else None
+    news = sorted({new for _, new, _ in updates})
+    log = history.iter_log(news + ["--not", "--all"], repo)
+    try:
+        for git_commit, valid in history.validate(log, validator, strict, autosquash):
+            if (max_commits is not None and result.checked >= max_commits) or (
+                deadline is not None and time.monotonic() > deadline
+            ):
+                result.budget_exceeded = True
+                break
+            result.checked += 1
+            if not valid:
+                result.failures.append((git_commit, validator.errors(git_commit.message)))
+    finally:
+        log.close()
+
+    if autosquash is not None and not result.budget_exceeded:
+        orphans = autosquash.orphans()
+        if orphans:
+            orphans = _orphans_in_history(orphans, news, validator, repo, deadline, result)
+        result.failures.extend((git_commit, ["autosquash"]) for git_commit in orphans)
+    result.elapsed = time.monotonic() - start
+    return result
+
+
+def _orphans_in_history(
+    orphans: List[history.GitCommit],
+    news: List[str],
+    validator: ConventionalCommit,
+    repo: str,
+    deadline: Optional[float],
+    result: ReceiveResult,
+) -> List[history.GitCommit]:
+    """
+    Busca los destinos de `orphans` en el historial completo de `news`, que incluye los commits que ya estaban en
+    el servidor; devuelve los que siguen sin destino. Solo se recorre si algún destino no estaba entre los nuevos.
+    """
+    index = history.AutosquashIndex()
+    log = history.iter_log(news, repo)
+    try:
+        for git_commit in log:
+            if deadline is not None and time.monotonic() > deadline:
+                result.budget_exceeded = True
+                return []
+            index.add_message(git_commit, validator.clean(git_commit.message), validator)
+    finally:
+        log.close()
+    return [
+        git_commit
+        for git_commit in orphans
+        if index.resolve(validator.autosquash_target(git_commit.message)) in (None, git_commit.sha)
+    ]
+
+
+def main(argv: List[str] = [], stdin: Optional[TextIO] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="conventional-pre-commit pre-receive",
+        description="Hook pre-receive: rechaza los push con commits que no siguen el formato de Conventional Commits.",
+    )
+    cli.add_rule_arguments(parser)
+    parser.add_argument("--repo", type=str, default=".", help="Ruta del repositorio (por defecto, el directorio actual).")
+    parser.add_argument("--max-commits", type=int, default=None, help="Cantidad máxima de commits a validar por push.")
+    parser.add_argument("--time-budget", type=float, default=None, help="Tiempo máximo de validación, en segundos.")
+    parser.add_argument(
+        "--on-budget-exceeded",
+        choices=[POLICY_ALLOW, POLICY_REJECT],
+        default=POLICY_REJECT,
+        help="Qué hacer si se agota el presupuesto antes de validar todos los commits (por defecto: reject).",
+    )
+    parser.add_argument(
+        "--max-report", type=int, default=10, help="Cantidad máxima de commits inválidos detallados en el reporte."
+    )
+    parser.add_argument(
+        "--no-color", action="store_false", default=True, dest="color", help="Desactiva los colores en la salida."
+    )
+
+    try:
+        args = parser.parse_args(argv)
+        validator = cli.validator(args, parser)
+    except SystemExit:
+        return RESULT_FAIL
+
+    updates = parse_updates((stdin or sys.stdin).read().splitlines())
+    result = check(
+        updates,
+        validator,
+        repo=args.repo,
+        strict=args.strict,
+        max_commits=args.max_commits,
+        time_budget=args.time_budget,
+        check_autosquash=args.check_autosquash,
+    )
+
+    for git_commit, errors in result.failures[: args.max_report]:
+        print(output.receive_failure(git_commit, errors, use_color=args.color))
+    if result.failures:
+        print(output.receive_summary(len(result.failures), result.checked, result.elapsed, use_color=args.color))
+
+    if result.budget_exceeded:
+        print(output.receive_budget_exceeded(result.checked, args.on_budget_exceeded == POLICY_REJECT, args.color))
+        if args.on_budget_exceeded == POLICY_REJECT:
+            return RESULT_FAIL
+
+    return RESULT_FAIL if result.failures else RESULT_SUCCESS
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,205 @@
+"""
+Base de datos SQLite con los commits inválidos de las auditorías, para consultarlos por autor, fecha, repositorio y
+tipo de error.
+
+Cada commit inválido se guarda una sola vez por huella de las reglas (`UNIQUE (sha, fingerprint)` con
+`INSERT OR IGNORE`), así que volver a auditar el mismo historial con las mismas reglas no duplica filas. Las filas se
+acumulan en memoria y se escriben con `executemany` (una sentencia preparada por tabla) en transacciones de
+`BATCH_SIZE` commits. La base usa WAL y las transacciones se abren con `BEGIN IMMEDIATE` y esperan hasta
+`BUSY_TIMEOUT` segundos si otro proceso está escribiendo, de modo que varias auditorías en paralelo pueden agregar
+resultados a la misma base.
+
+Ejemplo de consulta con `sqlite3`:
+
+    SELECT author, component, count(*) FROM failure_errors GROUP BY author, component ORDER BY 3 DESC;
+"""
+
+import hashlib
+import sqlite3
+import time
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from conventional_pre_commit import history, output, parallel
+from conventional_pre_commit.format import ConventionalCommit
+
+BATCH_SIZE = 5000
+BUSY_TIMEOUT = 30.0
+VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS failures (
+    sha TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    author TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    subject TEXT NOT NULL,
+    recorded INTEGER NOT NULL,
+    PRIMARY KEY (sha, fingerprint)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS errors (
+    sha TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    component TEXT NOT NULL,
+    PRIMARY KEY (sha, fingerprint, component)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS failures_repo ON failures (repo, timestamp);
+CREATE INDEX IF NOT EXISTS failures_author ON failures (author, timestamp);
+CREATE INDEX IF NOT EXISTS failures_timestamp ON failures (timestamp);
+CREATE INDEX IF NOT EXISTS errors_component ON errors (component);
+CREATE VIEW IF NOT EXISTS failure_errors AS
+    SELECT f.repo, f.sha, f.fingerprint, f.author, f.timestamp, f.subject, e.component
+    FROM failures f JOIN errors e USING (sha, fingerprint);
+"""
+
+INSERT_FAILURE = "INSERT OR IGNORE INTO failures VALUES (?, ?, ?, ?, ?, ?, ?)"
+INSERT_ERROR = "INSERT OR IGNORE INTO errors VALUES (?, ?, ?)"
+
+
+class StoredFailure(NamedTuple):
+    """Un commit inválido guardado en la base."""
+
+    repo: str
+    sha: str
+    author: str
+    timestamp: int
+    subject: str
+    errors: Tuple[str, ...]
+
+
+def fingerprint(commit: ConventionalCommit) -> str:
+    """Huella corta de las reglas de `commit`: los mismos commits con otras reglas se guardan por separado."""
+    return hashlib.blake2b(repr(parallel.rules(commit)).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class ResultStore:
+    """
+    Escritura por lotes y consulta de la base de resultados en `path`. Se usa como context manager: al salir se
+    escriben las filas pendientes y se cierra la conexión.
+    """
+
+    def __init__(self, path: str, batch_size: int = BATCH_SIZE, timeout: float = BUSY_TIMEOUT):
+        self.batch_size = max(batch_size, 1)
+        # fecha de la ejecución, común a todas las filas que agrega
+        self.recorded = int(time.time())
+        # sin transacciones implícitas: cada lote abre la suya con BEGIN IMMEDIATE
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._failures: List[tuple] = []
+        self._errors: List[tuple] = []
+        try:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            # con WAL, NORMAL solo sincroniza en los checkpoints y ninguna transacción confirmada se corrompe
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self._transaction(self._create)
+        except BaseException:
+            self.connection.close()
+            raise
+
+    def _create(self, cursor: sqlite3.Cursor):
+        (version,) = cursor.execute("PRAGMA user_version").fetchone()
+        if version > VERSION:
+            raise sqlite3.DatabaseError(f"versión {version} de la base no soportada (se esperaba {VERSION})")
+        for statement in SCHEMA.split(";"):
+            if statement.strip():
+                cursor.execute(statement)
+        cursor.execute(f"PRAGMA user_version={VERSION}")
+
+    def _transaction(self, operation):
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            operation(cursor)
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+
+    def add(self, repo: str, git_commit: history.GitCommit, errors: Iterable[str], fingerprint: str):
+        """Agrega un commit inválido al lote; el lote se escribe al llegar a `batch_size` commits."""
+        self._failures.append(
+            (
+                git_commit.sha,
+                fingerprint,
+                repo,
+                git_commit.author,
+                git_commit.timestamp,
+                output.subject(git_commit.message),
+                self.recorded,
+            )
+        )
+        self._errors.extend((git_commit.sha, fingerprint, component) for component in errors)
+        if len(self._failures) >= self.batch_size:
+            self.flush()
+
+    def add_failures(self, repo: str, failures: Iterable[Tuple[history.GitCommit, Sequence[str]]], fingerprint: str):
+        """Agrega los commits inválidos de un repositorio, como `RepoResult.failures`."""
+        for git_commit, errors in failures:
+            self.add(repo, git_commit, errors, fingerprint)
+
+    def flush(self):
+        """Escribe las filas pendientes en una sola transacción."""
+        if not self._failures:
+            return
+        failures, errors = self._failures, self._errors
+
+        def _insert(cursor: sqlite3.Cursor):
+            cursor.executemany(INSERT_FAILURE, failures)
+            cursor.executemany(INSERT_ERROR, errors)
+
+        self._transaction(_insert)
+        self._failures, self._errors = [], []
+
+    def failures(
+        self,
+        repo: Optional[str] = None,
+        author: Optional[str] = None,
+        component: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        fingerprint: Optional[str] = None,
+    ) -> List[StoredFailure]:
+        """
+        Devuelve los commits inválidos guardados, del más reciente al más antiguo, filtrados por repositorio, autor,
+        error, fecha del commit (`since <= timestamp < until`, en segundos) o huella de las reglas.
+        """
+        self.flush()
+        conditions, params = [], []
+        for column, value in (("repo", repo), ("author", author), ("fingerprint", fingerprint)):
+            if value is not None:
+                conditions.append(f"f.{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("f.timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("f.timestamp < ?")
+            params.append(until)
+        if component is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM errors e WHERE e.sha = f.sha AND e.fingerprint = f.fingerprint AND e.component = ?)"
+            )
+            params.append(component)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(
+            "SELECT f.repo, f.sha, f.author, f.timestamp, f.subject,"
+            " (SELECT group_concat(e.component, char(31)) FROM errors e WHERE e.sha = f.sha AND e.fingerprint = f.fingerprint)"
+            f" FROM failures f {where} ORDER BY f.timestamp DESC, f.sha",
+            params,
+        )
+        return [StoredFailure(*row[:5], tuple(sorted(row[5].split("\x1f"))) if row[5] else ()) for row in rows]
+
+    def close(self):
+        """Escribe las filas pendientes y cierra la conexión."""
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.connection.close()
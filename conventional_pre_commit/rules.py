@@ -0,0 +1,361 @@
+"""
+Reglas de validación de mensajes de commit.
+
+Cada regla declara las partes del mensaje que necesita (`needs`): el mensaje limpio, el encabezado, los scopes, el
+cuerpo, los footers o las rutas en staging. `Parts` calcula cada parte la primera vez que una regla la pide y la
+guarda para las siguientes, así que las partes que ninguna regla usa nunca se calculan. `Pipeline` ejecuta las
+reglas en orden; en modo fail-fast se detiene en la primera que falla y ejecuta primero las reglas que usan las
+partes más baratas, de modo que una falla en el encabezado evita analizar los footers o lanzar `git`.
+
+`ConventionalCommit` arma dos pipelines con las reglas de este módulo: `is_valid()` usa `FormatRule`, que valida
+el encabezado completo de una sola vez, y `errors()` usa una regla por componente (`type`, `scope`, ...). Ambos
+terminan con las reglas opcionales habilitadas por la configuración y las reglas de terceros.
+
+Las reglas de terceros son subclases de `Rule` publicadas como entry points del grupo `conventional_pre_commit.rules`:
+
+    [project.entry-points."conventional_pre_commit.rules"]
+    sin-wip = "mi_paquete.reglas:SinWip"
+
+Los entry points solo se buscan si la configuración nombra alguna regla (`--rules sin-wip`).
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from conventional_pre_commit import trailers, width
+from conventional_pre_commit.scanner import scanner_for
+
+PART_MESSAGE = "message"
+PART_HEADER = "header"
+PART_SCOPES = "scopes"
+PART_BODY = "body"
+PART_TRAILERS = "trailers"
+PART_STAGED = "staged"
+# costo relativo de calcular cada parte; en modo fail-fast se ejecutan primero las reglas más baratas
+COSTS: Dict[str, int] = {
+    PART_MESSAGE: 0,
+    PART_HEADER: 0,
+    PART_BODY: 1,
+    PART_SCOPES: 2,
+    PART_TRAILERS: 2,
+    PART_STAGED: 3,
+}
+
+ENTRY_POINT_GROUP = "conventional_pre_commit.rules"
+
+# rutas en staging, o una función que las devuelve (para lanzar `git` solo si alguna regla las necesita)
+Staged = Union[Sequence[str], Callable[[], Sequence[str]], None]
+
+
+class RuleError(ValueError):
+    """Una regla no se pudo cargar o evaluar (por ejemplo, no existe o no se pudo leer su configuración)."""
+
+    def __init__(self, title: str, message: str):
+        super().__init__(message)
+        self.title = title
+
+
+class _part:
+    """
+    Como `functools.cached_property`, sin el lock que esta toma en cada acceso en Python < 3.12: el primer acceso
+    calcula la parte y la guarda en la instancia, que desde entonces tiene prioridad sobre el descriptor.
+    """
+
+    def __init__(self, compute: Callable):
+        self.compute = compute
+        self.name = compute.__name__
+        self.__doc__ = compute.__doc__
+
+    def __get__(self, parts, owner=None):
+        if parts is None:
+            return self
+        value = parts.__dict__[self.name] = self.compute(parts)
+        return value
+
+
+class Parts:
+    """Partes de un mensaje ya limpio, calculadas solo cuando alguna regla las pide."""
+
+    def __init__(self, commit, message: str, staged: Staged = None):
+        self.commit = commit
+        self.message = message
+        self._staged = staged
+
+    @_part
+    def header(self) -> str:
+        end = self.message.find("\n")
+        return (self.message if end < 0 else self.message[:end]).rstrip("\r")
+
+    @_part
+    def body(self) -> str:
+        """Todo lo que sigue a la primera línea (vacío si el mensaje tiene una sola línea)."""
+        start = self.message.find("\n") + 1
+        return self.message[start:] if start else ""
+
+    @_part
+    def scopes(self) -> List[str]:
+        return self.commit.scope_values(self.header) if self.header else []
+
+    @_part
+    def trailers(self) -> List[trailers.Trailer]:
+        return trailers.parse(self.message)
+
+    @_part
+    def staged(self) -> List[str]:
+        return list(self._staged() if callable(self._staged) else self._staged or [])
+
+
+class Rule:
+    """
+    Base de las reglas. `name` es el componente que reporta `errors()` si la regla falla, `needs` son las partes
+    del mensaje que usa `check()` y `description` explica la regla en la salida detallada.
+    """
+
+    name = ""
+    needs: Tuple[str, ...] = ()
+    description = ""
+
+    @property
+    def cost(self) -> int:
+        return max((COSTS.get(part, 0) for part in self.needs), default=0)
+
+    def enabled(self, commit) -> bool:
+        """True si la configuración de `commit` habilita la regla."""
+        return True
+
+    def check(self, commit, parts: Parts) -> bool:
+        """Devuelve True si el mensaje cumple la regla."""
+        raise NotImplementedError
+
+
+class Pipeline:
+    """Ejecuta una lista de reglas sobre un mensaje ya limpio."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = list(rules)
+        # orden estable: a igual costo se respeta el orden de las reglas
+        fail_fast_rules = sorted(self.rules, key=lambda rule: rule.cost)
+        # (fail-fast, hay rutas en staging) -> reglas a ejecutar, calculadas una sola vez
+        self._plans = {
+            (fail_fast, has_staged): [rule for rule in order if has_staged or PART_STAGED not in rule.needs]
+            for fail_fast, order in ((False, self.rules), (True, fail_fast_rules))
+            for has_staged in (False, True)
+        }
+
+    def run(self, commit, message: str, staged: Staged = None, fail_fast: bool = False) -> List[str]:
+        """
+        Devuelve los nombres de las reglas que fallan. Las reglas que necesitan las rutas en staging se omiten si
+        `staged` es None (por ejemplo, al auditar el historial). Con `fail_fast`, se detiene en la primera falla.
+        """
+        parts = Parts(commit, message, staged)
+        failed = []
+        for rule in self._plans[fail_fast, staged is not None]:
+            if not rule.check(commit, parts):
+                failed.append(rule.name)
+                if fail_fast:
+                    break
+        return failed
+
+    def get(self, name: str) -> Optional[Rule]:
+        """Devuelve la regla llamada `name`, o None."""
+        return next((rule for rule in self.rules if rule.name == name), None)
+
+
+class FormatRule(Rule):
+    """Formato completo del encabezado (y la separación del cuerpo), validado de una sola vez."""
+
+    name = "format"
+    needs = (PART_MESSAGE,)
+
+    def check(self, commit, parts: Parts) -> bool:
+        return commit.format_is_valid(parts.message)
+
+
+class TypeRule(Rule):
+    name = "type"
+    needs = (PART_HEADER,)
+
+    def check(self, commit, parts: Parts) -> bool:
+        return bool(re.match(rf"^{commit.r_types}", parts.header))
+
+
+class ScopeRule(Rule):
+    name = "scope"
+    needs = (PART_HEADER,)
+
+    def check(self, commit, parts: Parts) -> bool:
+        header = parts.header
+        # con tipos y scopes literales, el scanner recorre las listas ambiguas (`a`, `b`, `a-b`) sin retroceder
+        header_scanner = scanner_for(commit.types, commit.scopes)
+        if header_scanner is not None:
+            return header_scanner.scope_is_valid(header, commit.scope_optional)
+        # sin scope tras el tipo: válido solo si es opcional; si está presente, debe ser válido
+        if not re.match(rf"^(?:{commit.r_types})\(", header):
+            return commit.scope_optional
+        match = re.match(rf"^(?:{commit.r_types})(?P<scope>{commit.r_scope})", header)
+        return bool(match and match.group("scope"))
+
+
+class DelimRule(Rule):
+    name = "delim"
+    needs = (PART_MESSAGE,)
+
+    def check(self, commit, parts: Parts) -> bool:
+        return bool(re.search(commit.r_delim, parts.message))
+
+
+class IdRule(Rule):
+    name = "id"
+    needs = (PART_MESSAGE,)
+
+    def check(self, commit, parts: Parts) -> bool:
+        return bool(re.search(rf"{commit.r_delim}\s*{commit.r_id}", parts.message))
+
+
+class SubjectRule(Rule):
+    """
+    Equivale a `re.search(commit.r_subject, message)`: sin MULTILINE, `$` solo coincide al final (o antes del
+    último salto de línea), así que basta buscar un espacio seguido de algún carácter en la última línea.
+    La búsqueda con la regex prueba cada espacio del mensaje y es cuadrática en líneas largas.
+    """
+
+    name = "subject"
+    needs = (PART_MESSAGE,)
+
+    def check(self, commit, parts: Parts) -> bool:
+        message = parts.message
+        end = len(message) - message.endswith("\n")
+        start = message.rfind("\n", 0, end) + 1
+        return message.find(" ", start, end - 1) >= 0
+
+
+class SeparatorRule(Rule):
+    """Si hay un cuerpo (un salto de línea seguido de texto), debe haber una línea en blanco antes."""
+
+    name = "sep"
+    needs = (PART_MESSAGE,)
+
+    def check(self, commit, parts: Parts) -> bool:
+        message = parts.message
+        return not re.search(r"\r?\n.+", message) or bool(re.search(r"\r?\n\r?\n.+", message))
+
+
+class BreakingFooterRule(Rule):
+    name = "breaking"
+    needs = (PART_HEADER, PART_TRAILERS)
+    description = "un encabezado con ! requiere un footer BREAKING CHANGE: descripción (en mayúsculas)"
+
+    def enabled(self, commit) -> bool:
+        return commit.breaking_footer
+
+    def check(self, commit, parts: Parts) -> bool:
+        match = commit.regex.match(parts.header)
+        return not trailers.invalid_breaking(parts.trailers, bool(match) and match.group("delim") == "!:")
+
+
+class RequiredTrailersRule(Rule):
+    name = "trailers"
+    needs = (PART_TRAILERS,)
+    description = "faltan footers requeridos"
+
+    def enabled(self, commit) -> bool:
+        return bool(commit.required_trailers)
+
+    def check(self, commit, parts: Parts) -> bool:
+        return not trailers.missing(parts.trailers, commit.required_trailers)
+
+
+class HeaderLengthRule(Rule):
+    name = "header-length"
+    needs = (PART_HEADER,)
+
+    def enabled(self, commit) -> bool:
+        return commit.max_header_length is not None
+
+    def check(self, commit, parts: Parts) -> bool:
+        return width.cut(parts.header, commit.max_header_length) == len(parts.header)
+
+
+class BodyLengthRule(Rule):
+    name = "body-length"
+    needs = (PART_BODY,)
+
+    def enabled(self, commit) -> bool:
+        return commit.max_body_line_length is not None
+
+    def check(self, commit, parts: Parts) -> bool:
+        return next(width.overflows(parts.body, commit.max_body_line_length), None) is None
+
+
+class ScopeMapRule(Rule):
+    name = "scope-map"
+    needs = (PART_SCOPES, PART_STAGED)
+    description = "los scopes deben corresponder a los componentes de los archivos en staging"
+
+    def enabled(self, commit) -> bool:
+        return bool(commit.scope_map)
+
+    def check(self, commit, parts: Parts) -> bool:
+        from conventional_pre_commit import scopemap
+
+        try:
+            trie = scopemap.load(commit.scope_map)
+        except (OSError, ValueError) as ex:
+            raise RuleError("Mapa de scopes", f"no se pudo leer {commit.scope_map}: {ex}") from ex
+        return scopemap.unexpected_scopes(parts.scopes, trie.scopes(parts.staged)) is None
+
+
+# una regla por componente de Conventional Commits, en el orden en que los reporta `errors()`
+COMPONENT_RULES: Tuple[Rule, ...] = (TypeRule(), ScopeRule(), DelimRule(), IdRule(), SubjectRule(), SeparatorRule())
+# reglas que se habilitan con la configuración
+OPTIONAL_RULES: Tuple[Rule, ...] = (
+    BreakingFooterRule(),
+    RequiredTrailersRule(),
+    HeaderLengthRule(),
+    BodyLengthRule(),
+    ScopeMapRule(),
+)
+FORMAT_RULE = FormatRule()
+
+
+@lru_cache(maxsize=None)
+def load(name: str) -> Rule:
+    """
+    Carga la regla de terceros `name` desde los entry points del grupo `ENTRY_POINT_GROUP`. El entry point puede
+    ser una subclase de `Rule` o una instancia; si no existe, o no es una regla, se produce `RuleError`.
+    """
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        found = list(entry_points.select(group=ENTRY_POINT_GROUP, name=name))
+    else:
+        # Python < 3.10: un diccionario por grupo
+        found = [entry_point for entry_point in entry_points.get(ENTRY_POINT_GROUP, []) if entry_point.name == name]
+    if not found:
+        raise RuleError("Reglas", f"no se encontró la regla {name!r} (entry points de {ENTRY_POINT_GROUP})")
+
+    loaded = found[0].load()
+    rule = loaded() if isinstance(loaded, type) else loaded
+    if not isinstance(rule, Rule):
+        raise RuleError("Reglas", f"la regla {name!r} no es una subclase de conventional_pre_commit.rules.Rule")
+    if not rule.name:
+        rule.name = name
+    return rule
+
+
+def pipelines(commit, names: Sequence[str] = ()) -> Tuple[Pipeline, Pipeline]:
+    """
+    Devuelve los pipelines de `commit`: el de validación (`FormatRule`) y el de diagnóstico (una regla por
+    componente), ambos seguidos de las reglas opcionales habilitadas y de las reglas de terceros `names`.
+    """
+    extra = [rule for rule in OPTIONAL_RULES if rule.enabled(commit)]
+    extra.extend(rule for rule in map(load, names) if rule.enabled(commit))
+    return _pipelines(tuple(extra))
+
+
+@lru_cache(maxsize=None)
+def _pipelines(extra: Tuple[Rule, ...]) -> Tuple[Pipeline, Pipeline]:
+    # las reglas no guardan estado, así que los validadores con las mismas reglas comparten los pipelines
+    return Pipeline([FORMAT_RULE, *extra]), Pipeline([*COMPONENT_RULES, *extra])
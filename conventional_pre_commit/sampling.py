@@ -0,0 +1,268 @@
+"""
+Muestreo estadístico del historial para estimar el cumplimiento sin validar todos los commits.
+
+Los muestreadores consumen el historial como flujo, en una sola pasada y con memoria acotada por el tamaño de la
+muestra: `ReservoirSampler` toma exactamente `n` commits (algoritmo L de Li, que salta directamente al siguiente
+reemplazo), `BernoulliSampler` toma cada commit con probabilidad `p` (con saltos geométricos) y
+`StratifiedSampler` reparte `n` entre períodos de tiempo en proporción a sus commits (con a lo sumo unos `2n`
+commits más uno por período en memoria). Con la misma semilla, la muestra es reproducible.
+"""
+
+import math
+import random
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from conventional_pre_commit.history import GitCommit
+
+STRATIFY_MONTH = "month"
+STRATIFY_YEAR = "year"
+STRATIFY = [STRATIFY_MONTH, STRATIFY_YEAR]
+
+# cuantil de la normal para un intervalo de confianza del 95%
+Z_95 = 1.959964
+
+
+class Sampler:
+    """Interfaz común: `offer()` recibe commits a medida que llegan y `finish()` entrega el resto de la muestra."""
+
+    def __init__(self):
+        self.population = 0
+
+    def offer(self, commits: Iterable[GitCommit]) -> List[GitCommit]:
+        """Devuelve los commits de `commits` que ya se sabe que forman parte de la muestra."""
+        raise NotImplementedError
+
+    def finish(self) -> List[GitCommit]:
+        """Devuelve los commits de la muestra que aún no se entregaron, en el orden del historial."""
+        return []
+
+    def sample(self, commits: Iterable[GitCommit]) -> Iterator[GitCommit]:
+        """Produce la muestra de `commits`."""
+        for git_commit in commits:
+            yield from self.offer((git_commit,))
+        yield from self.finish()
+
+
+class BernoulliSampler(Sampler):
+    """Incluye cada commit con probabilidad `rate`, saltando una cantidad geométrica de commits entre elegidos."""
+
+    def __init__(self, rate: float, rng: random.Random):
+        super().__init__()
+        self.rate = rate
+        self.rng = rng
+        self._next = self._skip()
+
+    def _skip(self) -> int:
+        if self.rate >= 1:
+            return 0
+        return int(math.log(1.0 - self.rng.random()) / math.log(1.0 - self.rate))
+
+    def offer(self, commits: Iterable[GitCommit]) -> List[GitCommit]:
+        selected = []
+        for git_commit in commits:
+            if self._next == 0:
+                selected.append(git_commit)
+                self._next = self._skip()
+            else:
+                self._next -= 1
+            self.population += 1
+        return selected
+
+
+class ReservoirSampler(Sampler):
+    """Muestra uniforme de exactamente `size` commits (o todos, si hay menos) con el algoritmo L."""
+
+    def __init__(self, size: int, rng: random.Random):
+        super().__init__()
+        self.size = size
+        self.rng = rng
+        self._reservoir: List[Tuple[int, GitCommit]] = []
+        self._weight = 1.0
+        # posición del próximo commit que entra en la reserva; `_advance()` salta desde el último elegido
+        self._next = size - 1
+
+    def _advance(self):
+        self._weight *= math.exp(math.log(1.0 - self.rng.random()) / self.size)
+        self._next += int(math.log(1.0 - self.rng.random()) / math.log(1.0 - self._weight)) + 1
+
+    def offer(self, commits: Iterable[GitCommit]) -> List[GitCommit]:
+        for git_commit in commits:
+            position = self.population
+            self.population += 1
+            if position < self.size:
+                self._reservoir.append((position, git_commit))
+                if self.population == self.size:
+                    self._advance()
+            elif position == self._next:
+                self._reservoir[self.rng.randrange(self.size)] = (position, git_commit)
+                self._advance()
+        return []
+
+    def finish(self) -> List[GitCommit]:
+        reservoir, self._reservoir = sorted(self._reservoir, key=lambda item: item[0]), []
+        return [git_commit for _, git_commit in reservoir]
+
+
+def _month(timestamp: int) -> str:
+    return time.strftime("%Y-%m", time.gmtime(timestamp))
+
+
+def _year(timestamp: int) -> str:
+    return time.strftime("%Y", time.gmtime(timestamp))
+
+
+class _Stratum:
+    """
+    Muestra uniforme de un período (algoritmo R) cuyo tamaño puede reducirse: al quitar elementos al azar de una
+    muestra uniforme se obtiene otra muestra uniforme, y el algoritmo R sigue siendo válido con el nuevo tamaño.
+    """
+
+    __slots__ = ("size", "population", "items")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.population = 0
+        self.items: List[Tuple[int, GitCommit]] = []
+
+    def offer(self, position: int, git_commit: GitCommit, rng: random.Random):
+        self.population += 1
+        if len(self.items) < self.size:
+            self.items.append((position, git_commit))
+            return
+        index = rng.randrange(self.population)
+        if index < self.size:
+            self.items[index] = (position, git_commit)
+
+    def shrink(self, size: int, rng: random.Random):
+        if size < len(self.items):
+            self.items = rng.sample(self.items, size)
+        self.size = min(self.size, size)
+
+
+class StratifiedSampler(Sampler):
+    """
+    Muestra de `size` commits estratificada por período (mes o año del commit), con asignación proporcional:
+    cada período aporta una parte de la muestra proporcional a su cantidad de commits, así que la muestra
+    representa todas las épocas del historial y la proporción de commits válidos no necesita ponderarse.
+
+    Como `git log` recorre el historial por fecha, los commits de un período llegan juntos: solo el período en
+    curso guarda hasta `size` commits y, al empezar uno nuevo, los demás se reducen a su parte proporcional
+    (redondeada hacia arriba), que alcanza para su cuota final. Si un período reducido recibe más commits, la
+    cuota que no puede cubrir se reparte entre los períodos con commits de sobra.
+    """
+
+    def __init__(self, size: int, rng: random.Random, stratify: str = STRATIFY_MONTH):
+        super().__init__()
+        self.size = size
+        self.rng = rng
+        self._key: Callable[[int], str] = _year if stratify == STRATIFY_YEAR else _month
+        self._strata: Dict[str, _Stratum] = {}
+
+    def offer(self, commits: Iterable[GitCommit]) -> List[GitCommit]:
+        for git_commit in commits:
+            key = self._key(git_commit.timestamp)
+            stratum = self._strata.get(key)
+            if stratum is None:
+                self._shrink()
+                stratum = self._strata[key] = _Stratum(self.size)
+            stratum.offer(self.population, git_commit, self.rng)
+            self.population += 1
+        return []
+
+    def _shrink(self):
+        """Reduce cada período a su parte proporcional de la muestra, redondeada hacia arriba."""
+        for stratum in self._strata.values():
+            stratum.shrink(math.ceil(self.size * stratum.population / self.population), self.rng)
+
+    def allocation(self) -> Dict[str, int]:
+        """Reparte `size` entre los períodos en proporción a sus commits (método del mayor resto)."""
+        total = min(self.size, self.population)
+        if not total:
+            return {}
+        shares = {key: stratum.population * total / self.population for key, stratum in self._strata.items()}
+        allocation = {key: int(share) for key, share in shares.items()}
+        remaining = total - sum(allocation.values())
+        for key in sorted(shares, key=lambda key: (allocation[key] - shares[key], key))[:remaining]:
+            allocation[key] += 1
+        return allocation
+
+    def finish(self) -> List[GitCommit]:
+        allocation = self.allocation()
+        available = {key: len(stratum.items) for key, stratum in self._strata.items()}
+        shortfall = 0
+        for key, count in allocation.items():
+            if count > available[key]:
+                shortfall += count - available[key]
+                allocation[key] = available[key]
+        for key in sorted(allocation, key=lambda key: (allocation[key] - available[key], key)):
+            extra = min(shortfall, available[key] - allocation[key])
+            allocation[key] += extra
+            shortfall -= extra
+
+        selected = []
+        for key, count in sorted(allocation.items()):
+            items = self._strata[key].items
+            if count < len(items):
+                items = self.rng.sample(items, count)
+            selected.extend(git_commit for _, git_commit in sorted(items, key=lambda item: item[0]))
+        self._strata = {}
+        return selected
+
+
+def create(
+    size: Optional[int] = None,
+    rate: Optional[float] = None,
+    seed: int = 0,
+    stratify: Optional[str] = None,
+    name: str = "",
+) -> Sampler:
+    """
+    Crea el muestreador para `size` commits o una fracción `rate`. La semilla se combina con `name` (por ejemplo,
+    el repositorio) para que cada historial tenga su propia muestra reproducible.
+    """
+    rng = random.Random(f"{seed}:{name}")
+    if rate is not None:
+        return BernoulliSampler(rate, rng)
+    if stratify:
+        return StratifiedSampler(size, rng, stratify)
+    return ReservoirSampler(size, rng)
+
+
+class Estimate(NamedTuple):
+    """Estimación de la proporción de commits válidos con su intervalo de confianza."""
+
+    sample: int
+    valid: int
+    population: int
+    rate: float
+    low: float
+    high: float
+
+    def to_dict(self) -> dict:
+        return {
+            "sample": self.sample,
+            "valid": self.valid,
+            "population": self.population,
+            "rate": round(self.rate, 4),
+            "low": round(self.low, 4),
+            "high": round(self.high, 4),
+        }
+
+
+def estimate(valid: int, sample: int, population: int, z: float = Z_95) -> Estimate:
+    """
+    Estima la proporción de commits válidos con el intervalo de Wilson, corregido por población finita:
+    si la muestra cubre todo el historial, el intervalo se reduce a la proporción observada.
+    """
+    if not sample:
+        return Estimate(0, 0, population, 0.0, 0.0, 1.0)
+    rate = valid / sample
+    if sample >= population:
+        return Estimate(sample, valid, population, rate, rate, rate)
+
+    n = sample * (population - 1) / (population - sample)
+    z2 = z * z
+    center = (rate + z2 / (2 * n)) / (1 + z2 / n)
+    half = z * math.sqrt(rate * (1 - rate) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+    return Estimate(sample, valid, population, rate, max(0.0, center - half), min(1.0, center + half))
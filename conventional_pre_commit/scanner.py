@@ -0,0 +1,171 @@
+"""
+Analizador del encabezado de Conventional Commits sin expresiones regulares.
+
+Recorre el mensaje una sola vez, carácter por carácter, y busca tipos y scopes en conjuntos en lugar de
+probar alternativas de una regex. Acepta exactamente el mismo lenguaje que `ConventionalCommit.regex`
+(validado con pruebas diferenciales) siempre que los tipos y scopes sean literales simples; si no lo son,
+`ConventionalCommit` sigue usando la regex.
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional
+
+# tipos y scopes que se pueden comparar como texto literal en lugar de como regex
+_PLAIN = re.compile(r"[\w-]+\Z")
+
+TYPE_END = frozenset("(!:")
+SCOPE_DELIMITERS = frozenset(":,-/")
+# caracteres de un scope libre: [\w \/:,-]
+SCOPE_SYMBOLS = frozenset(" /:,-_")
+
+
+def is_plain(items: Iterable[str]) -> bool:
+    """Devuelve True si todos los elementos son literales simples (letras, dígitos, `_` o `-`)."""
+    return all(_PLAIN.match(item) for item in items)
+
+
+class HeaderScanner:
+    """
+    Valida `type(scope)!:id asunto` y la separación del cuerpo para un conjunto fijo de tipos y scopes.
+    """
+
+    def __init__(self, types: Iterable[str], scopes: Iterable[str] = ()):
+        self.types: FrozenSet[str] = frozenset(types)
+        self.scopes: FrozenSet[str] = frozenset(scopes)
+        self._max_type = max(map(len, self.types), default=0)
+        self._scope_lengths = sorted({len(scope) for scope in self.scopes})
+
+    def _scan_type(self, message: str) -> int:
+        """Devuelve la posición tras el tipo, o -1 si el mensaje no comienza con un tipo válido."""
+        limit = min(len(message), self._max_type + 1)
+        for pos in range(limit):
+            if message[pos] in TYPE_END:
+                return pos if message[:pos] in self.types else -1
+        return -1
+
+    def _scan_free_scope(self, message: str, pos: int) -> int:
+        """Devuelve la posición tras `(scope)` con scope libre, o -1."""
+        end = len(message)
+        start = pos
+        while pos < end:
+            char = message[pos]
+            if char.isalnum() or char in SCOPE_SYMBOLS:
+                pos += 1
+            elif char == ")" and pos > start:
+                return pos + 1
+            else:
+                return -1
+        return -1
+
+    def _scan_scope_list(self, message: str, pos: int) -> int:
+        """Devuelve la posición tras `(scope, scope...)` con scopes de la lista, o -1."""
+        end = len(message)
+        start = pos
+        while pos < end:
+            char = message[pos]
+            if char == ")":
+                break
+            if not (char.isalnum() or char == "_" or char in SCOPE_DELIMITERS or char.isspace()):
+                return -1
+            pos += 1
+        else:
+            return -1
+
+        return pos + 1 if self._scope_list_matches(message[start:pos]) else -1
+
+    def _scope_list_matches(self, content: str) -> bool:
+        r"""
+        Verifica `\s*scope(\s*delim\s*scope)*\s*` sobre el contenido entre paréntesis.
+
+        Los scopes pueden contener `-`, que también es delimitador, así que se exploran las posiciones
+        alcanzables en lugar de dividir el texto.
+        """
+        end = len(content)
+
+        def _skip_space(pos):
+            while pos < end and content[pos].isspace():
+                pos += 1
+            return pos
+
+        pending = [_skip_space(0)]
+        visited = set()
+        while pending:
+            start = pending.pop()
+            if start in visited:
+                continue
+            visited.add(start)
+            for length in self._scope_lengths:
+                stop = start + length
+                if stop > end:
+                    break
+                if content[start:stop] not in self.scopes:
+                    continue
+                pos = _skip_space(stop)
+                if pos == end:
+                    return True
+                if content[pos] in SCOPE_DELIMITERS:
+                    pending.append(_skip_space(pos + 1))
+        return False
+
+    def _scan_scope(self, message: str, pos: int) -> int:
+        """Devuelve la posición tras `(scope)`, donde `pos` es la posición siguiente a `(`, o -1."""
+        if self.scopes:
+            return self._scan_scope_list(message, pos)
+        return self._scan_free_scope(message, pos)
+
+    def scope_is_valid(self, header: str, scope_optional: bool = True) -> bool:
+        """Equivale a la regla `scope` de `errors()`: el scope tras el tipo es válido o, si es opcional, no está."""
+        pos = self._scan_type(header)
+        if pos < 0 or header[pos] != "(":
+            return scope_optional
+        return self._scan_scope(header, pos + 1) >= 0
+
+    def is_valid(self, message: str, scope_optional: bool = True) -> bool:
+        """Equivale a `ConventionalCommit.is_valid()` sobre un mensaje ya limpio."""
+        end = len(message)
+
+        pos = self._scan_type(message)
+        if pos < 0:
+            return False
+
+        if message[pos] == "(":
+            pos = self._scan_scope(message, pos + 1)
+            if pos < 0:
+                return False
+        elif not scope_optional:
+            return False
+
+        if pos < end and message[pos] == "!":
+            pos += 1
+        if pos >= end or message[pos] != ":":
+            return False
+        pos += 1
+
+        digits = pos
+        while pos < end and message[pos].isdecimal():
+            pos += 1
+        if not 1 <= pos - digits <= 9:
+            return False
+
+        # asunto: un espacio y al menos un carácter hasta el fin de la línea
+        if pos + 1 >= end or message[pos] != " " or message[pos + 1] == "\n":
+            return False
+        pos = message.find("\n", pos + 1)
+        if pos < 0:
+            return True
+
+        # cuerpo: la línea siguiente al asunto debe estar en blanco
+        return pos + 1 >= end or message[pos + 1] == "\n"
+
+
+@lru_cache(maxsize=32)
+def _cached_scanner(types, scopes) -> Optional[HeaderScanner]:
+    if not types or not is_plain(types) or not is_plain(scopes):
+        return None
+    return HeaderScanner(types, scopes)
+
+
+def scanner_for(types: Iterable[str], scopes: Iterable[str] = ()) -> Optional[HeaderScanner]:
+    """Devuelve un `HeaderScanner` (cacheado) para las reglas, o None si requieren la regex."""
+    return _cached_scanner(tuple(types), tuple(scopes or ()))
@@ -0,0 +1,130 @@
+"""
+Scopes de un monorepo a partir de los archivos en staging.
+
+Un archivo JSON asocia prefijos de ruta con scopes, p. ej. `{"services/payments": "payments", "web": ["web", "ui"]}`.
+Los prefijos se comparan por componentes de la ruta (`services/pay` no coincide con `services/payments/x.py`) y
+gana el más largo. El mapa se compila a un árbol de prefijos (un diccionario por directorio) que se guarda en la
+caché del usuario con `marshal`, con el hash del archivo como nombre, así que solo se vuelve a construir si el
+mapa cambia; buscar una ruta cuesta un acceso a diccionario por componente.
+
+La regla exige que cada scope del encabezado corresponda a un componente modificado y, si el commit modifica algún
+componente del mapa, que el encabezado tenga al menos un scope.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import subprocess
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from conventional_pre_commit import cache
+
+# clave del nodo que guarda los scopes de un prefijo; ningún componente de ruta es vacío
+SCOPES = ""
+CACHE_SUBDIRECTORY = "scope-maps"
+
+
+class PathTrie:
+    """Árbol de prefijos de ruta con los scopes de cada prefijo."""
+
+    def __init__(self, root: Optional[dict] = None):
+        self.root: dict = root if root is not None else {}
+
+    @classmethod
+    def from_mapping(cls, mapping: Dict[str, Union[str, List[str]]]) -> "PathTrie":
+        trie = cls()
+        for prefix, scopes in mapping.items():
+            node = trie.root
+            for part in _parts(prefix):
+                node = node.setdefault(part, {})
+            if isinstance(scopes, str):
+                scopes = [scopes]
+            if not isinstance(scopes, list) or not all(isinstance(scope, str) for scope in scopes):
+                raise ValueError(f"los scopes de {prefix!r} deben ser un texto o una lista de textos")
+            node[SCOPES] = tuple(scopes)
+        return trie
+
+    def lookup(self, path: str) -> Tuple[str, ...]:
+        """Devuelve los scopes del prefijo más largo de `path` que está en el mapa (vacío si ninguno)."""
+        node = self.root
+        found = node.get(SCOPES, ())
+        for part in _parts(path):
+            node = node.get(part)
+            if node is None:
+                break
+            found = node.get(SCOPES, found)
+        return found
+
+    def scopes(self, paths: Iterable[str]) -> Set[str]:
+        """Devuelve los scopes de todos los componentes que tocan `paths`."""
+        touched: Set[str] = set()
+        for path in paths:
+            touched.update(self.lookup(path))
+        return touched
+
+
+def _parts(path: str) -> List[str]:
+    return [part for part in path.replace("\\", "/").split("/") if part and part != "."]
+
+
+def load(path: str, cache_dir: Optional[str] = None) -> PathTrie:
+    """
+    Carga el mapa de `path` desde la caché compilada o, si no está, lo compila y lo guarda. Los errores de la
+    caché se ignoran; un JSON inválido produce `ValueError`.
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    directory = os.path.join(cache_dir or cache.directory(), CACHE_SUBDIRECTORY)
+    compiled = os.path.join(directory, hashlib.blake2b(content, digest_size=16).hexdigest() + ".marshal")
+
+    try:
+        # leer el archivo de una vez: `marshal.load` sobre el archivo lee de a pocos bytes y es diez veces más lento
+        with open(compiled, "rb") as f:
+            return PathTrie(marshal.loads(f.read()))
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    mapping = json.loads(content.decode("utf-8"))
+    if not isinstance(mapping, dict):
+        raise ValueError(f"{path}: el mapa de scopes debe ser un objeto JSON")
+    trie = PathTrie.from_mapping(mapping)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{compiled}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            marshal.dump(trie.root, f)
+        os.replace(temporary, compiled)
+    except OSError:
+        pass
+    return trie
+
+
+def stamp(path: str) -> str:
+    """Fecha y tamaño del mapa, para invalidar los resultados guardados si cambia; vacío si no se puede leer."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def staged_paths(repo: str = ".") -> List[str]:
+    """Devuelve las rutas en staging con un solo `git diff --cached --name-only -z`."""
+    command = ["git", "-C", repo, "diff", "--cached", "--name-only", "-z"]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    return [path for path in result.stdout.decode("utf-8", errors="surrogateescape").split("\0") if path]
+
+
+def unexpected_scopes(scopes: Iterable[str], touched: Set[str]) -> Optional[List[str]]:
+    """
+    Devuelve los scopes del encabezado que no corresponden a componentes modificados, una lista vacía si falta el
+    scope, o None si los scopes cumplen la regla.
+    """
+    scopes = list(scopes)
+    if not touched:
+        return None
+    if not scopes:
+        return []
+    unexpected = [scope for scope in scopes if scope not in touched]
+    return unexpected or None
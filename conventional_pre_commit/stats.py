@@ -0,0 +1,108 @@
+"""
+Métricas de cumplimiento agregadas sobre el historial.
+
+`Stats` acumula contadores en un único recorrido (sin guardar resultados por commit) y puede combinarse con
+las estadísticas de otros procesos o repositorios mediante `update()`, por lo que sirve tanto para la
+validación en serie como en paralelo.
+"""
+
+from collections import Counter
+from typing import Iterable, List
+
+from conventional_pre_commit.format import ConventionalCommit
+
+
+class Stats:
+    """
+    Contadores de cumplimiento: distribución de tipos, scopes y footers, fracción con cuerpo y errores más comunes.
+    """
+
+    def __init__(self):
+        self.commits = 0
+        self.valid = 0
+        self.with_scope = 0
+        self.with_body = 0
+        self.merges = 0
+        self.breaking = 0
+        self.types: Counter = Counter()
+        self.scopes: Counter = Counter()
+        self.trailers: Counter = Counter()
+        self.errors: Counter = Counter()
+
+    def add(self, commit: ConventionalCommit, commit_msg: str, valid: bool, errors: Iterable[str] = (), merge: bool = False):
+        """
+        Agrega un mensaje ya validado; `errors` son los componentes reportados por `commit.errors()`.
+        Los commits de merge (`merge=True`) solo se cuentan, sin analizar el mensaje.
+        """
+        self.commits += 1
+        self.valid += bool(valid)
+        self.errors.update(errors)
+        if merge:
+            self.merges += 1
+            return
+
+        match = commit.match(commit_msg)
+        if not match:
+            return
+        if match.group("type"):
+            self.types[match.group("type")] += 1
+        scopes = commit.scope_values(commit_msg)
+        if scopes:
+            self.with_scope += 1
+            self.scopes.update(scopes)
+        if match.group("body"):
+            self.with_body += 1
+            found = commit.trailers(commit_msg)
+            self.trailers.update(trailer.key for trailer in found)
+        else:
+            found = []
+        if match.group("delim") == "!:" or any(trailer.is_breaking for trailer in found):
+            self.breaking += 1
+
+    def reject(self, errors: Iterable[str]):
+        """Marca como inválido un commit ya agregado como válido (por ejemplo, un fixup! sin destino)."""
+        self.valid -= 1
+        self.errors.update(errors)
+
+    def update(self, other: "Stats") -> "Stats":
+        """Combina los contadores de `other` en esta instancia (por ejemplo, los de otro proceso)."""
+        self.commits += other.commits
+        self.valid += other.valid
+        self.with_scope += other.with_scope
+        self.with_body += other.with_body
+        self.merges += other.merges
+        self.breaking += other.breaking
+        self.types.update(other.types)
+        self.scopes.update(other.scopes)
+        self.trailers.update(other.trailers)
+        self.errors.update(other.errors)
+        return self
+
+    @classmethod
+    def merge(cls, stats: Iterable["Stats"]) -> "Stats":
+        """Combina varias estadísticas en una nueva."""
+        result = cls()
+        for other in stats:
+            result.update(other)
+        return result
+
+    def ratio(self, count: int) -> float:
+        return count / self.commits if self.commits else 0.0
+
+    def to_dict(self, top: int = 10) -> dict:
+        def _top(counter: Counter) -> List[list]:
+            return [[key, count] for key, count in counter.most_common(top)]
+
+        return {
+            "commits": self.commits,
+            "valid": self.valid,
+            "valid_ratio": round(self.ratio(self.valid), 4),
+            "scope_ratio": round(self.ratio(self.with_scope), 4),
+            "body_ratio": round(self.ratio(self.with_body), 4),
+            "merges": self.merges,
+            "breaking": self.breaking,
+            "types": _top(self.types),
+            "scopes": _top(self.scopes),
+            "trailers": _top(self.trailers),
+            "errors": _top(self.errors),
+        }
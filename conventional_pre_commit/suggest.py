@@ -0,0 +1,151 @@
+"""
+Sugerencias "¿quisiste decir...?" para tipos y scopes desconocidos.
+
+Usa un índice de vecindarios de borrado (SymSpell): cada valor válido se indexa por todas las cadenas que se
+obtienen al borrarle hasta `max_distance` caracteres de su prefijo. Para buscar, se generan los borrados de la
+palabra desconocida y solo se calcula la distancia de edición contra los candidatos que comparten alguno, en lugar
+de compararla con cada valor válido. El índice se construye una vez por conjunto de reglas y se cachea.
+"""
+
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from conventional_pre_commit.format import ConventionalCommit
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+LIMIT = 3
+
+_SCOPE_SPLIT = re.compile(r"\s*[:,/]\s*")
+
+
+def _deletes(word: str, distance: int) -> Set[str]:
+    """Devuelve `word` y todas las cadenas que resultan de borrarle hasta `distance` caracteres."""
+    result = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {item[:i] + item[i + 1 :] for item in frontier for i in range(len(item))}  # noqa: E203
+        result |= frontier
+    return result
+
+
+def distance(a: str, b: str, limit: int) -> int:
+    """
+    Distancia de Damerau-Levenshtein restringida (inserción, borrado, sustitución y transposición de caracteres
+    adyacentes). Devuelve `limit + 1` en cuanto se sabe que la distancia supera `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SuggestionIndex:
+    """Índice de vecindarios de borrado sobre un conjunto fijo de valores válidos."""
+
+    def __init__(self, words: Iterable[str], max_distance: int = MAX_DISTANCE, prefix_length: int = PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        # la búsqueda no distingue mayúsculas: cada forma en minúsculas conserva los valores originales
+        self._words: Dict[str, List[str]] = defaultdict(list)
+        self._deletes: Dict[str, List[str]] = defaultdict(list)
+        for word in words:
+            key = word.lower()
+            if key not in self._words:
+                for deleted in _deletes(key[:prefix_length], max_distance):
+                    self._deletes[deleted].append(key)
+            self._words[key].append(word)
+
+    def lookup(self, word: str, limit: int = LIMIT) -> List[str]:
+        """Devuelve hasta `limit` valores válidos cercanos a `word`, del más cercano al más lejano."""
+        key = word.lower()
+        # en palabras cortas una distancia de 2 sugiere casi cualquier cosa
+        max_distance = min(self.max_distance, max(1, len(key) // 3))
+
+        candidates = set()
+        for deleted in _deletes(key[: self.prefix_length], max_distance):
+            candidates.update(self._deletes.get(deleted, ()))
+
+        ranked = []
+        for candidate in candidates:
+            candidate_distance = distance(key, candidate, max_distance)
+            if candidate_distance <= max_distance:
+                ranked.append((candidate_distance, candidate))
+        ranked.sort()
+
+        suggestions = []
+        for _, candidate in ranked:
+            suggestions.extend(value for value in self._words[candidate] if value != word)
+        return suggestions[:limit]
+
+
+@lru_cache(maxsize=8)
+def _cached_index(words: Tuple[str, ...]) -> SuggestionIndex:
+    return SuggestionIndex(words)
+
+
+def index_for(words: Iterable[str]) -> SuggestionIndex:
+    """Devuelve el `SuggestionIndex` (cacheado) para `words`."""
+    return _cached_index(tuple(words))
+
+
+def unknown_type(commit: ConventionalCommit, commit_msg: str = "") -> Optional[str]:
+    """Devuelve el tipo del encabezado si no es uno de los tipos válidos, o None."""
+    header = (commit.clean(commit_msg) or commit.message).split("\n", 1)[0]
+    match = re.match(r"[^\s(!:]+", header)
+    if not match or match.group() in commit.types:
+        return None
+    return match.group()
+
+
+def unknown_scopes(commit: ConventionalCommit, commit_msg: str = "") -> List[str]:
+    """Devuelve los scopes del encabezado que no están en la lista de scopes válidos."""
+    if not commit.scopes:
+        return []
+    header = (commit.clean(commit_msg) or commit.message).split("\n", 1)[0]
+    match = re.match(r"[^\s(!:]*\(([^)]*)\)?", header)
+    if not match:
+        return []
+
+    scopes = set(commit.scopes)
+    unknown = []
+    for value in _SCOPE_SPLIT.split(match.group(1).strip()):
+        # los scopes válidos pueden contener "-", que también es delimitador
+        if value and value not in scopes and not all(part.strip() in scopes for part in value.split("-")):
+            unknown.append(value)
+    return unknown
+
+
+def suggestions(commit: ConventionalCommit, commit_msg: str = "", limit: int = LIMIT) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Devuelve sugerencias para el tipo y los scopes desconocidos de un mensaje, p. ej.
+    `{"type": {"feta": ["feat"]}, "scope": {"paymnets": ["payments"]}}`. Omite los valores sin sugerencias.
+    """
+    result: Dict[str, Dict[str, List[str]]] = {}
+
+    value = unknown_type(commit, commit_msg)
+    if value:
+        found = index_for(commit.types).lookup(value, limit)
+        if found:
+            result["type"] = {value: found}
+
+    for value in unknown_scopes(commit, commit_msg):
+        found = index_for(commit.scopes).lookup(value, limit)
+        if found:
+            result.setdefault("scope", {})[value] = found
+
+    return result
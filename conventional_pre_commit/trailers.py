@@ -0,0 +1,80 @@
+"""
+Footers (trailers) de Conventional Commits: `BREAKING CHANGE: ...`, `Refs: #123`, `Signed-off-by: ...`.
+
+Los footers son el último párrafo del mensaje cuando todas sus líneas tienen la forma `token: valor` o
+`token #valor` (o son continuaciones indentadas de la anterior). El párrafo se recorre de atrás hacia adelante
+desde el final del mensaje y el recorrido se detiene en la primera línea que no es un footer, así que nunca se
+lee el resto del cuerpo, aunque sea muy grande.
+"""
+
+import re
+from typing import List, NamedTuple, Sequence
+
+BREAKING_CHANGE = "BREAKING CHANGE"
+# sinónimo aceptado por la especificación
+BREAKING_CHANGE_ALT = "BREAKING-CHANGE"
+
+_TRAILER = re.compile(r"(?P<key>BREAKING CHANGE|[\w-]+)(?::(?:[ \t]+|\Z)|[ \t]+#)(?P<value>.*)\Z", re.IGNORECASE)
+
+
+class Trailer(NamedTuple):
+    key: str
+    value: str
+
+    @property
+    def is_breaking(self) -> bool:
+        """True si es un footer `BREAKING CHANGE`, sin importar mayúsculas."""
+        return self.key.upper() in (BREAKING_CHANGE, BREAKING_CHANGE_ALT)
+
+
+def parse(message: str) -> List[Trailer]:
+    """
+    Devuelve los footers de un mensaje ya limpio, en orden, o una lista vacía si el último párrafo no es un
+    bloque de footers. El encabezado nunca se considera footer.
+    """
+    end = len(message)
+    while end and message[end - 1].isspace():
+        end -= 1
+
+    trailers: List[Trailer] = []
+    continuation: List[str] = []
+    while end > 0:
+        start = message.rfind("\n", 0, end) + 1
+        line = message[start:end].rstrip("\r")
+        if not line.strip():
+            break
+        if start == 0:
+            # el párrafo llega hasta el encabezado
+            return []
+        if line[0] in " \t":
+            continuation.append(line.strip())
+        else:
+            match = _TRAILER.match(line)
+            if not match:
+                return []
+            value = " ".join([match.group("value").strip()] + continuation[::-1]).strip()
+            trailers.append(Trailer(match.group("key"), value))
+            continuation = []
+        end = start - 1
+
+    if continuation:
+        return []
+    trailers.reverse()
+    return trailers
+
+
+def missing(trailers: Sequence[Trailer], required: Sequence[str]) -> List[str]:
+    """Devuelve los tokens de `required` que no aparecen en `trailers` (sin distinguir mayúsculas, como git)."""
+    present = {trailer.key.lower() for trailer in trailers}
+    return [key for key in required if key.lower() not in present]
+
+
+def invalid_breaking(trailers: Sequence[Trailer], breaking_header: bool) -> bool:
+    """
+    Devuelve True si los footers no cumplen las reglas de `BREAKING CHANGE`: un encabezado con `!` requiere el
+    footer, el token debe estar en mayúsculas y su descripción no puede estar vacía.
+    """
+    breaking = [trailer for trailer in trailers if trailer.is_breaking]
+    if breaking_header and not breaking:
+        return True
+    return any(trailer.key not in (BREAKING_CHANGE, BREAKING_CHANGE_ALT) or not trailer.value for trailer in breaking)
@@ -0,0 +1,66 @@
+"""
+Marcas de agua (watermarks) para auditorías incrementales.
+
+Por cada repositorio se guarda, por referencia, el último tip validado. En la siguiente ejecución solo se
+validan los commits nuevos: todo lo alcanzable desde un watermark ya fue validado, así que basta con
+`git log <tips> --not <watermarks>`. Tras un force-push el watermark anterior deja de ser ancestro del tip y
+`--not <watermark>` excluye exactamente hasta su merge-base, de modo que solo se validan los commits reescritos.
+"""
+
+import json
+import os
+import tempfile
+from typing import Dict, Iterable, List
+
+# {repositorio: {referencia: sha}}
+State = Dict[str, Dict[str, str]]
+
+VERSION = 1
+
+
+def load(path: str) -> State:
+    """Lee el archivo de estado; si no existe, devuelve un estado vacío."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if data.get("version") != VERSION:
+        return {}
+    return data.get("repos", {})
+
+
+def save(path: str, state: State):
+    """Escribe el archivo de estado de forma atómica (archivo temporal + `os.replace`)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".watermarks-", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": VERSION, "repos": state}, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def key(repo: str) -> str:
+    """Clave estable de un repositorio en el archivo de estado."""
+    return os.path.realpath(repo)
+
+
+def revs(tips: Dict[str, str], watermarks: Dict[str, str], existing: Iterable[str]) -> List[str]:
+    """
+    Devuelve los argumentos de `git log` para validar solo los commits nuevos.
+
+    `existing` son los watermarks que todavía existen en el repositorio; los que fueron eliminados
+    (por ejemplo, tras un force-push y un `gc`) se ignoran y su referencia se valida desde el inicio
+    o desde el resto de watermarks.
+    """
+    known = set(existing)
+    new_tips = sorted({sha for ref, sha in tips.items() if watermarks.get(ref) != sha})
+    if not new_tips:
+        return []
+    seen = sorted(sha for sha in set(watermarks.values()) if sha in known)
+    return new_tips + (["--not"] + seen if seen else [])
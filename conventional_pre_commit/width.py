@@ -0,0 +1,86 @@
+"""
+Ancho en columnas de texto Unicode, para los límites de longitud del encabezado y del cuerpo.
+
+Un texto ASCII ocupa tantas columnas como caracteres, así que se mide con `len()` sin mirar cada carácter. Solo las
+líneas con caracteres no ASCII se recorren: los caracteres anchos de Asia oriental y la mayoría de los emoji ocupan
+dos columnas, y las marcas combinantes y los caracteres de formato (como el ZWJ de los emoji compuestos) ninguna.
+El ancho de cada carácter se calcula con `unicodedata` una sola vez y se guarda en una tabla.
+"""
+
+import unicodedata
+from typing import Dict, Iterator, Tuple
+
+# categorías Unicode que no ocupan columnas: marcas no espaciadas, marcas de cierre y caracteres de formato
+ZERO_WIDTH_CATEGORIES = ("Mn", "Me", "Cf")
+
+_WIDTHS: Dict[str, int] = {}
+
+
+def char_width(char: str) -> int:
+    """Devuelve las columnas que ocupa un carácter: 0, 1 o 2."""
+    found = _WIDTHS.get(char)
+    if found is None:
+        if unicodedata.category(char) in ZERO_WIDTH_CATEGORIES:
+            found = 0
+        elif unicodedata.east_asian_width(char) in ("W", "F"):
+            found = 2
+        else:
+            found = 1
+        _WIDTHS[char] = found
+    return found
+
+
+def width(text: str) -> int:
+    """Devuelve las columnas que ocupa `text` (una sola línea)."""
+    if text.isascii():
+        return len(text)
+    widths = _WIDTHS
+    total = 0
+    for char in text:
+        found = widths.get(char)
+        total += found if found is not None else char_width(char)
+    return total
+
+
+def cut(text: str, limit: int) -> int:
+    """
+    Devuelve el índice del primer carácter de `text` que no entra en `limit` columnas, o `len(text)` si entra
+    completo.
+    """
+    size = len(text)
+    # ningún carácter ocupa más de dos columnas
+    if size * 2 <= limit:
+        return size
+    if text.isascii():
+        return min(size, limit)
+    total = 0
+    for index, char in enumerate(text):
+        total += char_width(char)
+        if total > limit:
+            return index
+    return size
+
+
+def overflows(text: str, limit: int) -> Iterator[Tuple[int, int]]:
+    """
+    Recorre las líneas de `text` que superan `limit` columnas y devuelve `(número de línea, índice del corte)`
+    de cada una, empezando en 0.
+    """
+    is_ascii = text.isascii()
+    # sin caracteres anchos, un texto de hasta `limit` caracteres entra; con anchos, cada uno ocupa hasta dos columnas
+    if len(text) * (1 if is_ascii else 2) <= limit:
+        return
+    lines = text.split("\n")
+    # la línea más larga se mide sin recorrer los caracteres: si entra (aun con todos anchos), entran todas
+    if max(map(len, lines)) * (1 if is_ascii else 2) <= limit:
+        return
+    if is_ascii:
+        for number, line in enumerate(lines):
+            if len(line.rstrip("\r")) > limit:
+                yield number, limit
+        return
+    for number, line in enumerate(lines):
+        line = line.rstrip("\r")
+        index = cut(line, limit)
+        if index < len(line):
+            yield number, index
@@ -0,0 +1,92 @@
+"""
+Construye un zipapp autocontenido de `conventional_pre_commit`.
+
+El archivo incluye el código fuente y el bytecode precompilado (`.pyc` basado en hash, sin verificación contra
+el fuente) junto a cada módulo, un `__main__.py` que llama directamente a `hook.main` y la versión fijada en
+`_version.py`, de modo que al ejecutarse no se consultan los metadatos del paquete ni se escribe `__pycache__`.
+Si el intérprete que lo ejecuta es de otra versión, `zipimport` ignora el bytecode y usa el fuente.
+
+Uso: python scripts/build_zipapp.py [-o conventional-pre-commit.pyz] [--python "/usr/bin/env python3"]
+"""
+
+import argparse
+import importlib.util
+import marshal
+import os
+import stat
+import sys
+import zipfile
+from importlib.metadata import PackageNotFoundError, version
+from typing import Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "conventional_pre_commit"
+DEFAULT_OUTPUT = "conventional-pre-commit.pyz"
+DEFAULT_PYTHON = "/usr/bin/env python3"
+
+MAIN = f"""import sys
+
+from {PACKAGE}.hook import main
+
+raise SystemExit(main(sys.argv[1:]))
+"""
+
+# flags de PEP 552: basado en hash (0b01), sin verificar contra el fuente (bit 0b10 en 0)
+_PYC_UNCHECKED_HASH = 0b01
+
+
+def _bytecode(source: bytes, path: str) -> bytes:
+    """Devuelve un `.pyc` basado en hash y sin verificación para `source`."""
+    code = compile(source, path, "exec", dont_inherit=True, optimize=0)
+    source_hash = importlib.util.source_hash(source)
+    header = importlib.util.MAGIC_NUMBER + _PYC_UNCHECKED_HASH.to_bytes(4, "little") + source_hash
+    return header + marshal.dumps(code)
+
+
+def _write_module(archive: zipfile.ZipFile, name: str, source: bytes):
+    archive.writestr(name, source)
+    archive.writestr(name + "c", _bytecode(source, name))
+
+
+def _package_version() -> str:
+    try:
+        return version("conventional-pre-commit")
+    except PackageNotFoundError:
+        return "0+unknown"
+
+
+def build(output: str = DEFAULT_OUTPUT, python: Optional[str] = DEFAULT_PYTHON) -> str:
+    """Construye el zipapp en `output` y devuelve su ruta."""
+    package_dir = os.path.join(ROOT, PACKAGE)
+    with open(output, "wb") as f:
+        if python:
+            f.write(f"#!{python}\n".encode())
+        # sin compresión: el intérprete lee los módulos sin descomprimirlos
+        with zipfile.ZipFile(f, "w", compression=zipfile.ZIP_STORED) as archive:
+            for filename in sorted(os.listdir(package_dir)):
+                if filename.endswith(".py") and filename != "_version.py":
+                    with open(os.path.join(package_dir, filename), "rb") as source:
+                        _write_module(archive, f"{PACKAGE}/{filename}", source.read())
+            _write_module(archive, f"{PACKAGE}/_version.py", f"version = {_package_version()!r}\n".encode())
+            _write_module(archive, "__main__.py", MAIN.encode())
+
+    if python:
+        mode = os.stat(output).st_mode
+        os.chmod(output, mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return output
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Construye un zipapp autocontenido de conventional-pre-commit.")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help=f"Archivo de salida (por defecto: {DEFAULT_OUTPUT}).")
+    parser.add_argument(
+        "--python", default=DEFAULT_PYTHON, help=f'Intérprete del shebang; "" para omitirlo (por defecto: {DEFAULT_PYTHON}).'
+    )
+    args = parser.parse_args(argv)
+
+    print(build(args.output, args.python or None))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os.path
+import subprocess
 
 import pytest
 
@@ -62,3 +63,75 @@ def conventional_commit_multi_line_path():
 @pytest.fixture
 def conventional_commit_with_multiple_scopes_path():
     return get_message_path("conventional_commit_with_multiple_scopes")
+
+
+def git(cwd, *args):
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME="Test",
+        GIT_AUTHOR_EMAIL="test@example.com",
+        GIT_COMMITTER_NAME="Test",
+        GIT_COMMITTER_EMAIL="test@example.com",
+        GIT_CONFIG_NOSYSTEM="1",
+        HOME=str(cwd),
+    )
+    result = subprocess.run(["git", *args], cwd=cwd, env=env, check=True, capture_output=True, text=True)
+    return result.stdout
+
+
+@pytest.fixture
+def make_git_repo(tmp_path):
+    """Crea un repositorio git con los mensajes indicados, uno por commit (del más antiguo al más reciente)."""
+
+    def _make(messages, name="repo"):
+        path = tmp_path / name
+        path.mkdir()
+        git(path, "init", "-q", "-b", "main")
+        for i, message in enumerate(messages):
+            (path / "file.txt").write_text(f"{i}\n")
+            git(path, "add", "file.txt")
+            git(path, "commit", "-q", "--cleanup=verbatim", "-m", message)
+        return path
+
+    return _make
+
+
+PLUGIN_MODULE = """
+from conventional_pre_commit.rules import PART_BODY, PART_HEADER, Rule
+
+
+class NoWip(Rule):
+    needs = (PART_HEADER,)
+    description = "el encabezado no puede decir WIP"
+
+    def check(self, commit, parts):
+        return "wip" not in parts.header.lower()
+
+
+class Signed(Rule):
+    name = "firmado"
+    needs = (PART_BODY,)
+
+    def check(self, commit, parts):
+        return "Signed-off-by:" in parts.body
+
+
+NOT_A_RULE = object()
+"""
+
+
+@pytest.fixture
+def rule_plugin(tmp_path, monkeypatch):
+    """Instala un paquete con reglas de terceros (`no-wip`, `firmado`, `roto`) como entry points."""
+    from conventional_pre_commit import rules
+
+    (tmp_path / "reglas_demo.py").write_text(PLUGIN_MODULE)
+    dist_info = tmp_path / "reglas_demo-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: reglas-demo\nVersion: 1.0\n")
+    entry_points = ["no-wip = reglas_demo:NoWip", "firmado = reglas_demo:Signed", "roto = reglas_demo:NOT_A_RULE"]
+    (dist_info / "entry_points.txt").write_text("\n".join([f"[{rules.ENTRY_POINT_GROUP}]", *entry_points, ""]))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    rules.load.cache_clear()
+    yield
+    rules.load.cache_clear()
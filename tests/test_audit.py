@@ -0,0 +1,386 @@
+import asyncio
+import json
+import re
+
+import pytest
+
+from conventional_pre_commit.audit import RepoResult, audit, audit_repository, main
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.hook import RESULT_FAIL, RESULT_SUCCESS
+from conventional_pre_commit.hook import main as hook_main
+from conventional_pre_commit.metrics import Metrics
+from conventional_pre_commit.resultstore import ResultStore
+from tests.conftest import git
+
+
+def test_audit__results(make_git_repo):
+    good = make_git_repo(["feat:1 first\n", "fix:2 second\n"], name="good")
+    bad = make_git_repo(["feat:1 first\n", "bad message\n"], name="bad")
+
+    results = asyncio.run(audit([str(good), str(bad)], ConventionalCommit(), jobs=1))
+
+    assert [r.repo for r in results] == [str(good), str(bad)]
+    assert results[0].ok and results[0].commits == 2
+    assert not results[1].ok
+    assert [gc.message for gc, _ in results[1].failures] == ["bad message\n"]
+    assert results[1].failures[0][1]
+
+
+def test_audit__objects_reader(make_git_repo):
+    bad = make_git_repo(["feat:1 first\n", "bad message\n"])
+
+    results = asyncio.run(audit([str(bad)], ConventionalCommit(), reader="objects"))
+
+    assert results[0].commits == 2
+    assert len(results[0].failures) == 1
+
+
+def test_audit__not_a_repository(tmp_path):
+    results = asyncio.run(audit([str(tmp_path)], ConventionalCommit()))
+
+    assert results[0].error
+    assert not results[0].ok
+
+
+def test_repo_result__to_dict():
+    result = RepoResult("repo")
+
+    assert result.to_dict() == {"repo": "repo", "commits": 0, "failures": [], "error": None}
+
+
+def test_main__success(make_git_repo, capsys):
+    good = make_git_repo(["feat:1 first\n"])
+
+    assert main([str(good)]) == RESULT_SUCCESS
+    assert "1 commits, 0 inválidos" in capsys.readouterr().out
+
+
+def test_main__fail_json(make_git_repo, capsys):
+    bad = make_git_repo(["bad message\n"])
+
+    assert main(["--json", str(bad)]) == RESULT_FAIL
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["failures"][0]["subject"] == "bad message"
+    assert "type" in report["failures"][0]["errors"]
+
+
+def test_main__custom_types(make_git_repo):
+    repo = make_git_repo(["custom:1 first\n"])
+
+    assert main([str(repo)]) == RESULT_FAIL
+    assert main(["--types", "custom", str(repo)]) == RESULT_SUCCESS
+
+
+def test_main__third_party_rules(make_git_repo, rule_plugin, capsys):
+    repo = make_git_repo(["feat:1 first\n", "feat:2 WIP second\n"])
+
+    assert main([str(repo)]) == RESULT_SUCCESS
+    assert main(["--json", "--rules", "no-wip", str(repo)]) == RESULT_FAIL
+    capsys.readouterr()
+    assert main(["--json", "--rules", "no-wip", "--workers", "2", str(repo)]) == RESULT_FAIL
+    report = json.loads(capsys.readouterr().out)
+    assert [failure["errors"] for failure in report["failures"]] == [["no-wip"]]
+
+
+def test_main__unknown_rule(make_git_repo, rule_plugin, capsys):
+    repo = make_git_repo(["feat:1 first\n"])
+
+    assert main(["--rules", "no-existe", str(repo)]) == RESULT_FAIL
+    assert "no se encontró la regla 'no-existe'" in capsys.readouterr().err
+
+
+def test_hook_main__audit_subcommand(make_git_repo):
+    good = make_git_repo(["feat:1 first\n"])
+
+    assert hook_main(["--subcommand", "audit", "--no-color", str(good)]) == RESULT_SUCCESS
+
+
+def test_main__incremental_state(make_git_repo, tmp_path, capsys):
+    repo = make_git_repo(["feat:1 first\n", "fix:2 second\n"])
+    state = str(tmp_path / "state.json")
+
+    assert main(["--no-color", "--state", state, str(repo)]) == RESULT_SUCCESS
+    assert "2 commits" in capsys.readouterr().out
+
+    assert main(["--no-color", "--state", state, str(repo)]) == RESULT_SUCCESS
+    assert "0 commits" in capsys.readouterr().out
+
+    git(repo, "commit", "-q", "--allow-empty", "-m", "bad message")
+    assert main(["--no-color", "--state", state, str(repo)]) == RESULT_FAIL
+    assert "1 commits, 1 inválidos" in capsys.readouterr().out
+
+
+def test_main__incremental_force_push(make_git_repo, tmp_path, capsys):
+    repo = make_git_repo(["feat:1 first\n", "fix:2 second\n", "fix:3 third\n"])
+    state = str(tmp_path / "state.json")
+    main(["--state", state, str(repo)])
+    capsys.readouterr()
+
+    git(repo, "reset", "-q", "--hard", "HEAD~2")
+    git(repo, "commit", "-q", "--allow-empty", "-m", "fix:4 rewritten")
+
+    assert main(["--no-color", "--state", state, str(repo)]) == RESULT_SUCCESS
+    assert "1 commits, 0 inválidos" in capsys.readouterr().out
+
+
+def test_main__state_with_rev(make_git_repo, tmp_path):
+    repo = make_git_repo(["feat:1 first\n"])
+
+    assert main(["--state", str(tmp_path / "state.json"), "--rev", "HEAD", str(repo)]) == RESULT_FAIL
+
+
+def test_main__ignores_current_git_config(make_git_repo, monkeypatch):
+    from conventional_pre_commit import cleanup
+
+    repo = make_git_repo(["feat:1 first\n"])
+    monkeypatch.setattr(cleanup, "git_config", lambda repo=".": pytest.fail("no debería leer la configuración"))
+
+    assert main([str(repo)]) == RESULT_SUCCESS
+
+
+@pytest.mark.parametrize("option", [["--workers", "2"], ["--rev", "HEAD"]])
+def test_main__objects_reader_with(make_git_repo, option):
+    repo = make_git_repo(["feat:1 first\n"])
+
+    assert main(["--reader", "objects", *option, str(repo)]) == RESULT_FAIL
+
+
+def test_main__state_with_check_autosquash(make_git_repo, tmp_path):
+    repo = make_git_repo(["feat:1 base\n"])
+
+    assert main(["--state", str(tmp_path / "state.json"), "--check-autosquash", str(repo)]) == RESULT_FAIL
+    assert not (tmp_path / "state.json").exists()
+
+
+def test_main__stats(make_git_repo, capsys):
+    one = make_git_repo(["feat(api):1 first\n", "bad message\n"], name="one")
+    two = make_git_repo(["fix:2 second\n\nbody\n"], name="two")
+
+    assert main(["--no-color", "--stats", str(one), str(two)]) == RESULT_FAIL
+
+    out = capsys.readouterr().out
+    assert "scopes: api 1" in out
+    assert "Total: 3 commits" in out
+    assert "tipos: feat 1, fix 1" in out
+
+
+def test_main__stats_json(make_git_repo, capsys):
+    repo = make_git_repo(["feat(api):1 first\n"])
+
+    assert main(["--json", "--stats", str(repo)]) == RESULT_SUCCESS
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["stats"]["types"] == [["feat", 1]]
+
+
+def test_main__check_autosquash(make_git_repo, capsys):
+    repo = make_git_repo(["feat:1 first\n", "fixup! feat:1 first\n", "fixup! feat:2 missing\n"])
+
+    assert main(["--no-color", str(repo)]) == RESULT_SUCCESS
+    capsys.readouterr()
+
+    assert main(["--no-color", "--verbose", "--check-autosquash", str(repo)]) == RESULT_FAIL
+    out = capsys.readouterr().out
+    assert "fixup! feat:2 missing" in out
+    assert "errores: autosquash" in out
+    assert "fixup! feat:1 first" not in out
+
+
+def test_main__workers(make_git_repo, capsys):
+    repo = make_git_repo(["feat:1 first\n", "bad message\n", "fixup! feat:1 first\n"])
+
+    assert main(["--no-color", "--verbose", "--workers", "2", "--check-autosquash", str(repo)]) == RESULT_FAIL
+
+    out = capsys.readouterr().out
+    assert "3 commits, 1 inválidos" in out
+    assert "errores: type" in out
+
+
+def test_main__suggestions(make_git_repo, capsys):
+    repo = make_git_repo(["feta(paymnets):1 first\n"])
+
+    assert main(["--json", "--scopes", "api,payments", str(repo)]) == RESULT_FAIL
+    report = json.loads(capsys.readouterr().out)
+    assert report["failures"][0]["suggestions"] == {"type": {"feta": ["feat"]}, "scope": {"paymnets": ["payments"]}}
+
+    assert main(["--no-color", "--verbose", "--scopes", "api,payments", str(repo)]) == RESULT_FAIL
+    assert "¿quisiste decir? feta → feat; paymnets → payments" in capsys.readouterr().out
+
+
+def test_main__merge_commits(make_git_repo, capsys):
+    repo = make_git_repo(["feat:1 first\n"])
+    git(repo, "checkout", "-q", "-b", "rama")
+    (repo / "other.txt").write_text("x\n")
+    git(repo, "add", "other.txt")
+    git(repo, "commit", "-q", "-m", "feat:2 second")
+    git(repo, "checkout", "-q", "main")
+    (repo / "file.txt").write_text("y\n")
+    git(repo, "commit", "-q", "-am", "fix:3 third")
+    git(repo, "merge", "-q", "--no-ff", "-m", "Mezcla sin formato", "rama")
+
+    reports = []
+    for workers in ("0", "2"):
+        assert main(["--no-color", "--json", "--stats", "--workers", workers, str(repo)]) == RESULT_SUCCESS
+        report = json.loads(capsys.readouterr().out)
+        assert report["commits"] == 4
+        assert report["stats"]["merges"] == 1
+        reports.append(report["stats"])
+    assert reports[0] == reports[1]
+
+    assert main(["--no-color", "--json", "--stats", "--reader", "objects", str(repo)]) == RESULT_SUCCESS
+    report = json.loads(capsys.readouterr().out)
+    assert report["commits"] == 4
+    assert report["stats"]["merges"] == 1
+
+    assert main(["--no-color", "--strict", str(repo)]) == RESULT_FAIL
+    assert "Mezcla sin formato" in capsys.readouterr().out
+
+
+def test_main__sample(make_git_repo, capsys):
+    repo = make_git_repo([f"feat:{i} commit\n" if i % 4 else f"commit {i}\n" for i in range(40)])
+
+    for reader in ("git", "objects"):
+        assert main(["--json", "--sample", "10", "--seed", "7", "--reader", reader, str(repo)]) == RESULT_FAIL
+        report = json.loads(capsys.readouterr().out)
+        assert report["commits"] == 10
+        assert report["sample"]["population"] == 40
+        assert report["sample"]["sample"] == 10
+        assert report["sample"]["low"] <= report["sample"]["rate"] <= report["sample"]["high"]
+
+    assert main(["--json", "--sample", "100", str(repo)]) == RESULT_FAIL
+    report = json.loads(capsys.readouterr().out)
+    assert report["sample"]["rate"] == report["sample"]["low"] == 0.75
+
+
+def test_main__sample_rate(make_git_repo, capsys):
+    repo = make_git_repo([f"feat:{i} commit\n" for i in range(20)])
+
+    assert main(["--no-color", "--sample-rate", "0.5", "--stratify", "month", str(repo)]) == RESULT_FAIL
+    assert main(["--no-color", "--sample-rate", "1", str(repo)]) == RESULT_SUCCESS
+    assert "muestra: 20 de 20 commits, cumplimiento estimado 100.0%" in capsys.readouterr().out
+
+
+def test_main__sample_invalid_options(make_git_repo, tmp_path):
+    repo = str(make_git_repo(["feat:1 first\n"]))
+
+    assert main(["--sample", "0", repo]) == RESULT_FAIL
+    assert main(["--sample-rate", "1.5", repo]) == RESULT_FAIL
+    assert main(["--sample", "5", "--sample-rate", "0.5", repo]) == RESULT_FAIL
+    assert main(["--sample", "5", "--check-autosquash", repo]) == RESULT_FAIL
+    assert main(["--sample", "5", "--state", str(tmp_path / "state.json"), repo]) == RESULT_FAIL
+
+
+def test_main__thread_backend(make_git_repo, capsys):
+    repo = make_git_repo(["feat:1 first\n", "bad message\n", "fixup! feat:1 first\n"])
+
+    args = ["--no-color", "--verbose", "--workers", "2", "--backend", "thread", "--check-autosquash", str(repo)]
+    assert main(args) == RESULT_FAIL
+
+    out = capsys.readouterr().out
+    assert "3 commits, 1 inválidos" in out
+    assert "errores: type" in out
+
+
+def test_main__trailer_rules(make_git_repo, capsys):
+    repo = make_git_repo(["feat:1 first\n\nSigned-off-by: Ana <ana@example.com>\n", "feat!:2 second\n"])
+
+    for workers in ("0", "2"):
+        args = ["--json", "--stats", "--workers", workers, "--breaking-footer", "--require-trailers", "Signed-off-by"]
+        assert main(args + [str(repo)]) == RESULT_FAIL
+        report = json.loads(capsys.readouterr().out)
+        assert [failure["errors"] for failure in report["failures"]] == [["breaking", "trailers"]]
+        assert report["stats"]["trailers"] == [["Signed-off-by", 1]]
+        assert report["stats"]["breaking"] == 1
+
+
+def test_main__results_db(make_git_repo, tmp_path):
+    repo = str(make_git_repo(["feat:1 first\n", "bad message\n"]))
+    db_path = str(tmp_path / "resultados.db")
+
+    for _ in range(2):
+        assert main(["--db", db_path, repo]) == RESULT_FAIL
+    assert main(["--db", db_path, "--types", "fix", repo]) == RESULT_FAIL
+
+    with ResultStore(db_path) as db:
+        failures = db.failures(repo=repo)
+    assert len(failures) == 3
+    assert {f.subject for f in failures} == {"bad message", "feat:1 first"}
+    bad = [f for f in failures if f.subject == "bad message"]
+    assert len(bad) == 2 and "type" in bad[0].errors
+    assert bad[0].author and bad[0].timestamp > 0
+
+
+def test_audit__results_db_written_per_repository(make_git_repo, tmp_path, monkeypatch):
+    from conventional_pre_commit import audit as audit_module
+
+    first = str(make_git_repo(["bad message\n"], name="first"))
+    second = str(make_git_repo(["otro mal mensaje\n"], name="second"))
+    db_path = str(tmp_path / "resultados.db")
+    audit_repository = audit_module.audit_repository
+
+    async def _fail_second(repo, *args):
+        result = await audit_repository(repo, *args)
+        if repo == second:
+            raise RuntimeError("falla tras auditar")
+        return result
+
+    monkeypatch.setattr(audit_module, "audit_repository", _fail_second)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(audit([first, second], ConventionalCommit(), jobs=1, results_db=db_path))
+
+    with ResultStore(db_path) as db:
+        assert [f.repo for f in db.failures()] == [first]
+
+
+def test_main__results_db_error(make_git_repo, tmp_path, capsys):
+    repo = str(make_git_repo(["feat:1 first\n"]))
+
+    assert main(["--no-color", "--db", str(tmp_path), repo]) == RESULT_FAIL
+    assert "[Base de resultados]" in capsys.readouterr().out
+
+
+def test_main__metrics_file(make_git_repo, tmp_path):
+    good = str(make_git_repo(["feat:1 first\n", "fix:2 second\n"], name="good"))
+    bad = str(make_git_repo(["feat:1 first\n", "bad message\n"], name="bad"))
+    path = tmp_path / "audit.prom"
+
+    for workers in ("0", "2"):
+        assert main(["--metrics-file", str(path), "--workers", workers, good, bad]) == RESULT_FAIL
+        text = path.read_text()
+        assert 'conventional_pre_commit_messages_total{command="audit"} 4' in text
+        assert 'conventional_pre_commit_failures_total{command="audit"} 1' in text
+        assert 'conventional_pre_commit_errors_total{command="audit",component="type"} 1' in text
+        # al menos un bloque de `git log` por repositorio
+        reads = re.search(r'duration_seconds_count\{command="audit",phase="read"\} (\d+)', text)
+        assert int(reads.group(1)) >= 2
+    # con --workers, los mensajes se limpian y validan en otros procesos
+    assert 'conventional_pre_commit_duration_seconds_count{command="audit",phase="match"} 0' in text
+
+
+def test_audit__metrics_interval(make_git_repo, tmp_path, monkeypatch):
+    repo = str(make_git_repo(["feat:1 first\n", "bad message\n"]))
+    path = tmp_path / "audit.prom"
+    writes = []
+    save = Metrics.save
+
+    def _save(self, *args, **kwargs):
+        writes.append(self.messages)
+        save(self, *args, **kwargs)
+
+    async def _slow_audit_repository(*args, **kwargs):
+        await asyncio.sleep(0.2)
+        return await audit_repository(*args, **kwargs)
+
+    monkeypatch.setattr(Metrics, "save", _save)
+    monkeypatch.setattr("conventional_pre_commit.audit.audit_repository", _slow_audit_repository)
+    asyncio.run(audit([repo], ConventionalCommit(), metrics_file=str(path), metrics_interval=0.05))
+
+    assert len(writes) >= 2
+    assert writes[0] == 0 and writes[-1] == 2
+    assert 'conventional_pre_commit_messages_total{command="audit"} 2' in path.read_text()
+
+
+def test_main__metrics_interval_requires_file(make_git_repo):
+    assert main(["--metrics-interval", "5", str(make_git_repo(["feat:1 first\n"]))]) == RESULT_FAIL
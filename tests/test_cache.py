@@ -0,0 +1,68 @@
+import os
+
+from conventional_pre_commit import cache
+
+
+def test_directory(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert cache.directory() == str(tmp_path / "conventional-pre-commit")
+
+
+def test_directory__default(monkeypatch, tmp_path):
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    assert cache.directory() == str(tmp_path / ".cache" / "conventional-pre-commit")
+
+
+def test_key():
+    key = cache.key("feat:1 asunto\n", "reglas")
+
+    assert key == cache.key("feat:1 asunto\n", "reglas")
+    assert len(key) == 32
+    assert key != cache.key("feat:1 asunto\n", "otras reglas")
+    assert key != cache.key("feat:2 asunto\n", "reglas")
+
+
+def test_store_and_lookup(tmp_path):
+    lines = ["[Mensaje de commit incorrecto] >> mal\r\nmensaje", "segunda línea"]
+    cache.store("clave", 1, lines, path=str(tmp_path))
+
+    assert cache.lookup("clave", path=str(tmp_path)) == (1, ["\n".join(lines)])
+    assert (tmp_path / "clave").read_text(encoding="utf-8").startswith("cpc1 1\n")
+
+
+def test_store_and_lookup__no_lines(tmp_path):
+    cache.store("clave", 0, [], path=str(tmp_path))
+
+    assert cache.lookup("clave", path=str(tmp_path)) == (0, [])
+
+
+def test_lookup__missing_or_invalid(tmp_path):
+    assert cache.lookup("clave", path=str(tmp_path)) is None
+
+    (tmp_path / "clave").write_text("otro formato\n")
+    assert cache.lookup("clave", path=str(tmp_path)) is None
+
+
+def test_store__evicts_least_recently_used(tmp_path):
+    path = str(tmp_path)
+    for i, name in enumerate(["a", "b", "c"]):
+        cache.store(name, 0, [], path=path)
+        os.utime(tmp_path / name, ns=(i * 10**9, i * 10**9))
+    # leer "a" la vuelve la más reciente
+    assert cache.lookup("a", path=path) is not None
+
+    cache.store("d", 0, [], path=path, max_entries=3)
+
+    assert sorted(os.listdir(path)) == ["a", "c", "d"]
+
+
+def test_store__ignores_errors(tmp_path):
+    blocked = tmp_path / "archivo"
+    blocked.write_text("")
+
+    cache.store("clave", 0, [], path=str(blocked / "cache"))
+
+    assert cache.lookup("clave", path=str(blocked / "cache")) is None
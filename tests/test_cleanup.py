@@ -0,0 +1,165 @@
+import random
+import re
+import subprocess
+
+import pytest
+
+from conventional_pre_commit import cleanup
+from conventional_pre_commit.format import Commit
+
+SCISSORS = "# ------------------------ >8 ------------------------\n"
+TEMPLATE = "feat(api):1 asunto  \n" "\n" "\n" "cuerpo\t\n" "# Please enter the commit message for your changes.\n" "#\n" "\n"
+LINES = ["feat:1 asunto", "cuerpo", "  sangría", "", "", " ", "\t", "# comentario", "#", "; comentario", "texto #", "fin  "]
+
+
+def _random_message(rng: random.Random) -> str:
+    lines = [rng.choice(LINES) + rng.choice(["\n", "\n", "\r\n", "  \n"]) for _ in range(rng.randint(0, 12))]
+    message = "".join(lines)
+    return message[:-1] if message and rng.random() < 0.3 else message
+
+
+def _regex_clean(commit: Commit, message: str) -> str:
+    """Limpieza original del hook, con las regex de `Commit`."""
+    message = re.sub(commit.r_verbose_commit_ignored, "", message, flags=re.DOTALL | re.MULTILINE)
+    return re.sub(commit.r_comment, "", message, flags=re.MULTILINE)
+
+
+def _git_stripspace(message: str, comment_char: str, strip_comments: bool) -> str:
+    command = ["git", "-c", f"core.commentChar={comment_char}", "stripspace"]
+    if strip_comments:
+        command.append("--strip-comments")
+    return subprocess.run(command, input=message.encode(), stdout=subprocess.PIPE, check=True).stdout.decode()
+
+
+def test_clean__default_keeps_whitespace():
+    assert cleanup.clean(TEMPLATE) == "feat(api):1 asunto  \n\n\ncuerpo\t\n\n"
+
+
+def test_clean__default_equivalent_to_regex():
+    commit = Commit()
+    rng = random.Random(36)
+
+    for _ in range(500):
+        message = _random_message(rng)
+        if rng.random() < 0.3:
+            message += SCISSORS + "diff --git a/x b/x\n# no es comentario\n"
+        expected = _regex_clean(commit, message)
+
+        assert cleanup.clean(message) == expected, repr(message)
+
+
+@pytest.mark.parametrize("comment_char", ["#", ";"])
+@pytest.mark.parametrize("mode", [cleanup.CLEANUP_STRIP, cleanup.CLEANUP_WHITESPACE])
+def test_clean__equivalent_to_git_stripspace(mode, comment_char):
+    """Prueba diferencial contra `git stripspace`."""
+    rng = random.Random(3600)
+    messages = [_random_message(rng) for _ in range(40)]
+
+    for message in messages:
+        expected = _git_stripspace(message, comment_char, strip_comments=mode == cleanup.CLEANUP_STRIP)
+
+        assert cleanup.clean(message, comment_char, mode) == expected, repr(message)
+
+
+def test_clean__strip():
+    assert cleanup.clean(TEMPLATE, mode=cleanup.CLEANUP_STRIP) == "feat(api):1 asunto\n\ncuerpo\n"
+
+
+def test_clean__whitespace_keeps_comments():
+    assert cleanup.clean("a  \n\n\n# b\n", mode=cleanup.CLEANUP_WHITESPACE) == "a\n\n# b\n"
+
+
+@pytest.mark.parametrize("mode", [cleanup.CLEANUP_DEFAULT, cleanup.CLEANUP_STRIP, cleanup.CLEANUP_SCISSORS])
+def test_clean__stops_at_scissors(mode):
+    message = "feat:1 asunto\n" + SCISSORS + "diff --git a/x b/x\n"
+
+    assert cleanup.clean(message, mode=mode) == "feat:1 asunto\n"
+
+
+def test_clean__does_not_scan_past_scissors():
+    class Diff(str):
+        def find(self, sub, start=0, end=None):
+            assert start <= len(TEMPLATE) + len(SCISSORS), "se recorrió el diff"
+            return super().find(sub, start)
+
+    message = Diff(TEMPLATE + SCISSORS + "diff\n" * 1000)
+
+    assert cleanup.clean(message) == "feat(api):1 asunto  \n\n\ncuerpo\t\n\n"
+
+
+def test_clean__verbatim():
+    message = TEMPLATE + SCISSORS + "diff\n"
+
+    assert cleanup.clean(message, mode=cleanup.CLEANUP_VERBATIM) == message
+
+
+def test_clean__comment_char():
+    message = "feat:1 asunto\n; comentario\n# no es comentario\n"
+
+    assert cleanup.clean(message, ";") == "feat:1 asunto\n# no es comentario\n"
+    assert cleanup.clean("feat:1 asunto\n" + cleanup.cut_line(";") + "\ndiff\n", ";") == "feat:1 asunto\n"
+
+
+@pytest.mark.parametrize(
+    "message,expected",
+    [
+        ("feat:1 asunto\n; Please enter the commit message\n", ";"),
+        ("feat:1 asunto\n@ ------------------------ >8 ------------------------\n# diff\n", "@"),
+        ("feat:1 asunto\n\n", "#"),
+        ("", "#"),
+    ],
+)
+def test_detect_comment_char(message, expected):
+    assert cleanup.detect_comment_char(message) == expected
+
+
+def test_clean__auto():
+    assert (
+        cleanup.clean("feat:1 asunto\n#1 no es comentario\n; comentario\n", "auto") == "feat:1 asunto\n#1 no es comentario\n"
+    )
+
+
+def test_git_config__read_once(tmp_path, git_repo_config):
+    cleanup.git_config.cache_clear()
+
+    assert cleanup.settings(repo=str(tmp_path)) == (";", cleanup.CLEANUP_STRIP)
+    assert cleanup.git_config.cache_info().misses == 1
+    cleanup.settings(repo=str(tmp_path))
+    assert cleanup.git_config.cache_info().misses == 1
+
+
+def test_settings__explicit_values_skip_git(monkeypatch):
+    monkeypatch.setattr(cleanup, "git_config", lambda repo=".": pytest.fail("no debería leer la configuración"))
+
+    assert cleanup.settings("%", cleanup.CLEANUP_VERBATIM) == ("%", cleanup.CLEANUP_VERBATIM)
+
+
+def test_settings__without_repo_skips_git(monkeypatch):
+    monkeypatch.setattr(cleanup, "git_config", lambda repo=".": pytest.fail("no debería leer la configuración"))
+
+    assert cleanup.settings(repo=None) == ("#", cleanup.CLEANUP_DEFAULT)
+    assert cleanup.settings(";", repo=None) == (";", cleanup.CLEANUP_DEFAULT)
+
+
+def test_settings__unknown_mode(monkeypatch):
+    monkeypatch.setattr(cleanup, "git_config", lambda repo=".": {"commit.cleanup": "otro"})
+
+    assert cleanup.settings() == ("#", cleanup.CLEANUP_DEFAULT)
+
+
+def test_git_config__without_git(monkeypatch):
+    def _missing(*args, **kwargs):
+        raise FileNotFoundError("git")
+
+    monkeypatch.setattr(cleanup.subprocess, "run", _missing)
+
+    assert cleanup.git_config.__wrapped__("/no/existe") == {}
+
+
+@pytest.fixture
+def git_repo_config(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    subprocess.run(["git", "-C", str(tmp_path), "config", "core.commentChar", ";"], check=True)
+    subprocess.run(["git", "-C", str(tmp_path), "config", "commit.cleanup", "strip"], check=True)
+    yield
+    cleanup.git_config.cache_clear()
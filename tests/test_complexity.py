@@ -0,0 +1,170 @@
+"""
+Pruebas de escalabilidad: `is_valid()`, `errors()` y `clean()` deben crecer linealmente con el tamaño del mensaje,
+la cantidad de tipos, la cantidad de scopes y la cantidad de entradas en el grupo de scopes.
+
+Cada dimensión se mide en varios tamaños y se ajusta una recta por mínimos cuadrados al logaritmo del tiempo
+contra el logaritmo del tamaño; la pendiente es el exponente de crecimiento. Una pendiente mayor que
+`MAX_SLOPE` indica un comportamiento superlineal (por ejemplo, una regex que retrocede sobre cada línea).
+
+Como dependen de mediciones de tiempo, llevan la marca `complexity` y no se ejecutan por defecto:
+
+    pytest -m complexity tests/test_complexity.py
+
+Se usan tamaños chicos para que la suite siga siendo rápida; con `CONVENTIONAL_COMPLEXITY=full` se usan los
+tamaños completos (cuerpos de hasta 100 MB, 10 000 tipos, 50 000 scopes y 1 000 entradas de scope).
+"""
+
+import math
+import os
+import time
+from typing import Callable, List, Sequence
+
+import pytest
+
+from conventional_pre_commit.format import ConventionalCommit
+
+pytestmark = pytest.mark.complexity
+
+FULL = os.environ.get("CONVENTIONAL_COMPLEXITY") == "full"
+
+KIB = 1024
+MIB = 1024 * KIB
+
+# exponente máximo aceptado: 1 es lineal, el margen absorbe el ruido de la medición
+MAX_SLOPE = 1.3
+# tiempo mínimo de cada medición, para que el reloj no domine en los tamaños chicos
+MIN_TIME = 0.005
+REPEATS = 5
+
+BODY_SIZES = [KIB, 16 * KIB, 256 * KIB, 4 * MIB, 100 * MIB] if FULL else [KIB, 8 * KIB, 64 * KIB, 512 * KIB]
+TYPE_COUNTS = [10, 100, 1_000, 10_000] if FULL else [10, 100, 1_000]
+SCOPE_COUNTS = [10, 100, 1_000, 10_000, 50_000] if FULL else [10, 100, 1_000, 5_000]
+GROUP_LENGTHS = [1, 10, 100, 1_000] if FULL else [1, 10, 100, 400]
+
+
+def timing(function: Callable[[], object]) -> float:
+    """Devuelve el menor tiempo por llamada de `function` entre `REPEATS` mediciones de al menos `MIN_TIME`."""
+    function()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIME:
+            break
+        loops *= 2
+
+    best = elapsed / loops
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def slope(sizes: Sequence[float], times: Sequence[float]) -> float:
+    """Pendiente de la recta de mínimos cuadrados de log(tiempo) contra log(tamaño)."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(elapsed) for elapsed in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+def check_linear(sizes: Sequence[int], build: Callable[[int], Callable[[], object]]):
+    times = [timing(build(size)) for size in sizes]
+    exponent = slope(sizes, times)
+    detail = ", ".join(f"{size}: {elapsed * 1000:.3f} ms" for size, elapsed in zip(sizes, times))
+    assert exponent <= MAX_SLOPE, f"crecimiento superlineal (exponente {exponent:.2f}): {detail}"
+
+
+def body_text(size: int) -> str:
+    """Cuerpo de `size` caracteres en líneas de texto normales, con líneas en blanco y comentarios."""
+    paragraph = "una línea del cuerpo con algunas palabras y: dos puntos\n" * 7 + "\n# un comentario\n"
+    return (paragraph * (size // len(paragraph) + 1))[:size]
+
+
+def body_spaces(size: int) -> str:
+    """Cuerpo con una sola línea larga llena de espacios, seguida de una línea final sin espacios."""
+    return ("a " * (size // 2 + 1))[:size].rstrip() + "\nfin\n"
+
+
+VALIDATIONS = ["is_valid", "errors", "clean"]
+
+
+def call(commit: ConventionalCommit, validation: str, message: str) -> Callable[[], object]:
+    method = getattr(commit, validation)
+    return lambda: method(message)
+
+
+@pytest.mark.parametrize("validation", VALIDATIONS)
+@pytest.mark.parametrize("body", [body_text, body_spaces])
+def test_linear_in_body_length(validation, body):
+    commit = ConventionalCommit()
+    check_linear(BODY_SIZES, lambda size: call(commit, validation, "feat(api):1 subject\n\n" + body(size)))
+
+
+@pytest.mark.parametrize("validation", VALIDATIONS)
+def test_linear_in_body_length__invalid_header(validation):
+    commit = ConventionalCommit()
+    check_linear(BODY_SIZES, lambda size: call(commit, validation, "feta api subject\n\n" + body_spaces(size)))
+
+
+def types(count: int) -> List[str]:
+    return [f"type{i}" for i in range(count)]
+
+
+@pytest.mark.parametrize("validation", VALIDATIONS)
+@pytest.mark.parametrize("header", ["type{last}:1 subject", "unknown:1 subject", "type{last}(api) subject"])
+def test_linear_in_type_count(validation, header):
+    def build(count):
+        commit = ConventionalCommit(types=types(count))
+        return call(commit, validation, header.format(last=count - 1) + "\n\nun cuerpo\n")
+
+    check_linear(TYPE_COUNTS, build)
+
+
+def scopes(count: int) -> List[str]:
+    return [f"scope{i}" for i in range(count)]
+
+
+@pytest.mark.parametrize("validation", VALIDATIONS)
+@pytest.mark.parametrize("header", ["feat(scope{last}):1 subject", "feat(unknown):1 subject", "feat(scope{last}"])
+def test_linear_in_scope_count(validation, header):
+    def build(count):
+        commit = ConventionalCommit(scopes=scopes(count))
+        return call(commit, validation, header.format(last=count - 1) + "\n\nun cuerpo\n")
+
+    check_linear(SCOPE_COUNTS, build)
+
+
+# scopes separados por coma y scopes que contienen el delimitador `-`: `a-b-a-b...` admite muchas particiones
+SCOPE_SETS = {"sin-ambigüedad": (["api", "web", "api-v2"], ","), "ambiguo": (["a", "b", "a-b"], "-")}
+
+
+@pytest.mark.parametrize("validation", VALIDATIONS)
+@pytest.mark.parametrize(
+    "header",
+    ["feat({group}):1 subject", "feat({group}:1 subject", "feat({group},unknown):1 subject", "feat({group}) subject"],
+)
+@pytest.mark.parametrize("scope_optional", [True, False])
+@pytest.mark.parametrize("scope_set", SCOPE_SETS)
+def test_linear_in_scope_group_length(validation, header, scope_optional, scope_set):
+    group_scopes, delimiter = SCOPE_SETS[scope_set]
+
+    def build(length):
+        commit = ConventionalCommit(scopes=group_scopes, scope_optional=scope_optional)
+        group = delimiter.join(group_scopes[i % 3] for i in range(length))
+        return call(commit, validation, header.format(group=group) + "\n\nun cuerpo\n")
+
+    check_linear(GROUP_LENGTHS, build)
+
+
+def test_slope():
+    assert slope([1, 10, 100], [2, 20, 200]) == pytest.approx(1)
+    assert slope([1, 10, 100], [1, 100, 10_000]) == pytest.approx(2)
+    assert slope([1, 10, 100], [5, 5, 5]) == pytest.approx(0)
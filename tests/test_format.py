@@ -397,6 +397,13 @@ def test_has_autosquash_prefix(commit, input, expected_result):
     [
         ("Merge branch '2.x.x' into '1.x.x'", True),
         ("merge branch 'dev' into 'main'", True),
+        ("Merge pull request #42 from org/feature", True),
+        ("Merge remote-tracking branch 'origin/main'", True),
+        ("Merge tag 'v1.2.0'", True),
+        ("Merge branches 'a' and 'b'", True),
+        ("Merge commit 'abc1234'", True),
+        ("Merged PR 123: agrega endpoint", True),
+        ("Merge request is pending", False),
         ("nope not a merge commit", False),
         ("type: subject", False),
     ],
@@ -719,3 +726,156 @@ def test_is_valid__missing_delimiter(conventional_commit):
 )
 def test_is_conventional(input, expected_result):
     assert is_conventional(input) == expected_result
+
+
+def test_scope_values(conventional_commit):
+    assert conventional_commit.scope_values("feat(api, cliente/web):1 subject") == ["api", "cliente", "web"]
+    assert conventional_commit.scope_values("feat:1 subject") == []
+    assert conventional_commit.scope_values("invalid") == []
+
+
+def test_scope_values__scopes():
+    commit = ConventionalCommit(scopes=["api", "api-v2", "web"])
+
+    assert commit.scope_values("feat(api-v2, web):1 subject") == ["api-v2", "web"]
+
+
+@pytest.mark.parametrize(
+    "input,expected_result",
+    [
+        ("fixup! feat:1 subject", "feat:1 subject"),
+        ("squash! fixup! feat:1 subject\n\nbody", "feat:1 subject"),
+        ("amend! abcdef0", "abcdef0"),
+        ("feat:1 subject", None),
+        ("fixup!feat:1 subject", None),
+    ],
+)
+def test_autosquash_target(commit, input, expected_result):
+    assert commit.autosquash_target(input) == expected_result
+
+
+def test_errors__optional_scope_does_not_raise(conventional_commit):
+    assert "sep" in conventional_commit.errors("feat:1 subject\nbody")
+    assert conventional_commit.errors("feat(api):1 subject") == []
+    assert "scope" in conventional_commit.errors("feat(a.b):1 subject")
+
+
+def test_init__no_shared_mutable_defaults():
+    first = ConventionalCommit()
+    first.types.append("mutado")
+    first.scopes.append("mutado")
+
+    second = ConventionalCommit()
+    assert "mutado" not in second.types
+    assert second.scopes == []
+    assert "mutado" not in ConventionalCommit.DEFAULT_TYPES
+
+
+def test_init__copies_rules():
+    types = ["custom"]
+    scopes = ["api"]
+    commit = ConventionalCommit(types=types, scopes=scopes)
+    types.append("otro")
+    scopes.append("web")
+
+    assert commit.types == ["custom", "feat", "fix"]
+    assert commit.scopes == ["api"]
+
+
+def test_init__accepts_tuples():
+    commit = ConventionalCommit(types=("custom", "feat"), scopes=("api",))
+
+    assert commit.types == ["custom", "feat"]
+    assert commit.is_valid("custom(api):1 subject")
+
+
+def test_trailers():
+    commit = ConventionalCommit()
+
+    assert commit.trailers("feat:1 asunto\n\nRefs: 12\n# comentario\n") == [("Refs", "12")]
+
+
+def test_errors__trailers_not_checked_by_default():
+    commit = ConventionalCommit()
+
+    assert commit.errors("feat!:1 asunto\n") == []
+    assert not commit.needs_trailers
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("feat!:1 asunto\n", ["breaking"]),
+        ("feat(api)!:1 asunto\n\nBREAKING CHANGE: cambia la API\n", []),
+        ("feat:1 asunto\n\nBreaking change: cambia la API\n", ["breaking"]),
+        ("feat:1 asunto\n\nBREAKING CHANGE:\n", ["breaking"]),
+        ("feat:1 asunto\n", []),
+    ],
+)
+def test_errors__breaking_footer(message, expected):
+    commit = ConventionalCommit(breaking_footer=True)
+
+    assert commit.errors(message) == expected
+    assert commit.is_valid(message) is not expected
+
+
+def test_errors__required_trailers():
+    commit = ConventionalCommit(required_trailers=["Signed-off-by"])
+
+    assert commit.errors("feat:1 asunto\n") == ["trailers"]
+    assert not commit.is_valid("feat:1 asunto\n")
+    assert commit.errors("feat:1 asunto\n\nsigned-off-by: Ana <ana@example.com>\n") == []
+    assert commit.is_valid("feat:1 asunto\n\nSigned-off-by: Ana <ana@example.com>\n")
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("feat:1 asunto\n", []),
+        ("feat:1 asunto un poco más largo\n", ["header-length"]),
+        ("feat:1 漢字漢字漢字漢\n", ["header-length"]),
+        ("feat:1 ñandú ñandú\n", []),
+        ("feat:1 asunto\n\n" + "x" * 30 + "\nfin del cuerpo\n", []),
+        ("feat:1 asunto\n\ncorta\n" + "x" * 31 + "\nfin del cuerpo\n", ["body-length"]),
+        ("feat:1 asunto\n\n" + "漢" * 16 + "\nfin del cuerpo\n", ["body-length"]),
+        ("feat:1 asunto\n\n" + "e\u0301" * 30 + "\nfin del cuerpo\n", []),
+    ],
+)
+def test_errors__length_limits(message, expected):
+    commit = ConventionalCommit(max_header_length=20, max_body_line_length=30)
+
+    assert commit.errors(message) == expected
+    assert commit.is_valid(message) is not expected
+
+
+def test_errors__length_limits_disabled():
+    commit = ConventionalCommit()
+
+    assert not commit.has_length_limits
+    assert commit.errors("feat:1 " + "x" * 500 + "\n\n" + "y" * 500 + " fin\n") == []
+
+
+def test_body_overflows():
+    commit = ConventionalCommit(max_body_line_length=10)
+
+    assert commit.body_overflows("feat:1 asunto muy largo\n\ncorta\n" + "x" * 11 + "\ncorta\n" + "漢" * 6) == [4, 6]
+    assert ConventionalCommit().body_overflows("feat:1 asunto\n\n" + "x" * 100) == []
+
+
+def test_errors__config_changed_after_init():
+    commit = ConventionalCommit()
+    message = "feat:1 " + "x" * 30 + "\n\n" + "y" * 40 + " fin\n"
+    assert commit.errors(message) == []
+
+    commit.max_header_length = 20
+    commit.max_body_line_length = 30
+    commit.breaking_footer = True
+
+    assert commit.errors(message) == ["header-length", "body-length"]
+    assert not commit.is_valid(message)
+    assert commit.errors("feat!:1 asunto\n") == ["breaking"]
+
+    commit.max_header_length = commit.max_body_line_length = None
+    commit.breaking_footer = False
+
+    assert commit.is_valid(message)
@@ -0,0 +1,145 @@
+import pytest
+
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.gitobjects import GitObjectError, Repository, apply_delta, iter_messages, parse_commit
+from conventional_pre_commit.history import iter_log, validate
+from tests.conftest import git
+
+MESSAGES = [
+    "feat:1 first commit\n\nwith a body that is long enough to be deltified " + "x" * 200 + "\n",
+    "fix:2 second commit\n\nwith a body that is long enough to be deltified " + "x" * 200 + "\n",
+    "not conventional\n",
+    "docs(readme):3 update the readme\n",
+]
+
+
+def _git_log(path):
+    output = git(path, "log", "--all", "--format=%H%x00%P%x00%B%x01")
+    commits = {}
+    for record in output.split("\x01"):
+        record = record.lstrip("\n")
+        if record:
+            sha, parents, message = record.split("\x00")
+            commits[sha] = (tuple(parents.split()), message)
+    return commits
+
+
+def _read_all(path):
+    with Repository(str(path)) as repository:
+        return {c.sha: (c.parents, c.message) for c in repository.commits()}
+
+
+def test_apply_delta():
+    base = b"hello conventional world"
+    # base size 24, result size 19, copy 6 bytes from offset 0, insert "commits", copy 6 from offset 18
+    delta = bytes([24, 19, 0x90, 6, 7]) + b"commits" + bytes([0x91, 18, 6])
+
+    assert apply_delta(base, delta) == b"hello commits world"
+
+
+def test_apply_delta__wrong_base_size():
+    with pytest.raises(GitObjectError):
+        apply_delta(b"abc", bytes([4, 1, 1]) + b"a")
+
+
+def test_parse_commit():
+    content = (
+        b"tree 4b825dc642cb6eb9a060e54bf8d69288fbee4904\n"
+        b"parent 1111111111111111111111111111111111111111\n"
+        b"parent 2222222222222222222222222222222222222222\n"
+        b"author Test <test@example.com> 1700000000 +0000\n"
+        b"committer Test <test@example.com> 1700000000 +0000\n"
+        b"\n"
+        b"feat:1 message\n"
+    )
+
+    result = parse_commit("abc", content)
+
+    assert result.sha == "abc"
+    assert result.parents == ("1" * 40, "2" * 40)
+    assert result.author == "Test <test@example.com>"
+    assert result.timestamp == 1700000000
+    assert result.message == "feat:1 message\n"
+
+
+def test_parse_commit__committer_date():
+    content = (
+        b"tree 4b825dc642cb6eb9a060e54bf8d69288fbee4904\n"
+        b"author Ana <ana@example.com> 978307200 +0000\n"
+        b"committer Luis <luis@example.com> 1700000000 -0300\n"
+        b"\n"
+        b"feat:1 message\n"
+    )
+
+    result = parse_commit("abc", content)
+
+    assert result.author == "Ana <ana@example.com>"
+    assert result.timestamp == 1700000000
+
+
+def test_repository__timestamps_match_git_log(make_git_repo):
+    path = make_git_repo(MESSAGES)
+    git(path, "commit", "-q", "--allow-empty", "-m", "feat:5 fecha de autor antigua", "--date", "2001-01-01T00:00:00Z")
+
+    with Repository(str(path)) as repository:
+        timestamps = {c.sha: c.timestamp for c in repository.commits()}
+
+    assert timestamps == {c.sha: c.timestamp for c in iter_log(["--all"], str(path))}
+    assert 978307200 not in timestamps.values()
+
+
+def test_repository__loose_objects(make_git_repo):
+    path = make_git_repo(MESSAGES)
+
+    assert _read_all(path) == _git_log(path)
+
+
+def test_repository__packed_objects(make_git_repo):
+    path = make_git_repo(MESSAGES)
+    git(path, "repack", "-adf", "--window=50", "--depth=50")
+    git(path, "prune-packed")
+    (path / "file.txt").write_text("loose\n")
+    git(path, "commit", "-q", "-am", "fix:4 loose commit after repack")
+
+    assert _read_all(path) == _git_log(path)
+
+
+def test_repository__index_v1(make_git_repo):
+    path = make_git_repo(MESSAGES)
+    git(path, "-c", "pack.indexVersion=1", "repack", "-adf")
+    git(path, "prune-packed")
+
+    assert _read_all(path) == _git_log(path)
+
+
+def test_repository__bare_mirror(make_git_repo, tmp_path):
+    path = make_git_repo(MESSAGES)
+    git(tmp_path, "clone", "-q", "--mirror", str(path), "mirror.git")
+    mirror = tmp_path / "mirror.git"
+
+    assert _read_all(mirror) == _git_log(mirror)
+
+
+def test_repository__annotated_tag(make_git_repo):
+    path = make_git_repo(MESSAGES)
+    git(path, "tag", "-a", "v1", "-m", "release", "HEAD~1")
+
+    with Repository(str(path)) as repository:
+        commits = list(repository.commits([repository.refs()["refs/tags/v1"]]))
+
+    assert len(commits) == len(MESSAGES) - 1
+
+
+def test_repository__not_a_repository(tmp_path):
+    with pytest.raises(GitObjectError):
+        Repository(str(tmp_path))
+
+
+def test_iter_messages__validate(make_git_repo):
+    path = make_git_repo(MESSAGES)
+    commits = (c for c in Repository(str(path)).commits())
+
+    results = sorted(ok for _, ok in validate(commits, ConventionalCommit()))
+
+    assert sorted(iter_messages(str(path))) == sorted(MESSAGES)
+    assert results == [False, True, True, True]
@@ -0,0 +1,143 @@
+import subprocess
+
+import pytest
+
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.history import FIELD_SEP, AutosquashIndex, GitCommit, LogParser, iter_log, validate
+from conventional_pre_commit.metrics import Metrics
+
+SHA_A = "a" * 40
+SHA_B = "b" * 40
+
+
+def _record(sha, parents, message, author="Test <test@example.com>", timestamp="1700000000"):
+    return FIELD_SEP.join([sha, " ".join(parents), author, timestamp, message]).encode() + b"\0"
+
+
+def test_log_parser__records():
+    parser = LogParser()
+
+    result = parser.feed(_record(SHA_A, [SHA_B], "feat:1 one\n") + _record(SHA_B, [], "fix:2 two\n"))
+
+    assert result == [
+        GitCommit(SHA_A, (SHA_B,), "feat:1 one\n", "Test <test@example.com>", 1700000000),
+        GitCommit(SHA_B, (), "fix:2 two\n", "Test <test@example.com>", 1700000000),
+    ]
+    assert parser.close() == []
+
+
+def test_log_parser__split_chunks():
+    data = _record(SHA_A, [], "feat:1 one\n\nbody with ñ\n") + _record(SHA_B, [SHA_A], "fix:2 two\n")
+    parser = LogParser()
+
+    result = []
+    for i in range(len(data)):
+        result.extend(parser.feed(bytes([data[i]])))
+    result.extend(parser.close())
+
+    assert [c.sha for c in result] == [SHA_A, SHA_B]
+    assert result[0].message == "feat:1 one\n\nbody with ñ\n"
+
+
+def test_validate():
+    commits = [
+        GitCommit(SHA_A, message="feat:1 valid\n"),
+        GitCommit(SHA_B, message="not valid\n"),
+        GitCommit(SHA_B, message="fixup! not valid\n"),
+    ]
+
+    assert [ok for _, ok in validate(commits, ConventionalCommit())] == [True, False, True]
+    assert [ok for _, ok in validate(commits, ConventionalCommit(), strict=True)] == [True, False, False]
+
+
+def test_validate__metrics():
+    commits = [
+        GitCommit(SHA_A, message="feat:1 valid\n"),
+        GitCommit(SHA_B, message="not valid\n"),
+        GitCommit(SHA_B, message="fixup! not valid\n"),
+        GitCommit(SHA_A, (SHA_B, SHA_B), "Merge\n"),
+    ]
+    metrics = Metrics()
+
+    outcomes = [ok for _, ok in validate(commits, ConventionalCommit(), metrics=metrics)]
+
+    assert outcomes == [ok for _, ok in validate(commits, ConventionalCommit())]
+    # el merge no se limpia y el fixup! no se valida
+    assert metrics.clean.count == 3
+    assert metrics.match.count == 2
+
+
+def test_iter_log(make_git_repo):
+    path = make_git_repo(["feat:1 first\n", "bad message\n", "fix:2 third\n\nbody\n"])
+
+    commits = list(iter_log(["HEAD"], str(path)))
+
+    assert [c.message for c in commits] == ["fix:2 third\n\nbody\n", "bad message\n", "feat:1 first\n"]
+    assert commits[0].parents == (commits[1].sha,)
+    assert commits[-1].parents == ()
+
+
+def test_iter_log__early_exit(make_git_repo):
+    path = make_git_repo(["feat:1 first\n", "fix:2 second\n"])
+
+    log = iter_log(["HEAD"], str(path))
+    assert next(log).message == "fix:2 second\n"
+    log.close()
+
+
+def test_iter_log__bad_revision(make_git_repo):
+    path = make_git_repo(["feat:1 first\n"])
+
+    with pytest.raises(subprocess.CalledProcessError):
+        list(iter_log(["does-not-exist"], str(path)))
+
+
+def test_autosquash_index__resolve():
+    index = AutosquashIndex()
+    index.add(GitCommit(SHA_A), "feat:1 add the thing")
+    index.add(GitCommit("abcdef0123" + "0" * 30), "fix:2 other")
+
+    assert index.resolve("feat:1 add the thing") == SHA_A
+    assert index.resolve("feat:1 add") == SHA_A
+    assert index.resolve("abcdef0") == "abcdef0123" + "0" * 30
+    assert index.resolve("abcdef0999") is None
+    assert index.resolve("feat:9 missing") is None
+
+
+def test_autosquash_index__orphans():
+    commit = ConventionalCommit()
+    commits = [
+        GitCommit("1" * 40, message="fixup! feat:1 first\n"),
+        GitCommit("2" * 40, message="squash! fixup! feat:1 first\n"),
+        GitCommit("3" * 40, message="amend! " + "4" * 10 + "\n"),
+        GitCommit("4" * 40, message="fixup! refactor:9 does not exist\n"),
+        GitCommit("5" * 40, message="feat:1 first\n"),
+    ]
+    index = AutosquashIndex()
+
+    results = [ok for _, ok in validate(commits, commit, autosquash=index)]
+
+    assert all(results)
+    assert [c.sha for c in index.orphans()] == ["4" * 40]
+
+
+class _NoParse(ConventionalCommit):
+    def clean(self, commit_msg=""):
+        if commit_msg:
+            raise AssertionError("el mensaje de un merge no debería analizarse")
+        return super().clean(commit_msg)
+
+
+def test_validate__merge_by_parents():
+    merge = GitCommit(SHA_A, (SHA_B, SHA_B), "Mezcla de ramas sin formato\n")
+    index = AutosquashIndex()
+
+    assert list(validate([merge], _NoParse(), autosquash=index)) == [(merge, True)]
+    assert index.resolve("Mezcla de ramas sin formato") == SHA_A
+    assert list(validate([merge], ConventionalCommit(), strict=True)) == [(merge, False)]
+
+
+def test_git_commit__is_merge():
+    assert GitCommit(SHA_A, (SHA_B, SHA_B)).is_merge
+    assert not GitCommit(SHA_A, (SHA_B,)).is_merge
+    assert not GitCommit(SHA_A).is_merge
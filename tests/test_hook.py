@@ -1,10 +1,14 @@
 import os
+import re
 import subprocess
+import time
 
 import pytest
 
+from conventional_pre_commit import hook
 from conventional_pre_commit.hook import RESULT_FAIL, RESULT_SUCCESS, main
 from conventional_pre_commit.output import Colors
+from tests.conftest import git
 
 
 @pytest.fixture
@@ -42,6 +46,19 @@ def test_main_success__custom(custom_commit_path):
     assert result == RESULT_SUCCESS
 
 
+@pytest.mark.parametrize("commit_type", ["audit", "lsp", "pre-receive"])
+def test_main__type_named_like_subcommand(tmp_path, commit_type):
+    path = tmp_path / "COMMIT_EDITMSG"
+    path.write_text(f"{commit_type}:1 asunto\n")
+
+    assert main([commit_type, str(path)]) == RESULT_SUCCESS
+    assert main(["--no-color", "feat", str(path)]) == RESULT_FAIL
+
+
+def test_main__unknown_subcommand(capsys):
+    assert main(["--subcommand", "otro"]) == RESULT_FAIL
+
+
 def test_main_success__custom_conventional(conventional_commit_path):
     result = main(["custom", conventional_commit_path])
 
@@ -250,3 +267,278 @@ def test_subprocess_fail__conventional_commit_bad_multi_line(cmd, conventional_c
     result = subprocess.call((cmd, conventional_commit_bad_multi_line_path))
 
     assert result == RESULT_FAIL
+
+
+def test_main_success__comment_char(tmp_path):
+    path = tmp_path / "COMMIT_EDITMSG"
+    path.write_text("feat:1 asunto\n; Please enter the commit message\n")
+
+    assert main(["--comment-char", ";", str(path)]) == RESULT_SUCCESS
+    assert main(["--comment-char", "#", str(path)]) == RESULT_FAIL
+
+
+def test_main_success__cleanup_strip(tmp_path):
+    path = tmp_path / "COMMIT_EDITMSG"
+    path.write_text("\n\nfeat:1 asunto  \n\n\n# comentario\n")
+
+    assert main(["--cleanup", "strip", str(path)]) == RESULT_SUCCESS
+    assert main(["--cleanup", "default", str(path)]) == RESULT_FAIL
+
+
+def test_main_timeout__allow(monkeypatch, conventional_commit_path, capsys):
+    monkeypatch.setattr(hook, "_check", lambda args: time.sleep(5))
+
+    start = time.monotonic()
+    assert main(["--no-color", "--timeout-ms", "50", conventional_commit_path]) == RESULT_SUCCESS
+    assert time.monotonic() - start < 2
+
+    out = capsys.readouterr().out
+    assert "superó el límite de 50 ms" in out
+    assert "Se permite el commit" in out
+
+
+def test_main_timeout__reject(monkeypatch, conventional_commit_path, capsys):
+    monkeypatch.setattr(hook, "_check", lambda args: time.sleep(5))
+
+    assert main(["--no-color", "--timeout-ms", "50", "--on-timeout", "reject", conventional_commit_path]) == RESULT_FAIL
+    assert "Se rechaza el commit" in capsys.readouterr().out
+
+
+def _hold_gil(args):
+    # una regex que retrocede en C retiene el GIL: un hilo que espera no vuelve hasta que termina
+    re.fullmatch(r"(a|aa)*c", "a" * 40)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requiere fork")
+def test_main_timeout__cpu_bound(monkeypatch, conventional_commit_path, capsys):
+    monkeypatch.setattr(hook, "_check", _hold_gil)
+
+    start = time.monotonic()
+    assert main(["--no-color", "--timeout-ms", "200", "--on-timeout", "reject", conventional_commit_path]) == RESULT_FAIL
+    assert time.monotonic() - start < 2
+    assert "Se rechaza el commit" in capsys.readouterr().out
+
+
+def test_main_timeout__metrics(tmp_path, bad_commit_path):
+    path = tmp_path / "hook.prom"
+
+    assert main(["--timeout-ms", "5000", "--metrics-file", str(path), bad_commit_path]) == RESULT_FAIL
+    assert 'conventional_pre_commit_errors_total{command="hook",component="type"} 1' in path.read_text()
+
+
+def test_main_timeout__within_budget(bad_commit_path, conventional_commit_path, capsys):
+    assert main(["--timeout-ms", "5000", conventional_commit_path]) == RESULT_SUCCESS
+    assert main(["--no-color", "--timeout-ms", "5000", bad_commit_path]) == RESULT_FAIL
+    assert "[Mensaje de commit incorrecto]" in capsys.readouterr().out
+
+
+def test_main_timeout__errors_propagate(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        main(["--timeout-ms", "5000", str(tmp_path / "missing")])
+
+
+def test_main__verbose_timing(conventional_commit_path, capsys):
+    assert main(["--no-color", "--verbose", conventional_commit_path]) == RESULT_SUCCESS
+    assert "conventional-pre-commit: validado en" in capsys.readouterr().out
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requiere FIFOs")
+def test_subprocess_timeout__blocked_read(cmd, tmp_path):
+    # abrir un FIFO sin escritor bloquea, como un sistema de archivos lento
+    fifo = tmp_path / "COMMIT_EDITMSG"
+    os.mkfifo(fifo)
+
+    result = subprocess.run((cmd, "--timeout-ms", "200", str(fifo)), capture_output=True, text=True, timeout=30)
+
+    assert result.returncode == RESULT_SUCCESS
+    assert "Tiempo agotado" in result.stdout
+
+
+def test_main__breaking_footer(tmp_path, capsys):
+    path = tmp_path / "COMMIT_EDITMSG"
+    path.write_text("feat!:1 asunto\n")
+
+    assert main([str(path)]) == RESULT_SUCCESS
+    assert main(["--no-color", "--verbose", "--breaking-footer", str(path)]) == RESULT_FAIL
+    assert "BREAKING CHANGE: descripción" in capsys.readouterr().out
+
+    path.write_text("feat!:1 asunto\n\nBREAKING CHANGE: cambia la API\n")
+    assert main(["--breaking-footer", str(path)]) == RESULT_SUCCESS
+
+
+def test_main__require_trailers(tmp_path, capsys):
+    path = tmp_path / "COMMIT_EDITMSG"
+    path.write_text("feat:1 asunto\n\nRefs: 1\n")
+
+    assert main(["--no-color", "--verbose", "--require-trailers", "Refs,Signed-off-by", str(path)]) == RESULT_FAIL
+    out = capsys.readouterr().out
+    assert "footers de: Signed-off-by" in out
+    assert "Refs," not in out
+
+
+def test_main__cache(monkeypatch, tmp_path, bad_commit_path, capsys):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert main(["--no-color", "--cache", bad_commit_path]) == RESULT_FAIL
+    first = capsys.readouterr().out
+    assert len(os.listdir(tmp_path / "conventional-pre-commit")) == 1
+
+    def _validate(*args):
+        raise AssertionError("no debería validar un mensaje en la caché")
+
+    monkeypatch.setattr(hook, "_validate", _validate)
+    assert main(["--no-color", "--cache", bad_commit_path]) == RESULT_FAIL
+    assert capsys.readouterr().out == first
+
+
+def test_main__cache_keyed_by_rules(monkeypatch, tmp_path, conventional_commit_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert main(["--cache", conventional_commit_path]) == RESULT_SUCCESS
+    assert main(["--cache", "custom", conventional_commit_path]) == RESULT_SUCCESS
+    assert main(["--cache", "--force-scope", conventional_commit_path]) == RESULT_FAIL
+    assert len(os.listdir(tmp_path / "conventional-pre-commit")) == 3
+
+
+@pytest.fixture
+def scope_map_repo(make_git_repo, monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    repo = make_git_repo(["chore:1 inicio\n"])
+    (repo / "web").mkdir()
+    (repo / "web" / "index.html").write_text("x")
+    git(repo, "add", "web")
+    (tmp_path / "scopes.json").write_text('{"web": ["web", "ui"], "services/payments": "payments"}')
+    monkeypatch.chdir(repo)
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("feat(web):1 asunto\n", RESULT_SUCCESS),
+        ("feat(ui,web):1 asunto\n", RESULT_SUCCESS),
+        ("feat(payments):1 asunto\n", RESULT_FAIL),
+        ("feat:1 asunto\n", RESULT_FAIL),
+        ("no es convencional\n", RESULT_FAIL),
+    ],
+)
+def test_main__scope_map(scope_map_repo, message, expected):
+    path = scope_map_repo / "COMMIT_EDITMSG"
+    path.write_text(message)
+
+    assert main(["--scope-map", str(scope_map_repo / "scopes.json"), str(path)]) == expected
+
+
+def test_main__scope_map_output(scope_map_repo, capsys):
+    path = scope_map_repo / "COMMIT_EDITMSG"
+    path.write_text("feat(payments):1 asunto\n")
+
+    assert main(["--no-color", "--scope-map", str(scope_map_repo / "scopes.json"), str(path)]) == RESULT_FAIL
+    out = capsys.readouterr().out
+    assert "[Scope incorrecto]" in out
+    assert "staging: payments" in out
+    assert "Componentes modificados: ui, web" in out
+
+
+def test_main__scope_map_invalid(scope_map_repo, capsys):
+    path = scope_map_repo / "COMMIT_EDITMSG"
+    path.write_text("feat(web):1 asunto\n")
+    (scope_map_repo / "scopes.json").write_text("{")
+
+    assert main(["--no-color", "--scope-map", str(scope_map_repo / "scopes.json"), str(path)]) == RESULT_FAIL
+    assert "[Mapa de scopes]" in capsys.readouterr().out
+
+
+def test_main__scope_map_cache_keyed_by_staged_paths(scope_map_repo):
+    path = scope_map_repo / "COMMIT_EDITMSG"
+    path.write_text("feat(payments):1 asunto\n")
+    scopes = str(scope_map_repo / "scopes.json")
+
+    assert main(["--cache", "--scope-map", scopes, str(path)]) == RESULT_FAIL
+    (scope_map_repo / "repo" / "services" / "payments").mkdir(parents=True)
+    (scope_map_repo / "repo" / "services" / "payments" / "api.py").write_text("x")
+    git(scope_map_repo / "repo", "add", "services")
+
+    assert main(["--cache", "--scope-map", scopes, str(path)]) == RESULT_SUCCESS
+
+
+def test_main__length_limits(tmp_path, capsys):
+    path = tmp_path / "COMMIT_EDITMSG"
+    path.write_text("feat:1 añade 漢字 al asunto\n\ncuerpo\n" + "x" * 80 + "\n")
+
+    assert main([str(path)]) == RESULT_SUCCESS
+    assert main(["--no-color", "--verbose", "--max-header-length", "20", "--max-body-line-length", "72", str(path)]) == 1
+    out = capsys.readouterr().out
+    assert "El encabezado ocupa 27 columnas; el máximo es 20." in out
+    assert "Líneas del cuerpo de más de 72 columnas: 4" in out
+
+
+def test_main__fail_fast(tmp_path, capsys):
+    path = tmp_path / "COMMIT_EDITMSG"
+    path.write_text("actualiza cosas\n")
+
+    assert main(["--no-color", "--verbose", "--fail-fast", str(path)]) == RESULT_FAIL
+    out = capsys.readouterr().out
+    assert "tipo" in out
+    assert "delim" not in out
+
+
+def test_main__third_party_rules(tmp_path, rule_plugin, capsys):
+    path = tmp_path / "COMMIT_EDITMSG"
+    path.write_text("feat:1 WIP asunto\n")
+
+    assert main([str(path)]) == RESULT_SUCCESS
+    assert main(["--no-color", "--verbose", "--rules", "no-wip", str(path)]) == RESULT_FAIL
+    assert "Regla no-wip: el encabezado no puede decir WIP." in capsys.readouterr().out
+
+
+def test_main__unknown_rule(tmp_path, rule_plugin, capsys):
+    path = tmp_path / "COMMIT_EDITMSG"
+    path.write_text("feat:1 asunto\n")
+
+    assert main(["--no-color", "--rules", "no-existe", str(path)]) == RESULT_FAIL
+    assert "[Reglas] no se encontró la regla 'no-existe'" in capsys.readouterr().out
+
+
+def test_main__scope_map_git_only_when_needed(scope_map_repo, monkeypatch):
+    from conventional_pre_commit import scopemap
+
+    def staged_paths(repo="."):
+        raise AssertionError("no debería consultar git si el encabezado ya es inválido")
+
+    monkeypatch.setattr(scopemap, "staged_paths", staged_paths)
+    path = scope_map_repo / "COMMIT_EDITMSG"
+    path.write_text("no es convencional\n")
+
+    assert main(["--scope-map", str(scope_map_repo / "scopes.json"), str(path)]) == RESULT_FAIL
+
+
+def test_main__metrics_file(tmp_path, bad_commit_path, conventional_commit_path):
+    path = tmp_path / "hook.prom"
+
+    assert main(["--metrics-file", str(path), conventional_commit_path]) == RESULT_SUCCESS
+    text = path.read_text()
+    assert 'conventional_pre_commit_messages_total{command="hook"} 1' in text
+    assert 'conventional_pre_commit_failures_total{command="hook"} 0' in text
+    assert 'conventional_pre_commit_duration_seconds_count{command="hook",phase="match"} 1' in text
+    assert "cache_hit_ratio" not in text
+
+    assert main(["--metrics-file", str(path), bad_commit_path]) == RESULT_FAIL
+    text = path.read_text()
+    assert 'conventional_pre_commit_failures_total{command="hook"} 1' in text
+    assert 'conventional_pre_commit_errors_total{command="hook",component="type"} 1' in text
+    assert os.listdir(tmp_path) == ["hook.prom"]
+
+
+def test_main__metrics_file_cache(monkeypatch, tmp_path, bad_commit_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    path = tmp_path / "hook.prom"
+
+    assert main(["--cache", "--metrics-file", str(path), bad_commit_path]) == RESULT_FAIL
+    assert 'cache_lookups_total{command="hook",result="miss"} 1' in path.read_text()
+
+    assert main(["--cache", "--metrics-file", str(path), bad_commit_path]) == RESULT_FAIL
+    text = path.read_text()
+    assert 'cache_lookups_total{command="hook",result="hit"} 1' in text
+    assert 'cache_hit_ratio{command="hook"} 1.0' in text
+    assert 'conventional_pre_commit_failures_total{command="hook"} 1' in text
@@ -0,0 +1,224 @@
+import io
+import json
+import subprocess
+
+import pytest
+
+from conventional_pre_commit import lsp
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.lsp import Document, Linter, Server
+
+
+def _frame(message):
+    body = json.dumps(message).encode("utf-8")
+    return f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+
+
+def _read_all(data):
+    stream = io.BytesIO(data)
+    messages = []
+    while True:
+        message = lsp.read_message(stream)
+        if message is None:
+            return messages
+        messages.append(message)
+
+
+def _change(start, end, text, version=2):
+    change = {"range": {"start": {"line": start[0], "character": start[1]}, "end": {"line": end[0], "character": end[1]}}}
+    change["text"] = text
+    return {
+        "jsonrpc": "2.0",
+        "method": "textDocument/didChange",
+        "params": {"textDocument": {"uri": "file:///COMMIT_EDITMSG", "version": version}, "contentChanges": [change]},
+    }
+
+
+def _open(text):
+    document = {"uri": "file:///COMMIT_EDITMSG", "languageId": "git-commit", "version": 1, "text": text}
+    return {"jsonrpc": "2.0", "method": "textDocument/didOpen", "params": {"textDocument": document}}
+
+
+INITIALIZE = {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"capabilities": {}}}
+SHUTDOWN = {"jsonrpc": "2.0", "id": 2, "method": "shutdown"}
+EXIT = {"jsonrpc": "2.0", "method": "exit"}
+
+
+def test_utf16_positions():
+    line = "feat: 😀 añade"
+
+    assert lsp._to_utf16(line, 7) == 8
+    assert lsp._from_utf16(line, 8) == 7
+    assert lsp._to_utf16("ascii", 3) == 3
+    assert lsp.offset("a\nb😀c\n", {"line": 1, "character": 3}) == 4
+
+
+def test_document_apply__header_edit_keeps_body():
+    document = Document("u", "feat:1 asunto\n\ncuerpo\n")
+    document.body = lsp.Body([], [], 2, "cuerpo")
+
+    document.apply([{"range": {"start": {"line": 0, "character": 0}, "end": {"line": 0, "character": 4}}, "text": "fix"}])
+
+    assert document.text == "fix:1 asunto\n\ncuerpo\n"
+    assert document.body is not None
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"range": {"start": {"line": 2, "character": 0}, "end": {"line": 2, "character": 6}}, "text": "otro"},
+        {"range": {"start": {"line": 0, "character": 13}, "end": {"line": 0, "character": 13}}, "text": "\nnueva"},
+        {"text": "fix:1 todo\n"},
+    ],
+)
+def test_document_apply__body_edit_resets_body(change):
+    document = Document("u", "feat:1 asunto\n\ncuerpo\n")
+    document.body = lsp.Body([], [], 2, "cuerpo")
+
+    document.apply([change])
+
+    assert document.body is None
+
+
+def test_linter__header_ranges():
+    linter = Linter(ConventionalCommit())
+
+    diagnostics = linter.diagnostics(Document("u", "feta(api):1 asunto\n"))
+
+    assert [(d["code"], d["range"]["start"]["character"], d["range"]["end"]["character"]) for d in diagnostics] == [
+        ("type", 0, 4)
+    ]
+    assert "¿Quisiste decir feat?" in diagnostics[0]["message"]
+
+
+def test_linter__missing_parts():
+    linter = Linter(ConventionalCommit())
+
+    diagnostics = linter.diagnostics(Document("u", "feat(api)"))
+
+    assert [(d["code"], d["range"]["start"]["character"]) for d in diagnostics] == [("delim", 9), ("id", 9), ("subject", 9)]
+
+
+def test_linter__body_and_trailers():
+    linter = Linter(ConventionalCommit(breaking_footer=True, required_trailers=["Refs"]))
+
+    diagnostics = linter.diagnostics(Document("u", "feat!:1 asunto\ncuerpo\n"))
+
+    assert [(d["code"], d["range"]["start"]["line"]) for d in diagnostics] == [("breaking", 1), ("sep", 1), ("trailers", 1)]
+    assert linter.diagnostics(Document("u", "feat!:1 asunto\n\nBREAKING CHANGE: nueva API\nRefs: 1\n")) == []
+
+
+def test_linter__length_limits():
+    linter = Linter(ConventionalCommit(max_header_length=12, max_body_line_length=10))
+
+    diagnostics = linter.diagnostics(
+        Document("u", "feat:1 añade 😀 cosas\n\n# comentario muy largo\ncorta\n" + "漢" * 8 + "\n")
+    )
+
+    assert [(d["code"], d["range"]["start"], d["range"]["end"]) for d in diagnostics] == [
+        ("header-length", {"line": 0, "character": 12}, {"line": 0, "character": 21}),
+        ("body-length", {"line": 4, "character": 5}, {"line": 4, "character": 8}),
+    ]
+    assert "12 columnas" in diagnostics[0]["message"]
+
+
+def test_linter__third_party_rules(rule_plugin):
+    linter = Linter(ConventionalCommit(rules=["no-wip", "firmado"]))
+
+    diagnostics = linter.diagnostics(Document("u", "feat:1 WIP asunto\n\ncuerpo\n"))
+
+    assert [(d["code"], d["range"]["start"]["line"]) for d in diagnostics] == [("no-wip", 0), ("firmado", 2)]
+    assert diagnostics[0]["message"] == "No se cumple la regla no-wip: el encabezado no puede decir WIP."
+
+
+def test_linter__autosquash_and_merge():
+    linter = Linter(ConventionalCommit())
+
+    assert linter.diagnostics(Document("u", "fixup! cualquier cosa\n")) == []
+    assert linter.diagnostics(Document("u", "Merge branch 'main'\n")) == []
+    assert Linter(ConventionalCommit(), strict=True).diagnostics(Document("u", "fixup! cualquier cosa\n"))
+
+
+def test_linter__comment_first_line():
+    linter = Linter(ConventionalCommit())
+
+    assert linter.diagnostics(Document("u", "# comentario\nfeat:1 asunto\n")) == []
+    assert [d["code"] for d in linter.diagnostics(Document("u", "# comentario\nasunto\n"))] == [
+        "type",
+        "delim",
+        "id",
+        "subject",
+    ]
+
+
+def test_linter__header_edit_reuses_body(monkeypatch):
+    linter = Linter(ConventionalCommit())
+    document = Document("u", "feat:1 asunto\n\n" + "cuerpo largo\n" * 10_000)
+    calls = []
+    body = linter._body
+    monkeypatch.setattr(linter, "_body", lambda text: calls.append(text) or body(text))
+
+    assert linter.diagnostics(document) == []
+    document.apply([{"range": {"start": {"line": 0, "character": 0}, "end": {"line": 0, "character": 4}}, "text": "feta"}])
+    assert [d["code"] for d in linter.diagnostics(document)] == ["type"]
+
+    assert len(calls) == 1
+
+
+def test_linter__fail_fast_header_fix_reports_body():
+    linter = Linter(ConventionalCommit(fail_fast=True))
+    document = Document("u", "feta:1 asunto\ncuerpo sin separar\n")
+
+    assert [d["code"] for d in linter.diagnostics(document)] == ["type", "sep"]
+    document.apply([{"range": {"start": {"line": 0, "character": 0}, "end": {"line": 0, "character": 4}}, "text": "feat"}])
+    assert [d["code"] for d in linter.diagnostics(document)] == ["sep"]
+
+
+def test_server__session():
+    messages = [
+        INITIALIZE,
+        _open("feat:1 asunto\n"),
+        _change((0, 0), (0, 1), "", version=2),
+        _change((0, 0), (0, 0), "x", version=3),
+        SHUTDOWN,
+        EXIT,
+    ]
+    stdout = io.BytesIO()
+    server = Server(Linter(ConventionalCommit()), io.BytesIO(b"".join(map(_frame, messages))), stdout, debounce=10)
+
+    assert server.serve() == 0
+
+    responses = _read_all(stdout.getvalue())
+    assert responses[0]["result"]["capabilities"]["textDocumentSync"]["change"] == lsp.SYNC_INCREMENTAL
+    published = [r["params"] for r in responses if r.get("method") == "textDocument/publishDiagnostics"]
+    # la apertura se publica enseguida; los dos cambios se agrupan en una sola publicación
+    assert [(p["version"], len(p["diagnostics"])) for p in published] == [(1, 0), (3, 1)]
+    assert published[1]["diagnostics"][0]["code"] == "type"
+    assert responses[-1] == {"jsonrpc": "2.0", "id": 2, "result": None}
+
+
+def test_server__unknown_request_and_eof():
+    messages = [{"jsonrpc": "2.0", "id": 7, "method": "textDocument/hover", "params": {}}]
+    stdout = io.BytesIO()
+    server = Server(Linter(ConventionalCommit()), io.BytesIO(b"".join(map(_frame, messages))), stdout)
+
+    assert server.serve() == 1
+    assert _read_all(stdout.getvalue())[0]["error"]["code"] == lsp.METHOD_NOT_FOUND
+
+
+def test_subprocess(tmp_path):
+    process = subprocess.Popen(
+        ["conventional-pre-commit", "--subcommand", "lsp", "--scopes", "api", "--debounce-ms", "0"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+    process.stdin.write(_frame(INITIALIZE) + _frame(_open("feat(web):1 asunto\n")))
+    process.stdin.flush()
+
+    assert lsp.read_message(process.stdout)["id"] == 1
+    published = lsp.read_message(process.stdout)
+    assert [d["code"] for d in published["params"]["diagnostics"]] == ["scope"]
+
+    stdout, _ = process.communicate(_frame(SHUTDOWN) + _frame(EXIT), timeout=10)
+    assert process.returncode == 0
+    assert _read_all(stdout)[-1]["id"] == 2
@@ -0,0 +1,145 @@
+"""
+Pruebas de regresión de memoria para la validación en lote.
+
+Cada prueba valida un corpus sintético bajo `tracemalloc` y mide, por mensaje, el pico de memoria asignada
+y la memoria retenida al terminar. Los presupuestos están en `BUDGETS`; un pico proporcional al tamaño del
+mensaje se expresa como múltiplo de ese tamaño más un margen fijo.
+"""
+
+import tracemalloc
+from typing import Callable, Iterable, NamedTuple
+
+import pytest
+
+from conventional_pre_commit import history
+from conventional_pre_commit.format import ConventionalCommit
+
+pytestmark = pytest.mark.skipif(not hasattr(tracemalloc, "reset_peak"), reason="requiere tracemalloc.reset_peak (3.9+)")
+
+KIB = 1024
+MIB = 1024 * KIB
+
+
+class Budget(NamedTuple):
+    # pico permitido por mensaje: factor * tamaño del mensaje + fijo
+    peak_factor: float
+    peak_fixed: int
+    # memoria retenida permitida por mensaje, en bytes
+    retained: float
+
+
+BUDGETS = {
+    # sin comentarios no se hace ninguna copia del mensaje
+    "huge": Budget(peak_factor=0, peak_fixed=16 * KIB, retained=0),
+    # se copia la parte anterior a la línea de corte
+    "scissors": Budget(peak_factor=1.5, peak_fixed=16 * KIB, retained=0),
+    # se arma una lista con las líneas que no son comentarios antes de unirlas
+    "comments": Budget(peak_factor=5, peak_fixed=16 * KIB, retained=0),
+    "small": Budget(peak_factor=0, peak_fixed=8 * KIB, retained=1),
+}
+
+# memoria que retiene la propia medición (variables locales del bucle), independiente del corpus
+RETAINED_SLACK = 1 * KIB
+
+SCISSORS = "# ------------------------ >8 ------------------------\n"
+
+
+class Usage(NamedTuple):
+    peak: int
+    retained: int
+    messages: int
+
+
+def measure(validate: Callable[[str], object], messages: Iterable[str]) -> Usage:
+    """Devuelve el mayor pico por mensaje y la memoria retenida en total al validar `messages`."""
+    messages = list(messages)
+    # precalienta cachés (regex compiladas, scanner) para no contarlas como retenidas
+    validate(messages[0])
+
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        peak = 0
+        for message in messages:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            validate(message)
+            _, message_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, message_peak - before)
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Usage(peak, end - start, len(messages))
+
+
+def check_budget(usage: Usage, budget: Budget, size: int):
+    allowed = budget.peak_factor * size + budget.peak_fixed
+    assert usage.peak <= allowed, f"pico {usage.peak} B > presupuesto {allowed:.0f} B (mensaje de {size} B)"
+    allowed = budget.retained * usage.messages + RETAINED_SLACK
+    assert usage.retained <= allowed, f"retenido {usage.retained} B > presupuesto {allowed:.0f} B ({usage.messages} mensajes)"
+
+
+def _huge(size=4 * MIB):
+    return "feat(api):1 asunto\n\n" + "x" * size + "\n"
+
+
+def _with_comments(size=1 * MIB):
+    return "feat(api):1 asunto\n\n" + "línea del cuerpo\n# comentario\n" * (size // 30)
+
+
+def _with_scissors(size=2 * MIB):
+    half = "x" * (size // 2)
+    return f"feat(api):1 asunto\n\n{half}\n{SCISSORS}{half}\n"
+
+
+def _small(count=5_000):
+    for i in range(count):
+        yield f"feat(api):{i} asunto {i}\n\ncuerpo\n" if i % 3 else f"mensaje inválido {i}\n"
+
+
+VALIDATIONS = {
+    "is_valid": lambda message: ConventionalCommit().is_valid(message),
+    "constructor": lambda message: ConventionalCommit(message).is_valid(),
+    "errors": lambda message: ConventionalCommit().errors(message),
+}
+
+
+@pytest.mark.parametrize("validation", VALIDATIONS)
+@pytest.mark.parametrize(
+    "corpus,factory",
+    [("huge", _huge), ("scissors", _with_scissors), ("comments", _with_comments)],
+)
+def test_memory__huge_message(validation, corpus, factory):
+    message = factory()
+    usage = measure(VALIDATIONS[validation], [message])
+
+    check_budget(usage, BUDGETS[corpus], len(message.encode()))
+
+
+@pytest.mark.parametrize("validation", VALIDATIONS)
+def test_memory__many_small_messages(validation):
+    usage = measure(VALIDATIONS[validation], _small())
+
+    check_budget(usage, BUDGETS["small"], 0)
+
+
+def test_memory__history_validate_streams():
+    """`history.validate` sobre un generador no acumula los commits ya validados."""
+    commit = ConventionalCommit()
+    count = 20_000
+
+    def _commits():
+        for i, message in enumerate(_small(count)):
+            yield history.GitCommit(f"{i:040x}", message=message)
+
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        valid = sum(valid for _, valid in history.validate(_commits(), commit))
+        end, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert valid == count - len(range(0, count, 3))
+    assert peak - start <= 64 * KIB
+    assert end - start <= BUDGETS["small"].retained * count + RETAINED_SLACK
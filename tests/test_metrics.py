@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+from conventional_pre_commit import metrics
+from conventional_pre_commit.metrics import BUCKETS, Histogram, Metrics
+
+
+def _samples(text):
+    samples = {}
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_histogram__observe():
+    histogram = Histogram()
+
+    for seconds in (0.000001, BUCKETS[0], 0.003, 60.0):
+        histogram.observe(seconds)
+
+    assert histogram.count == 4
+    assert histogram.counts[0] == 2
+    assert histogram.counts[BUCKETS.index(0.005)] == 1
+    assert histogram.counts[-1] == 1
+    assert histogram.total == pytest.approx(60.00301)
+
+
+def test_metrics__add_and_reject():
+    m = Metrics()
+
+    m.add(True)
+    m.add(False, ["type", "delim"])
+    m.reject(["autosquash"])
+
+    assert m.messages == 2
+    assert m.failures == 2
+    assert m.errors == {"type": 1, "delim": 1, "autosquash": 1}
+
+
+def test_metrics__merge():
+    a, b = Metrics(), Metrics()
+    a.add(False, ["type"])
+    a.match.observe(0.001)
+    b.add(False, ["type", "scope"])
+    b.cache_hits = 3
+    b.match.observe(0.002)
+
+    total = Metrics.merge([a, b])
+
+    assert total.messages == 2
+    assert total.errors == {"type": 2, "scope": 1}
+    assert total.cache_hits == 3
+    assert total.match.count == 2
+    assert a.messages == 1 and a.match.count == 1
+
+
+def test_metrics__render():
+    m = Metrics()
+    m.add(True)
+    m.add(False, ["type"])
+    m.read.observe(0.00002)
+    m.match.observe(0.3)
+    m.cache_hits, m.cache_misses = 1, 3
+
+    text = m.render("hook", duration=0.5, timestamp=1700000000)
+    samples = _samples(text)
+
+    assert samples['conventional_pre_commit_messages_total{command="hook"}'] == 2
+    assert samples['conventional_pre_commit_failures_total{command="hook"}'] == 1
+    assert samples['conventional_pre_commit_errors_total{command="hook",component="type"}'] == 1
+    assert samples['conventional_pre_commit_cache_lookups_total{command="hook",result="miss"}'] == 3
+    assert samples['conventional_pre_commit_cache_hit_ratio{command="hook"}'] == 0.25
+    assert samples['conventional_pre_commit_duration_seconds_bucket{command="hook",phase="read",le="1e-05"}'] == 0
+    assert samples['conventional_pre_commit_duration_seconds_bucket{command="hook",phase="read",le="2.5e-05"}'] == 1
+    assert samples['conventional_pre_commit_duration_seconds_bucket{command="hook",phase="match",le="0.25"}'] == 0
+    assert samples['conventional_pre_commit_duration_seconds_bucket{command="hook",phase="match",le="+Inf"}'] == 1
+    assert samples['conventional_pre_commit_duration_seconds_count{command="hook",phase="clean"}'] == 0
+    assert samples['conventional_pre_commit_run_duration_seconds{command="hook"}'] == 0.5
+    assert samples['conventional_pre_commit_last_run_timestamp_seconds{command="hook"}'] == 1700000000
+    assert "# TYPE conventional_pre_commit_duration_seconds histogram" in text
+    assert text.endswith("\n")
+
+
+def test_metrics__render_escapes_labels():
+    m = Metrics()
+    m.add(False, ['regla "rara"\\'])
+
+    assert 'component="regla \\"rara\\"\\\\"' in m.render("audit")
+
+
+def test_write__atomic(tmp_path):
+    path = tmp_path / "metrics.prom"
+    path.write_text("anterior\n")
+
+    Metrics().save(str(path), "audit")
+
+    assert path.read_text().startswith("# HELP conventional_pre_commit_messages_total")
+    assert os.listdir(tmp_path) == ["metrics.prom"]
+
+
+def test_write__error_leaves_no_temporary(tmp_path):
+    with pytest.raises(OSError):
+        metrics.write(str(tmp_path / "no-existe" / "metrics.prom"), "texto\n")
+
+    assert os.listdir(tmp_path) == []
@@ -164,3 +164,21 @@ def test_unicode_decode_error__no_color():
     assert Colors.YELLOW not in output
     assert Colors.LBLUE not in output
     assert Colors.RESTORE not in output
+
+
+def test_fail_verbose__suggestions():
+    commit = ConventionalCommit("feta(paymnets):1 asunto", scopes=["api", "payments"])
+    output = fail_verbose(commit, use_color=False)
+
+    assert "feta: ¿quisiste decir feat?" in output
+    assert "paymnets: ¿quisiste decir payments?" in output
+
+
+def test_fail_verbose__truncates_options():
+    scopes = [f"scope{i}" for i in range(500)]
+    commit = ConventionalCommit("feat(scpoe42):1 asunto", scopes=scopes)
+    output = fail_verbose(commit, use_color=False)
+
+    assert f"y {len(scopes) - 20} más" in output
+    assert "scope499" not in output.split("\n")[-10]
+    assert "scpoe42: ¿quisiste decir scope42" in output
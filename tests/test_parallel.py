@@ -0,0 +1,140 @@
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from conventional_pre_commit import parallel
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.history import GitCommit, validate
+from conventional_pre_commit.stats import Stats
+
+MESSAGES = [
+    "feat:1 valid\n",
+    "not valid\n",
+    "fixup! not valid\n",
+    "fix(api):2 valid\n\nbody\n",
+    "fix:3 bad body\nno separator\n",
+] * 50
+
+
+def _serial(commit, strict=False):
+    return [
+        (valid, () if valid else tuple(commit.errors(git_commit.message)))
+        for git_commit, valid in validate((GitCommit("", message=m) for m in MESSAGES), commit, strict)
+    ]
+
+
+def test_rules__compact_and_picklable():
+    commit = ConventionalCommit(types=["custom"], scope_optional=False, scopes=["api"], comment_char=";", cleanup_mode="strip")
+    rules = parallel.rules(commit)
+
+    assert rules == (tuple(commit.types), False, ("api",), ";", "strip", False, (), None, None, (), False)
+    assert pickle.loads(pickle.dumps(rules)) == rules
+
+
+def test_validate_batch__in_process():
+    commit = ConventionalCommit()
+    parallel.init_worker(parallel.rules(commit))
+
+    assert parallel.validate_batch(MESSAGES) == _serial(commit)
+
+
+def test_validate_batch_stats__in_process():
+    commit = ConventionalCommit(scopes=["api"])
+    parallel.init_worker(parallel.rules(commit))
+    expected = Stats()
+    for message, (valid, errors) in zip(MESSAGES, _serial(commit)):
+        expected.add(commit, message, valid, errors)
+
+    outcomes, stats = parallel.validate_batch_stats(MESSAGES)
+
+    assert outcomes == _serial(commit)
+    assert stats.to_dict() == expected.to_dict()
+
+
+def test_init_worker__length_limits():
+    commit = ConventionalCommit(max_header_length=10, max_body_line_length=20)
+    parallel.init_worker(parallel.rules(commit))
+
+    assert parallel.validate_batch(["feat:1 asunto demasiado largo\n"]) == [(False, ("header-length",))]
+
+
+def test_validate_batch__strict():
+    commit = ConventionalCommit()
+    parallel.init_worker(parallel.rules(commit), strict=True)
+
+    assert parallel.validate_batch(MESSAGES) == _serial(commit, strict=True)
+
+
+def test_validate_parallel__matches_serial():
+    commit = ConventionalCommit(scopes=["api"])
+
+    result = list(parallel.validate_parallel(iter(MESSAGES), commit, workers=2, batch_size=7))
+
+    assert result == _serial(commit)
+
+
+def test_validate_parallel__shared_pool():
+    commit = ConventionalCommit()
+    pool = parallel.create_pool(commit, workers=2)
+    try:
+        first = list(parallel.validate_parallel(MESSAGES, commit, pool=pool, workers=2))
+        second = list(parallel.validate_parallel(MESSAGES[:3], commit, pool=pool, workers=2))
+    finally:
+        pool.shutdown()
+
+    assert first == _serial(commit)
+    assert second == _serial(commit)[:3]
+
+
+def test_validate_messages__no_global_state():
+    commit = ConventionalCommit(scopes=["api"])
+    parallel.init_worker(parallel.rules(ConventionalCommit(types=["other"])), strict=True)
+
+    assert parallel.validate_messages(commit, False, MESSAGES) == _serial(commit)
+
+
+def test_validate_parallel__thread_backend():
+    commit = ConventionalCommit(scopes=["api"])
+
+    result = list(parallel.validate_parallel(iter(MESSAGES), commit, workers=4, batch_size=7, backend="thread"))
+
+    assert result == _serial(commit)
+
+
+def test_task__per_backend():
+    commit = ConventionalCommit()
+    with parallel.create_pool(commit, workers=1, backend="thread") as pool:
+        assert pool.submit(parallel.task(pool, commit), MESSAGES).result() == _serial(commit)
+    with parallel.create_pool(commit, workers=1) as pool:
+        assert parallel.task(pool, commit) is parallel.validate_batch
+        assert parallel.task(pool, commit, stats=True) is parallel.validate_batch_stats
+
+
+def test_concurrent_validation__stress():
+    # muchos hilos validan a la vez con un validador compartido y con validadores propios de reglas distintas
+    shared = ConventionalCommit(scopes=["api"])
+    rules = [
+        {"scopes": ["api"]},
+        {"types": ["custom"], "scope_optional": False},
+        {"scopes": ["api", "web"], "comment_char": ";"},
+        {"cleanup_mode": "strip"},
+    ]
+    expected = {i: _serial(ConventionalCommit(**rules[i])) for i in range(len(rules))}
+    expected_shared = _serial(shared)
+
+    def _run(i):
+        own = ConventionalCommit(**rules[i % len(rules)])
+        for _ in range(5):
+            if parallel.validate_messages(shared, False, MESSAGES) != expected_shared:
+                return False
+            if parallel.validate_messages(own, False, MESSAGES) != expected[i % len(rules)]:
+                return False
+        return True
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            assert all(pool.map(_run, range(32)))
+    finally:
+        sys.setswitchinterval(interval)
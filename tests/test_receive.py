@@ -0,0 +1,130 @@
+import io
+import subprocess
+import time
+
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.hook import RESULT_FAIL, RESULT_SUCCESS
+from conventional_pre_commit.hook import main as hook_main
+from conventional_pre_commit.receive import ZERO_SHA, check, main, parse_updates
+from tests.conftest import git
+
+
+def _push(make_git_repo, pushed, existing=("feat:1 existing\n",)):
+    """Crea un repositorio cuya rama main tiene `existing` y devuelve la línea de pre-receive que agrega `pushed`."""
+    repo = make_git_repo(list(existing) + list(pushed))
+    new = git(repo, "rev-parse", "HEAD").strip()
+    git(repo, "reset", "-q", "--hard", f"HEAD~{len(pushed)}")
+    old = git(repo, "rev-parse", "HEAD").strip()
+    return repo, f"{old} {new} refs/heads/main\n"
+
+
+def _fast_import(repo, count):
+    """Crea `count` commits con git fast-import y devuelve el SHA del último."""
+    stream = []
+    for i in range(count):
+        message = f"feat:{i} commit número {i}\n".encode()
+        stream.append(b"commit refs/heads/import\n")
+        stream.append(f"committer Test <test@example.com> {1700000000 + i} +0000\n".encode())
+        stream.append(b"data %d\n%s\n" % (len(message), message))
+    git_input = b"".join(stream)
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=repo, input=git_input, check=True)
+    new = git(repo, "rev-parse", "refs/heads/import").strip()
+    # como en pre-receive, los commits nuevos todavía no son alcanzables desde ninguna referencia
+    git(repo, "update-ref", "-d", "refs/heads/import")
+    return new
+
+
+def test_parse_updates():
+    lines = [f"{ZERO_SHA} {'a' * 40} refs/heads/new", f"{'b' * 40} {ZERO_SHA} refs/heads/deleted", ""]
+
+    assert parse_updates(lines) == [(ZERO_SHA, "a" * 40, "refs/heads/new")]
+
+
+def test_main__success(make_git_repo):
+    repo, line = _push(make_git_repo, ["fix:2 pushed\n"])
+
+    assert main(["--repo", str(repo)], stdin=io.StringIO(line)) == RESULT_SUCCESS
+
+
+def test_main__reject(make_git_repo, capsys):
+    repo, line = _push(make_git_repo, ["fix:2 pushed\n", "bad pushed message\n\nwith a body\n"])
+
+    assert main(["--no-color", "--repo", str(repo)], stdin=io.StringIO(line)) == RESULT_FAIL
+
+    out = capsys.readouterr().out
+    assert "bad pushed message" in out
+    assert "with a body" not in out
+    assert "1 de 2 commits" in out
+
+
+def test_main__reports_errors(make_git_repo, capsys):
+    repo, line = _push(make_git_repo, ["bad pushed message\n"])
+
+    assert main(["--no-color", "--repo", str(repo)], stdin=io.StringIO(line)) == RESULT_FAIL
+    assert "errores: type, delim, id" in capsys.readouterr().out
+
+
+def test_main__autosquash_target_already_on_server(make_git_repo):
+    repo, line = _push(make_git_repo, ["fixup! feat:1 existing\n"])
+
+    assert main(["--repo", str(repo), "--check-autosquash"], stdin=io.StringIO(line)) == RESULT_SUCCESS
+
+
+def test_main__autosquash_orphan(make_git_repo, capsys):
+    repo, line = _push(make_git_repo, ["fix:2 pushed\n", "fixup! feat:9 missing\n"])
+
+    assert main(["--no-color", "--repo", str(repo), "--check-autosquash"], stdin=io.StringIO(line)) == RESULT_FAIL
+    out = capsys.readouterr().out
+    assert "fixup! feat:9 missing" in out
+    assert "errores: autosquash" in out
+
+
+def test_main__only_new_commits(make_git_repo):
+    repo, line = _push(make_git_repo, ["fix:2 pushed\n"], existing=["bad existing message\n"])
+
+    assert main(["--repo", str(repo)], stdin=io.StringIO(line)) == RESULT_SUCCESS
+
+
+def test_main__deleted_ref(make_git_repo):
+    repo = make_git_repo(["feat:1 existing\n"])
+
+    assert main(["--repo", str(repo)], stdin=io.StringIO(f"{'a' * 40} {ZERO_SHA} refs/heads/x\n")) == RESULT_SUCCESS
+
+
+def test_main__commit_cap(make_git_repo, capsys):
+    repo, line = _push(make_git_repo, ["fix:2 one\n", "fix:3 two\n", "fix:4 three\n"])
+    args = ["--no-color", "--repo", str(repo), "--max-commits", "2"]
+
+    assert main(args, stdin=io.StringIO(line)) == RESULT_FAIL
+    assert "tras 2 commits" in capsys.readouterr().out
+    assert main(args + ["--on-budget-exceeded", "allow"], stdin=io.StringIO(line)) == RESULT_SUCCESS
+
+
+def test_check__shared_history_validated_once(make_git_repo):
+    repo, line = _push(make_git_repo, ["fix:2 one\n", "fix:3 two\n"])
+    old, new, _ = line.split()
+    updates = [(old, new, "refs/heads/main"), (ZERO_SHA, new, "refs/heads/copy")]
+
+    result = check(updates, ConventionalCommit(), repo=str(repo))
+
+    assert result.checked == 2
+
+
+def test_check__large_push(make_git_repo):
+    repo = make_git_repo(["feat:1 existing\n"])
+    new = _fast_import(repo, 10_000)
+
+    start = time.monotonic()
+    result = check([(ZERO_SHA, new, "refs/heads/import")], ConventionalCommit(), repo=str(repo), time_budget=30)
+
+    assert result.checked == 10_000
+    assert not result.failures
+    assert not result.budget_exceeded
+    assert time.monotonic() - start < 10
+
+
+def test_hook_main__pre_receive_subcommand(make_git_repo, monkeypatch):
+    repo, line = _push(make_git_repo, ["bad pushed message\n"])
+    monkeypatch.setattr("sys.stdin", io.StringIO(line))
+
+    assert hook_main(["--subcommand", "pre-receive", "--repo", str(repo)]) == RESULT_FAIL
@@ -0,0 +1,128 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conventional_pre_commit import resultstore
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.history import GitCommit
+from conventional_pre_commit.resultstore import ResultStore
+
+
+def _commit(sha, author="Ana <ana@example.com>", timestamp=1000, message="mal mensaje\n"):
+    return GitCommit(sha, message=message, author=author, timestamp=timestamp)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "resultados.db")
+
+
+def test_store__wal_and_schema(db_path):
+    with ResultStore(db_path) as db:
+        (mode,) = db.connection.execute("PRAGMA journal_mode").fetchone()
+        (version,) = db.connection.execute("PRAGMA user_version").fetchone()
+
+    assert mode == "wal"
+    assert version == resultstore.VERSION
+
+
+def test_store__failures_roundtrip(db_path):
+    with ResultStore(db_path) as db:
+        db.add("repo", _commit("a" * 40), ["type", "delim"], "huella")
+
+    with ResultStore(db_path) as db:
+        failures = db.failures()
+
+    assert failures == [
+        resultstore.StoredFailure("repo", "a" * 40, "Ana <ana@example.com>", 1000, "mal mensaje", ("delim", "type"))
+    ]
+
+
+def test_store__deduplicates_by_sha_and_fingerprint(db_path):
+    for _ in range(2):
+        with ResultStore(db_path) as db:
+            db.add("repo", _commit("a" * 40), ["type"], "huella")
+    with ResultStore(db_path) as db:
+        db.add("repo", _commit("a" * 40), ["type"], "otra")
+    with ResultStore(db_path) as db:
+        rows = db.connection.execute("SELECT fingerprint FROM failures ORDER BY 1").fetchall()
+        errors = db.connection.execute("SELECT count(*) FROM errors").fetchone()
+
+    assert rows == [("huella",), ("otra",)]
+    assert errors == (2,)
+
+
+def test_store__batches(db_path):
+    db = ResultStore(db_path, batch_size=2)
+    db.add("repo", _commit("1"), ["type"], "huella")
+    reader = sqlite3.connect(db_path)
+    assert reader.execute("SELECT count(*) FROM failures").fetchone() == (0,)
+
+    db.add("repo", _commit("2"), ["type"], "huella")
+    db.add("repo", _commit("3"), ["type"], "huella")
+    assert reader.execute("SELECT count(*) FROM failures").fetchone() == (2,)
+
+    db.close()
+    assert reader.execute("SELECT count(*) FROM failures").fetchone() == (3,)
+    reader.close()
+
+
+def test_store__discards_pending_on_error(db_path):
+    with pytest.raises(RuntimeError):
+        with ResultStore(db_path) as db:
+            db.add("repo", _commit("1"), ["type"], "huella")
+            raise RuntimeError()
+
+    with ResultStore(db_path) as db:
+        assert db.failures() == []
+
+
+def test_store__query_filters(db_path):
+    with ResultStore(db_path) as db:
+        db.add("api", _commit("1", timestamp=100), ["type"], "huella")
+        db.add("api", _commit("2", author="Luis <luis@example.com>", timestamp=200), ["scope"], "huella")
+        db.add("web", _commit("3", timestamp=300), ["type", "subject"], "otra")
+
+        assert [f.sha for f in db.failures()] == ["3", "2", "1"]
+        assert [f.sha for f in db.failures(repo="api")] == ["2", "1"]
+        assert [f.sha for f in db.failures(author="Ana <ana@example.com>")] == ["3", "1"]
+        assert [f.sha for f in db.failures(component="type")] == ["3", "1"]
+        assert [f.sha for f in db.failures(since=200)] == ["3", "2"]
+        assert [f.sha for f in db.failures(until=200)] == ["1"]
+        assert [f.sha for f in db.failures(fingerprint="otra")] == ["3"]
+        assert db.failures(component="type", repo="web")[0].errors == ("subject", "type")
+
+        view = db.connection.execute("SELECT component, count(*) FROM failure_errors GROUP BY 1 ORDER BY 1").fetchall()
+
+    assert view == [("scope", 1), ("subject", 1), ("type", 2)]
+
+
+def test_store__concurrent_writers(db_path):
+    ResultStore(db_path).close()
+
+    def _write(worker):
+        with ResultStore(db_path, batch_size=50) as db:
+            for number in range(500):
+                db.add(f"repo{worker}", _commit(f"{worker}-{number}"), ["type"], "huella")
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(_write, range(4)))
+
+    with ResultStore(db_path) as db:
+        assert len(db.failures()) == 2000
+        assert len(db.failures(repo="repo3")) == 500
+
+
+def test_store__newer_version(db_path):
+    connection = sqlite3.connect(db_path)
+    connection.execute("PRAGMA user_version=99")
+    connection.close()
+
+    with pytest.raises(sqlite3.DatabaseError):
+        ResultStore(db_path)
+
+
+def test_fingerprint():
+    assert resultstore.fingerprint(ConventionalCommit()) == resultstore.fingerprint(ConventionalCommit())
+    assert resultstore.fingerprint(ConventionalCommit()) != resultstore.fingerprint(ConventionalCommit(scopes=["api"]))
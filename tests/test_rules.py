@@ -0,0 +1,139 @@
+import pytest
+
+from conventional_pre_commit import rules
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.rules import PART_BODY, PART_HEADER, PART_STAGED, PART_TRAILERS, Parts, Pipeline, Rule
+
+
+class Recorder(Rule):
+    def __init__(self, name, needs, result=True, calls=None):
+        self.name = name
+        self.needs = needs
+        self.result = result
+        self.calls = calls if calls is not None else []
+
+    def check(self, commit, parts):
+        self.calls.append(self.name)
+        for part in self.needs:
+            getattr(parts, part)
+        return self.result
+
+
+def test_parts__computed_once_on_demand(monkeypatch):
+    parts = Parts(ConventionalCommit(), "feat(api):1 asunto\r\n\ncuerpo\n\nRefs: 1\n")
+
+    assert "trailers" not in vars(parts)
+    assert parts.header == "feat(api):1 asunto"
+    assert parts.body == "\ncuerpo\n\nRefs: 1\n"
+    assert parts.scopes == ["api"]
+    assert [trailer.key for trailer in parts.trailers] == ["Refs"]
+
+    monkeypatch.setattr(rules.trailers, "parse", lambda message: pytest.fail("ya se calculó"))
+    assert len(parts.trailers) == 1
+
+
+def test_parts__staged_callable():
+    calls = []
+
+    def staged():
+        calls.append(1)
+        return ["web/index.html"]
+
+    parts = Parts(ConventionalCommit(), "feat:1 asunto", staged)
+
+    assert calls == []
+    assert parts.staged == ["web/index.html"]
+    assert parts.staged == ["web/index.html"]
+    assert calls == [1]
+
+
+def test_pipeline__only_needed_parts(monkeypatch):
+    monkeypatch.setattr(rules.trailers, "parse", lambda message: pytest.fail("ninguna regla usa los footers"))
+    pipeline = Pipeline([Recorder("a", (PART_HEADER,)), Recorder("b", (PART_BODY,), result=False)])
+
+    assert pipeline.run(ConventionalCommit(), "feat:1 asunto\n\ncuerpo\n") == ["b"]
+
+
+def test_pipeline__fail_fast_runs_cheap_rules_first():
+    calls = []
+    pipeline = Pipeline(
+        [
+            Recorder("footers", (PART_TRAILERS,), result=False, calls=calls),
+            Recorder("encabezado", (PART_HEADER,), result=False, calls=calls),
+            Recorder("cuerpo", (PART_BODY,), calls=calls),
+        ]
+    )
+
+    assert pipeline.run(ConventionalCommit(), "feat:1 asunto\n") == ["footers", "encabezado"]
+    calls.clear()
+    assert pipeline.run(ConventionalCommit(), "feat:1 asunto\n", fail_fast=True) == ["encabezado"]
+    assert calls == ["encabezado"]
+
+
+def test_pipeline__staged_rules_need_staged_paths():
+    pipeline = Pipeline([Recorder("rutas", (PART_STAGED,), result=False)])
+
+    assert pipeline.run(ConventionalCommit(), "feat:1 asunto\n") == []
+    assert pipeline.run(ConventionalCommit(), "feat:1 asunto\n", staged=[]) == ["rutas"]
+
+
+def test_pipeline__fail_fast_skips_staged_paths():
+    pipeline = Pipeline([rules.FORMAT_RULE, Recorder("rutas", (PART_STAGED,))])
+
+    def staged():
+        raise AssertionError("no debería consultar las rutas en staging")
+
+    assert pipeline.run(ConventionalCommit(), "no es convencional\n", staged, fail_fast=True) == ["format"]
+
+
+def test_errors__fail_fast():
+    assert ConventionalCommit().errors("actualiza cosas\n") == ["type", "delim", "id"]
+    assert ConventionalCommit(fail_fast=True).errors("actualiza cosas\n") == ["type"]
+
+
+def test_scope_rule__ambiguous_scope_list():
+    commit = ConventionalCommit(scopes=["a", "b", "a-b"])
+
+    assert commit.errors("feat(" + "a-b-" * 25 + "a):1 asunto\n") == []
+    assert commit.errors("feat(" + "a-b-" * 25 + "x):1 asunto\n") == ["scope"]
+
+
+@pytest.mark.parametrize("types", [["feat", "fix"], ["feat", "fi[x]"]])
+def test_scope_rule__required(types):
+    commit = ConventionalCommit(types=types, scope_optional=False)
+
+    assert commit.errors("feat(api):1 asunto\n") == []
+    assert commit.errors("feat:1 asunto\n") == ["scope"]
+    assert commit.errors("feat(a.b):1 asunto\n") == ["scope"]
+
+
+def test_pipelines__optional_rules_from_config():
+    validation, diagnostics = rules.pipelines(ConventionalCommit(breaking_footer=True, max_header_length=50))
+
+    assert [rule.name for rule in validation.rules] == ["format", "breaking", "header-length"]
+    names = [rule.name for rule in diagnostics.rules]
+    assert names == ["type", "scope", "delim", "id", "subject", "sep", "breaking", "header-length"]
+    assert rules.pipelines(ConventionalCommit()) is rules.pipelines(ConventionalCommit())
+
+
+def test_pipelines__entry_points_only_when_named(monkeypatch):
+    from importlib import metadata
+
+    monkeypatch.setattr(metadata, "entry_points", lambda: pytest.fail("no debería buscar entry points"))
+
+    assert ConventionalCommit(max_body_line_length=72).is_valid("feat:1 asunto\n")
+
+
+def test_load(rule_plugin):
+    commit = ConventionalCommit(rules=["no-wip", "firmado"])
+
+    assert commit.errors("feat:1 WIP asunto\n") == ["no-wip", "firmado"]
+    assert commit.errors("feat:1 asunto\n\nSigned-off-by: Ana\n") == []
+    assert not commit.is_valid("feat:1 wip asunto\n\nSigned-off-by: Ana\n")
+    assert commit.diagnostics.get("no-wip").description == "el encabezado no puede decir WIP"
+
+
+@pytest.mark.parametrize("name", ["no-existe", "roto"])
+def test_load__invalid(rule_plugin, name):
+    with pytest.raises(rules.RuleError):
+        ConventionalCommit(rules=[name])
@@ -0,0 +1,139 @@
+import random
+from collections import Counter
+
+import pytest
+
+from conventional_pre_commit import sampling
+from conventional_pre_commit.history import GitCommit
+from conventional_pre_commit.sampling import BernoulliSampler, ReservoirSampler, StratifiedSampler, estimate
+
+DAY = 24 * 60 * 60
+
+
+def _commits(count, start=1_700_000_000, step=DAY):
+    return [GitCommit(f"{i:040x}", timestamp=start + i * step) for i in range(count)]
+
+
+def test_reservoir__exact_size_in_history_order():
+    sample = list(ReservoirSampler(50, random.Random(1)).sample(_commits(10_000)))
+
+    assert len(sample) == 50
+    assert sample == sorted(sample, key=lambda c: c.sha)
+    assert len(set(sample)) == 50
+
+
+def test_reservoir__small_population():
+    commits = _commits(10)
+
+    assert list(ReservoirSampler(50, random.Random(1)).sample(commits)) == commits
+
+
+def test_reservoir__uniform():
+    counts = Counter()
+    commits = _commits(20)
+    for seed in range(4_000):
+        counts.update(c.sha for c in ReservoirSampler(5, random.Random(seed)).sample(commits))
+
+    # cada commit debería aparecer en ~1/4 de las muestras (1000 veces)
+    assert all(850 < counts[c.sha] < 1150 for c in commits), counts
+
+
+def test_reservoir__population():
+    sampler = ReservoirSampler(5, random.Random(1))
+    sampler.offer(_commits(100))
+
+    assert sampler.population == 100
+
+
+def test_bernoulli__rate():
+    sampler = BernoulliSampler(0.01, random.Random(2))
+    sample = list(sampler.sample(_commits(100_000)))
+
+    assert 850 < len(sample) < 1150
+    assert sampler.population == 100_000
+
+
+def test_bernoulli__all():
+    commits = _commits(10)
+
+    assert list(BernoulliSampler(1.0, random.Random(2)).sample(commits)) == commits
+
+
+def test_stratified__proportional_allocation():
+    # 300 commits en enero y 100 en febrero
+    january = _commits(300, start=1_704_067_200, step=60)
+    february = _commits(100, start=1_706_745_600, step=60)
+    sampler = StratifiedSampler(40, random.Random(3))
+
+    sample = list(sampler.sample(january + february))
+
+    months = Counter(sampling._month(c.timestamp) for c in sample)
+    assert months == {"2024-01": 30, "2024-02": 10}
+
+
+def test_stratified__year():
+    sampler = StratifiedSampler(10, random.Random(3), sampling.STRATIFY_YEAR)
+    sampler.offer(_commits(100, step=10 * DAY))
+
+    assert sum(sampler.allocation().values()) == 10
+    assert set(sampler.allocation()) == {"2023", "2024", "2025", "2026"}
+
+
+def test_stratified__memory_bounded_by_sample_size():
+    # 1000 meses de 60 commits: sin reducir los períodos anteriores se guardarían 1000 reservorios de 50
+    sampler = StratifiedSampler(50, random.Random(3))
+    kept = 0
+    for month in range(1000):
+        sampler.offer(_commits(60, start=month * 31 * DAY, step=60))
+        kept = max(kept, sum(len(stratum.items) for stratum in sampler._strata.values()))
+
+    assert kept <= 2 * 50 + 1000
+    assert len(sampler.finish()) == 50
+
+
+def test_stratified__reopened_period_keeps_sample_size():
+    # enero vuelve a recibir commits después de reducirse a su parte de la muestra
+    january = _commits(10, start=1_704_067_200, step=60)
+    february = _commits(10, start=1_706_745_600, step=60)
+    march = _commits(10, start=1_709_251_200, step=60)
+    sampler = StratifiedSampler(10, random.Random(3))
+
+    sample = list(sampler.sample(january[:1] + february + march + january[1:]))
+
+    assert len(sample) == 10
+    assert len(set(c.timestamp for c in sample)) == 10
+
+
+def test_create__reproducible():
+    commits = _commits(1_000)
+
+    def _sample(seed, name="repo"):
+        return [c.sha for c in sampling.create(size=20, seed=seed, name=name).sample(commits)]
+
+    assert _sample(1) == _sample(1)
+    assert _sample(1) != _sample(2)
+    assert _sample(1) != _sample(1, "otro")
+    assert isinstance(sampling.create(rate=0.5), BernoulliSampler)
+    assert isinstance(sampling.create(size=5, stratify="month"), StratifiedSampler)
+
+
+def test_estimate__wilson():
+    result = estimate(valid=90, sample=100, population=10**9)
+
+    assert result.rate == 0.9
+    assert result.low == pytest.approx(0.8256, abs=1e-3)
+    assert result.high == pytest.approx(0.9448, abs=1e-3)
+
+
+def test_estimate__finite_population():
+    assert estimate(90, 100, 100)[3:] == (0.9, 0.9, 0.9)
+    narrow = estimate(90, 100, 200)
+    wide = estimate(90, 100, 10**9)
+
+    assert wide.low < narrow.low < 0.9 < narrow.high < wide.high
+
+
+def test_estimate__extremes():
+    assert estimate(0, 0, 10) == (0, 0, 10, 0.0, 0.0, 1.0)
+    assert estimate(50, 50, 10**6).high == 1.0
+    assert estimate(0, 50, 10**6).low == 0.0
@@ -0,0 +1,121 @@
+import random
+
+import pytest
+
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.scanner import HeaderScanner, is_plain, scanner_for
+
+SCOPES = ["api", "api-v2", "v2", "web_ui", "cli"]
+ALPHABET = ["f", "e", "a", "t", "x", "é", "_", "-", "/", ",", ":", "!", "(", ")", " ", "\t", "\n", "\r", "1", "٣", "²", "\x1c"]
+CONFIGS = [
+    {},
+    {"scope_optional": False},
+    {"scopes": SCOPES},
+    {"scopes": SCOPES, "scope_optional": False},
+    {"types": ["fe", "feat", "feat-x", "my_type"]},
+]
+
+
+def _random_message(rng: random.Random, types, scopes) -> str:
+    parts = [rng.choice(types * 3 + ["", "fea", "FEAT", "unknown"])]
+    if rng.random() < 0.6:
+        if scopes and rng.random() < 0.7:
+            values = [rng.choice(scopes + ["other"]) for _ in range(rng.randint(1, 3))]
+            separators = [rng.choice([",", ", ", " - ", "/", ":", " ", "-"]) for _ in values]
+            inner = "".join(value + sep for value, sep in zip(values, separators[:-1])) + values[-1]
+            parts.append(rng.choice(["(", "( "]) + inner + rng.choice([")", " )", ""]))
+        else:
+            parts.append("(" + "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 5))) + ")")
+    parts.append(rng.choice(["", "", "!", "!!"]))
+    parts.append(rng.choice([":", ":", ":", "", ": "]))
+    parts.append("".join(rng.choice("0123456789٣") for _ in range(rng.choice([0, 1, 1, 3, 3, 9, 10, 11]))))
+    parts.append(rng.choice([" subject", " subject", "  subject", " ", "", "subject", " s\r", " sujeto ñ"]))
+    parts.append(
+        rng.choice(["", "\n", "\n\n", "\nbody", "\n\nbody", "\n\n\nbody", "\r\n\r\nbody", "\n\n\n", "\n\nbody\n\nmore"])
+    )
+    message = "".join(parts)
+
+    for _ in range(rng.choice([0, 0, 0, 1, 2, 3])):
+        pos = rng.randint(0, len(message))
+        after = pos + 1
+        operation = rng.random()
+        if operation < 0.4:
+            message = message[:pos] + rng.choice(ALPHABET) + message[pos:]
+        elif operation < 0.7:
+            message = message[:pos] + message[after:]
+        else:
+            message = message[:pos] + rng.choice(ALPHABET) + message[after:]
+    return message
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_scanner__equivalent_to_regex(config):
+    """Prueba diferencial: el scanner y la regex aceptan exactamente los mismos mensajes."""
+    commit = ConventionalCommit(**config)
+    scanner = scanner_for(commit.types, commit.scopes)
+    rng = random.Random(1234)
+
+    assert scanner is not None
+
+    for _ in range(5000):
+        message = _random_message(rng, commit.types, commit.scopes)
+        expected = commit._match_is_valid(commit.regex.match(message))
+
+        assert scanner.is_valid(message, commit.scope_optional) == expected, repr(message)
+
+
+@pytest.mark.parametrize(
+    "message,expected",
+    [
+        ("feat:1 subject", True),
+        ("feat(api):123456789 subject", True),
+        ("feat(api)!:1 subject\n\nbody", True),
+        ("feat:1 subject\nbody", False),
+        ("feat:1 subject\n\n\nbody", True),
+        ("feat:1234567890 subject", False),
+        ("feat: subject", False),
+        ("feat:1subject", False),
+        ("feat:1 ", False),
+        ("feat():1 subject", False),
+        ("fea:1 subject", False),
+    ],
+)
+def test_scanner__is_valid(message, expected):
+    scanner = HeaderScanner(ConventionalCommit.DEFAULT_TYPES)
+
+    assert scanner.is_valid(message) is expected
+
+
+def test_scanner__scope_list_with_delimiter_in_scope():
+    scanner = HeaderScanner(["feat"], SCOPES)
+
+    assert scanner.is_valid("feat(api-v2):1 subject")
+    assert scanner.is_valid("feat( api - v2 , cli ):1 subject")
+    assert not scanner.is_valid("feat(api-v3):1 subject")
+
+
+def test_scanner__scope_required():
+    scanner = HeaderScanner(["feat"])
+
+    assert not scanner.is_valid("feat:1 subject", scope_optional=False)
+    assert scanner.is_valid("feat(api):1 subject", scope_optional=False)
+
+
+def test_is_plain():
+    assert is_plain(["feat", "my-type", "my_type", "tipo1"])
+    assert not is_plain(["fe.t"])
+    assert not is_plain(["a|b"])
+    assert not is_plain([""])
+
+
+def test_scanner_for__fallback_to_regex():
+    assert scanner_for(["feat"], ["api"]) is not None
+    assert scanner_for(["fe.t"]) is None
+    assert scanner_for(["feat"], ["api|cli"]) is None
+
+
+def test_is_valid__regex_fallback():
+    commit = ConventionalCommit(types=["fe.t"])
+
+    assert commit.is_valid("feat:1 subject")
+    assert commit.is_valid("fext:1 subject")
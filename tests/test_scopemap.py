@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from conventional_pre_commit import scopemap
+from conventional_pre_commit.scopemap import PathTrie
+from tests.conftest import git
+
+MAPPING = {
+    "services/payments": "payments",
+    "services/payments/legacy": ["payments", "legacy"],
+    "web": ["web", "ui"],
+    "package.json": "build",
+}
+
+
+def test_lookup__longest_prefix():
+    trie = PathTrie.from_mapping(MAPPING)
+
+    assert trie.lookup("services/payments/api.py") == ("payments",)
+    assert trie.lookup("services/payments/legacy/old.py") == ("payments", "legacy")
+    assert trie.lookup("web/index.html") == ("web", "ui")
+    assert trie.lookup("package.json") == ("build",)
+    assert trie.lookup("README.md") == ()
+
+
+def test_lookup__whole_components():
+    trie = PathTrie.from_mapping(MAPPING)
+
+    assert trie.lookup("services/pay/x.py") == ()
+    assert trie.lookup("services/payments-v2/x.py") == ()
+    assert trie.lookup("./web//index.html") == ("web", "ui")
+
+
+def test_lookup__root_default():
+    trie = PathTrie.from_mapping({".": "repo", "web": "web"})
+
+    assert trie.lookup("README.md") == ("repo",)
+    assert trie.lookup("web/x") == ("web",)
+
+
+def test_scopes():
+    trie = PathTrie.from_mapping(MAPPING)
+
+    assert trie.scopes(["web/a", "services/payments/b", "docs/c"]) == {"web", "ui", "payments"}
+
+
+def test_from_mapping__invalid():
+    with pytest.raises(ValueError):
+        PathTrie.from_mapping({"web": 1})
+
+
+def test_load__compiles_once(tmp_path, monkeypatch):
+    path = tmp_path / "scopes.json"
+    path.write_text(json.dumps(MAPPING))
+    cache_dir = str(tmp_path / "cache")
+
+    first = scopemap.load(str(path), cache_dir)
+    assert len(list((tmp_path / "cache" / "scope-maps").iterdir())) == 1
+
+    monkeypatch.setattr(scopemap.json, "loads", lambda *args: pytest.fail("no debería leer el JSON"))
+    second = scopemap.load(str(path), cache_dir)
+
+    assert second.root == first.root
+    assert second.lookup("web/x") == ("web", "ui")
+
+
+def test_load__recompiles_when_the_map_changes(tmp_path):
+    path = tmp_path / "scopes.json"
+    cache_dir = str(tmp_path / "cache")
+    path.write_text(json.dumps({"web": "web"}))
+    scopemap.load(str(path), cache_dir)
+
+    path.write_text(json.dumps({"web": "frontend"}))
+
+    assert scopemap.load(str(path), cache_dir).lookup("web/x") == ("frontend",)
+
+
+def test_load__invalid(tmp_path):
+    path = tmp_path / "scopes.json"
+    path.write_text("[1, 2]")
+
+    with pytest.raises(ValueError):
+        scopemap.load(str(path), str(tmp_path / "cache"))
+
+
+def test_staged_paths(make_git_repo):
+    repo = make_git_repo(["feat:1 first\n"])
+    (repo / "web").mkdir()
+    (repo / "web" / "índice.html").write_text("x")
+    (repo / "file.txt").write_text("cambio")
+    git(repo, "add", "web", "file.txt")
+
+    assert sorted(scopemap.staged_paths(str(repo))) == ["file.txt", "web/índice.html"]
+
+
+@pytest.mark.parametrize(
+    "scopes, touched, expected",
+    [
+        (["web"], {"web", "ui"}, None),
+        (["web", "api"], {"web"}, ["api"]),
+        ([], {"web"}, []),
+        (["api"], set(), None),
+        ([], set(), None),
+    ],
+)
+def test_unexpected_scopes(scopes, touched, expected):
+    assert scopemap.unexpected_scopes(scopes, touched) == expected
@@ -0,0 +1,83 @@
+import pickle
+
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.stats import Stats
+
+MESSAGES = [
+    "feat(api):1 add endpoint\n\nbody\n",
+    "feat(api, cliente):2 add client\n",
+    "fix:3 fix bug\n",
+    "not conventional\n",
+]
+
+
+def _stats(messages):
+    commit = ConventionalCommit()
+    stats = Stats()
+    for message in messages:
+        valid = commit.is_valid(message)
+        stats.add(commit, message, valid, [] if valid else commit.errors(message))
+    return stats
+
+
+def test_stats__add():
+    stats = _stats(MESSAGES)
+
+    assert stats.commits == 4
+    assert stats.valid == 3
+    assert stats.with_scope == 2
+    assert stats.with_body == 1
+    assert stats.types == {"feat": 2, "fix": 1}
+    assert stats.scopes == {"api": 2, "cliente": 1}
+    assert stats.errors["type"] == 1
+
+
+def test_stats__merge_equals_single_pass():
+    single = _stats(MESSAGES)
+    merged = Stats.merge([_stats(MESSAGES[:1]), _stats(MESSAGES[1:3]), _stats(MESSAGES[3:])])
+
+    assert merged.to_dict() == single.to_dict()
+
+
+def test_stats__pickle():
+    stats = _stats(MESSAGES)
+
+    assert pickle.loads(pickle.dumps(stats)).to_dict() == stats.to_dict()
+
+
+def test_stats__to_dict():
+    result = _stats(MESSAGES).to_dict(top=1)
+
+    assert result["commits"] == 4
+    assert result["valid_ratio"] == 0.75
+    assert result["body_ratio"] == 0.25
+    assert result["types"] == [["feat", 2]]
+
+
+def test_stats__empty():
+    assert Stats().to_dict()["valid_ratio"] == 0.0
+
+
+def test_stats__merges():
+    stats = Stats()
+    stats.add(ConventionalCommit(), "Merge pull request #1 from org/rama\n", True, merge=True)
+    stats.add(ConventionalCommit(), "feat(api):1 asunto\n", True)
+
+    assert stats.to_dict()["merges"] == 1
+    assert stats.to_dict()["types"] == [["feat", 1]]
+    assert Stats.merge([stats, stats]).merges == 2
+
+
+def test_stats__trailers():
+    stats = _stats(
+        [
+            "feat!:1 asunto\n\nBREAKING CHANGE: cambia la API\nRefs: 1\n",
+            "fix:2 asunto\n\ncuerpo\n\nRefs: 2\n",
+            "fix(api)!:3 asunto\n",
+        ]
+    )
+
+    assert stats.trailers == {"BREAKING CHANGE": 1, "Refs": 2}
+    assert stats.breaking == 2
+    assert stats.to_dict()["trailers"] == [["Refs", 2], ["BREAKING CHANGE", 1]]
+    assert Stats.merge([stats, stats]).trailers["Refs"] == 4
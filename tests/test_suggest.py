@@ -0,0 +1,112 @@
+import random
+import time
+
+import pytest
+
+from conventional_pre_commit import suggest
+from conventional_pre_commit.format import ConventionalCommit
+from conventional_pre_commit.suggest import SuggestionIndex, distance, index_for, suggestions
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        ("feat", "feat", 0),
+        ("feta", "feat", 1),
+        ("fet", "feat", 1),
+        ("feaat", "feat", 1),
+        ("paymnets", "payments", 1),
+        ("ca", "abc", 3),
+        ("", "abc", 3),
+    ],
+)
+def test_distance(a, b, expected):
+    assert distance(a, b, 3) == expected
+
+
+def test_distance__limit():
+    assert distance("abcdef", "uvwxyz", 2) == 3
+    assert distance("a", "abcdef", 2) == 3
+
+
+def test_lookup():
+    index = SuggestionIndex(ConventionalCommit.DEFAULT_TYPES)
+
+    assert index.lookup("feta") == ["feat"]
+    assert index.lookup("FEAT") == ["feat"]
+    assert index.lookup("refactr") == ["refactor"]
+    assert index.lookup("xyz") == []
+
+
+def test_lookup__ranked_by_distance():
+    index = SuggestionIndex(["payment", "payments", "pagos"])
+
+    assert index.lookup("paymnets") == ["payments", "payment"]
+    assert index.lookup("paymnets", limit=1) == ["payments"]
+
+
+def test_lookup__short_words_use_smaller_distance():
+    index = SuggestionIndex(["ci", "docs"])
+
+    assert index.lookup("cx") == ["ci"]
+    assert index.lookup("do") == []
+
+
+def test_lookup__equivalent_to_brute_force():
+    rng = random.Random(37)
+    words = ["".join(rng.choice("abcdef") for _ in range(rng.randint(3, 10))) for _ in range(300)]
+    index = SuggestionIndex(words)
+
+    for _ in range(300):
+        query = "".join(rng.choice("abcdef") for _ in range(rng.randint(3, 10)))
+        limit = min(2, max(1, len(query) // 3))
+        expected = {word for word in words if word != query and distance(query, word, limit) <= limit}
+
+        assert set(index.lookup(query, limit=len(words))) == expected, query
+
+
+def test_index_for__cached():
+    assert index_for(["feat", "fix"]) is index_for(("feat", "fix"))
+
+
+def test_lookup__many_scopes_fast():
+    rng = random.Random(10_000)
+    scopes = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 14))) for _ in range(10_000)]
+    index = SuggestionIndex(scopes + ["payments"])
+    queries = [scope[:2] + scope[3] + scope[2] + scope[4:] for scope in scopes[:200]]
+
+    start = time.perf_counter()
+    for query in queries:
+        index.lookup(query)
+    elapsed = (time.perf_counter() - start) / len(queries)
+
+    assert index.lookup("paymnets") == ["payments"]
+    # menos de 1 ms por búsqueda en una máquina normal; el margen evita falsos positivos en CI
+    assert elapsed < 0.005
+
+
+def test_suggestions():
+    commit = ConventionalCommit(scopes=["api", "api-v2", "payments"])
+
+    assert suggestions(commit, "feta(paymnets, api-v2):1 asunto") == {
+        "type": {"feta": ["feat"]},
+        "scope": {"paymnets": ["payments"]},
+    }
+    assert suggestions(commit, "feat(api):1 asunto") == {}
+    assert suggestions(commit, "mensaje sin formato") == {}
+
+
+def test_unknown_scopes():
+    commit = ConventionalCommit(scopes=["api", "api-v2", "web"])
+
+    assert suggest.unknown_scopes(commit, "feat(api-v2, web / otro):1 asunto") == ["otro"]
+    assert suggest.unknown_scopes(commit, "feat(api-web):1 asunto") == []
+    assert suggest.unknown_scopes(ConventionalCommit(), "feat(otro):1 asunto") == []
+
+
+def test_unknown_type():
+    commit = ConventionalCommit()
+
+    assert suggest.unknown_type(commit, "feta(api):1 asunto") == "feta"
+    assert suggest.unknown_type(commit, "feat!:1 asunto") is None
+    assert suggest.unknown_type(commit, "") is None
@@ -0,0 +1,77 @@
+import pytest
+
+from conventional_pre_commit import trailers
+from conventional_pre_commit.trailers import Trailer
+
+
+def test_parse():
+    message = "feat:1 asunto\n\ncuerpo\n\nRefs: #123\nSigned-off-by: Ana <ana@example.com>\n"
+
+    assert trailers.parse(message) == [Trailer("Refs", "#123"), Trailer("Signed-off-by", "Ana <ana@example.com>")]
+
+
+def test_parse__hash_separator():
+    assert trailers.parse("fix:1 asunto\n\nCloses #42\n") == [Trailer("Closes", "42")]
+
+
+def test_parse__breaking_change_with_continuation():
+    message = "feat!:1 asunto\n\nBREAKING CHANGE: la API\n  cambia de forma\nRefs: 7\n"
+
+    assert trailers.parse(message) == [Trailer("BREAKING CHANGE", "la API cambia de forma"), Trailer("Refs", "7")]
+
+
+def test_parse__crlf_and_trailing_blank_lines():
+    assert trailers.parse("fix:1 asunto\r\n\r\nRefs: 1\r\n\r\n\n") == [Trailer("Refs", "1")]
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "feat:1 asunto\n",
+        # el encabezado nunca es un footer
+        "Refs: 1\n",
+        "feat:1 asunto\nRefs: 1\n",
+        # el último párrafo no es un bloque de footers
+        "feat:1 asunto\n\nRefs: 1\ntexto libre\n",
+        "feat:1 asunto\n\ncuerpo con dos puntos: no es footer\n",
+        "feat:1 asunto\n\n  continuación sin footer\n",
+        "",
+    ],
+)
+def test_parse__no_trailers(message):
+    assert trailers.parse(message) == []
+
+
+def test_parse__does_not_scan_the_body():
+    class Body(str):
+        # falla si se lee antes del último párrafo
+        def rfind(self, sub, start=0, end=None):
+            position = str.rfind(self, sub, start, end)
+            assert position >= self.index("\n\nRefs") or position == -1 and start == 0
+            return position
+
+    message = Body("feat:1 asunto\n\n" + "cuerpo\n" * 1000 + "\nRefs: 1\n")
+
+    assert trailers.parse(message) == [Trailer("Refs", "1")]
+
+
+def test_missing():
+    found = [Trailer("signed-off-by", "Ana"), Trailer("Refs", "1")]
+
+    assert trailers.missing(found, ["Signed-off-by", "Reviewed-by"]) == ["Reviewed-by"]
+
+
+@pytest.mark.parametrize(
+    "found, breaking_header, expected",
+    [
+        ([], False, False),
+        ([], True, True),
+        ([Trailer("BREAKING CHANGE", "cambia la API")], True, False),
+        ([Trailer("BREAKING-CHANGE", "cambia la API")], True, False),
+        ([Trailer("BREAKING CHANGE", "cambia la API")], False, False),
+        ([Trailer("Breaking change", "cambia la API")], False, True),
+        ([Trailer("BREAKING CHANGE", "")], True, True),
+    ],
+)
+def test_invalid_breaking(found, breaking_header, expected):
+    assert trailers.invalid_breaking(found, breaking_header) is expected
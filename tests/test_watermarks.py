@@ -0,0 +1,54 @@
+import json
+
+from conventional_pre_commit import watermarks
+
+SHA_A = "a" * 40
+SHA_B = "b" * 40
+SHA_C = "c" * 40
+
+
+def test_load__missing(tmp_path):
+    assert watermarks.load(str(tmp_path / "state.json")) == {}
+
+
+def test_save_load(tmp_path):
+    path = str(tmp_path / "state.json")
+    state = {"/repo": {"refs/heads/main": SHA_A}}
+
+    watermarks.save(path, state)
+
+    assert watermarks.load(path) == state
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+
+def test_load__unknown_version(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"version": 0, "repos": {"/repo": {}}}))
+
+    assert watermarks.load(str(path)) == {}
+
+
+def test_revs__first_run():
+    assert watermarks.revs({"refs/heads/main": SHA_A}, {}, []) == [SHA_A]
+
+
+def test_revs__unchanged():
+    assert watermarks.revs({"refs/heads/main": SHA_A}, {"refs/heads/main": SHA_A}, [SHA_A]) == []
+
+
+def test_revs__new_commits():
+    result = watermarks.revs({"refs/heads/main": SHA_B}, {"refs/heads/main": SHA_A}, [SHA_A])
+
+    assert result == [SHA_B, "--not", SHA_A]
+
+
+def test_revs__new_ref_excludes_other_watermarks():
+    tips = {"refs/heads/main": SHA_A, "refs/heads/feature": SHA_B}
+
+    assert watermarks.revs(tips, {"refs/heads/main": SHA_A}, [SHA_A]) == [SHA_B, "--not", SHA_A]
+
+
+def test_revs__missing_watermark():
+    result = watermarks.revs({"refs/heads/main": SHA_C}, {"refs/heads/main": SHA_A, "refs/heads/old": SHA_B}, [SHA_B])
+
+    assert result == [SHA_C, "--not", SHA_B]
@@ -0,0 +1,63 @@
+import pytest
+
+from conventional_pre_commit import width
+from conventional_pre_commit.format import ConventionalCommit
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("", 0),
+        ("feat:1 asunto", 13),
+        ("añade", 5),
+        ("漢字", 4),
+        ("ｆｕｌｌ", 8),
+        ("👍 ok", 5),
+        ("e\u0301", 1),
+        ("👩‍💻", 4),
+    ],
+)
+def test_width(text, expected):
+    assert width.width(text) == expected
+
+
+def test_width__ascii_fast_path(monkeypatch):
+    monkeypatch.setattr(width, "char_width", lambda char: pytest.fail("no debería medir caracteres ASCII"))
+
+    assert width.width("x" * 1000) == 1000
+    assert width.cut("x" * 1000, 72) == 72
+    assert list(width.overflows("corta\n" + "x" * 80, 72)) == [(1, 72)]
+
+
+def test_width__table_is_memoized(monkeypatch):
+    width.width("漢")
+    monkeypatch.setattr(width.unicodedata, "east_asian_width", lambda char: pytest.fail("debería usar la tabla"))
+
+    assert width.width("漢漢") == 4
+
+
+@pytest.mark.parametrize(
+    "text, limit, expected",
+    [
+        ("asunto", 10, 6),
+        ("asunto", 3, 3),
+        ("漢字漢字", 5, 2),
+        ("漢字漢字", 8, 4),
+        ("a漢", 2, 1),
+        ("ñandú", 5, 5),
+    ],
+)
+def test_cut(text, limit, expected):
+    assert width.cut(text, limit) == expected
+
+
+def test_overflows():
+    text = "corta\r\n" + "漢" * 40 + "\n\n" + "x" * 72 + "\r\n" + "y" * 73
+
+    assert list(width.overflows(text, 72)) == [(1, 36), (4, 72)]
+
+
+def test_overflows__wide_line_under_character_limit():
+    assert list(width.overflows("漢" * 16, 30)) == [(0, 15)]
+    assert ConventionalCommit(max_body_line_length=30).body_overflows("feat:1 asunto\n\n" + "漢" * 16) == [3]
+    assert not ConventionalCommit(max_body_line_length=30).is_valid("feat:1 asunto\n\n" + "漢" * 16)
@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+from tests.conftest import TEST_DIR
+
+BUILD_SCRIPT = os.path.join(os.path.dirname(TEST_DIR), "scripts", "build_zipapp.py")
+
+
+@pytest.fixture(scope="module")
+def zipapp(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("zipapp") / "conventional-pre-commit.pyz")
+    subprocess.run([sys.executable, BUILD_SCRIPT, "-o", path], check=True, stdout=subprocess.DEVNULL)
+    return path
+
+
+def test_zipapp__contents(zipapp):
+    with zipfile.ZipFile(zipapp) as archive:
+        names = set(archive.namelist())
+
+    assert "__main__.py" in names
+    assert {"conventional_pre_commit/hook.py", "conventional_pre_commit/hook.pyc"} <= names
+    assert "conventional_pre_commit/_version.pyc" in names
+    assert not any("__pycache__" in name for name in names)
+
+
+def test_zipapp__shebang(zipapp):
+    with open(zipapp, "rb") as f:
+        assert f.readline() == b"#!/usr/bin/env python3\n"
+    assert os.access(zipapp, os.X_OK)
+
+
+def test_zipapp__success(zipapp, conventional_commit_path):
+    assert subprocess.call([sys.executable, zipapp, conventional_commit_path]) == 0
+
+
+def test_zipapp__fail(zipapp, bad_commit_path):
+    assert subprocess.call([sys.executable, zipapp, bad_commit_path], stdout=subprocess.DEVNULL) == 1
+
+
+def test_zipapp__subcommand(zipapp, tmp_path):
+    args = [sys.executable, zipapp, "--subcommand", "pre-receive", "--repo", str(tmp_path)]
+    result = subprocess.run(args, input="", text=True)
+
+    assert result.returncode == 0
+
+
+def test_zipapp__no_metadata_lookup(zipapp, conventional_commit_path):
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "from conventional_pre_commit.hook import main; main([sys.argv[2]]);"
+        "print('importlib.metadata' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-S", "-c", code, zipapp, conventional_commit_path], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "False"
+
+
+def test_zipapp__version(zipapp):
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "import conventional_pre_commit; print(conventional_pre_commit.__version__)"
+    )
+    result = subprocess.run([sys.executable, "-S", "-c", code, zipapp], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip()
+
+
+def test_main_module(conventional_commit_path):
+    assert subprocess.call([sys.executable, "-m", "conventional_pre_commit", conventional_commit_path]) == 0